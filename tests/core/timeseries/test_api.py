@@ -1,13 +1,24 @@
 # Copyright (C) 2018-2022, earthobservations developers.
 # Distributed under the MIT License. See LICENSE for more info.
+import datetime as dt
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import polars as pl
 import pytest
+from polars.testing import assert_frame_equal
 
+from wetterdienst.core.timeseries.result import StationsFilter, StationsResult
 from wetterdienst.exceptions import NoParametersFoundError
 from wetterdienst.provider.dwd.observation import (
     DwdObservationDataset,
     DwdObservationRequest,
     DwdObservationResolution,
 )
+from wetterdienst.provider.dwd.observation.api import DwdObservationValues
 
 
 @pytest.mark.remote
@@ -87,6 +98,90 @@ def test_api_dropna(settings_dropna_true):
     assert values.df.shape[0] == 51971
 
 
+@pytest.mark.remote
+def test_api_max_workers_keeps_station_order(default_settings):
+    def _get_values(settings):
+        return (
+            DwdObservationRequest(
+                parameter=["temperature_air_mean_2m", "precipitation_height"],
+                resolution="daily",
+                start_date="2021-01-01",
+                end_date="2021-03-31",
+                settings=settings,
+            )
+            .filter_by_rank(latlon=(49.19780976647141, 8.135207205143768), rank=4)
+            .values.all()
+        )
+
+    values_sequential = _get_values(default_settings)
+    default_settings.ts_max_workers = 4
+    values_concurrent = _get_values(default_settings)
+    assert values_concurrent.df.get_column("station_id").unique(maintain_order=True).to_list() == (
+        values_sequential.df.get_column("station_id").unique(maintain_order=True).to_list()
+    )
+    assert values_concurrent.df.equals(values_sequential.df)
+
+
+def test_api_max_workers_offline(default_settings):
+    """Concurrently collected stations are yielded in order and pending ones are dropped when rank is reached"""
+    station_ids = [f"{i:05d}" for i in range(1, 11)]
+    collected = []
+    executors = []
+
+    class RecordingThreadPoolExecutor(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.futures = []
+            executors.append(self)
+
+        def submit(self, *args, **kwargs):
+            future = super().submit(*args, **kwargs)
+            self.futures.append(future)
+            return future
+
+    def collect_station_parameter(station_id, parameter, dataset):  # noqa: ARG001
+        # random delays make stations finish out of order
+        time.sleep(random.uniform(0.01, 0.05))  # noqa: S311
+        collected.append(station_id)
+        return pl.DataFrame(
+            {
+                "station_id": [station_id],
+                "dataset": ["climate_summary"],
+                "parameter": ["tmk"],
+                "date": [dt.datetime(2020, 1, 1, tzinfo=ZoneInfo("UTC"))],
+                "value": [1.0],
+                "quality": [None],
+            },
+            schema_overrides={"quality": pl.Float64},
+        )
+
+    default_settings.ts_max_workers = 4
+    request = DwdObservationRequest(parameter="kl", resolution="daily", settings=default_settings)
+    stations = StationsResult(
+        stations=request,
+        df=pl.DataFrame({"station_id": station_ids}),
+        df_all=pl.DataFrame({"station_id": station_ids}),
+        stations_filter=StationsFilter.BY_RANK,
+        rank=3,
+    )
+    values = request._values.from_stations(stations)
+    with (
+        mock.patch.object(values, "_collect_station_parameter", side_effect=collect_station_parameter),
+        mock.patch("wetterdienst.core.timeseries.values.ThreadPoolExecutor", RecordingThreadPoolExecutor),
+    ):
+        results = list(values.query())
+    assert [result.df.get_column("station_id").item() for result in results] == station_ids[:3]
+    # at most the stations up to rank and the ones prefetched meanwhile are collected
+    (executor,) = executors
+    assert len(executor.futures) <= 3 + 4
+    wait(executor.futures, timeout=5)
+    assert all(future.done() for future in executor.futures)
+    assert len(collected) == len([future for future in executor.futures if not future.cancelled()]) < len(station_ids)
+    for thread in executor._threads:
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+
 def test_api_no_valid_parameters(default_settings):
     with pytest.raises(NoParametersFoundError):
         DwdObservationRequest(
@@ -117,3 +212,76 @@ def test_api_partly_valid_parameters(default_settings, caplog):
             DwdObservationDataset.SOLAR,
         ),
     ]
+
+
+def test_api_convert_values_to_si(default_settings):
+    request = DwdObservationRequest(
+        parameter="kl",
+        resolution="daily",
+        settings=default_settings,
+    )
+    stations = StationsResult(
+        stations=request,
+        df=pl.DataFrame(),
+        df_all=pl.DataFrame(),
+        stations_filter=StationsFilter.ALL,
+    )
+    values = request._values.from_stations(stations)
+    conversion_factors = values._create_conversion_factors(["climate_summary"])
+    # dimensionless parameters such as quality are not converted
+    assert "qn_4" not in conversion_factors.get_column("parameter").to_list()
+    df = pl.DataFrame(
+        {
+            "dataset": ["climate_summary"] * 4,
+            "parameter": ["tmk", "sdk", "qn_4", "tmk"],
+            "value": [10.0, 2.0, 3.0, None],
+        },
+    )
+    df_si = values._convert_values_to_si(df, conversion_factors)
+    df_expected = pl.DataFrame(
+        {
+            "dataset": ["climate_summary"] * 4,
+            "parameter": ["tmk", "sdk", "qn_4", "tmk"],
+            "value": [283.15, 7200.0, 3.0, None],
+        },
+    )
+    assert_frame_equal(df_si, df_expected)
+
+
+def test_api_collect_dataset_once_for_many_parameters(default_settings):
+    dates = [dt.datetime(2022, 1, 1, tzinfo=ZoneInfo("UTC")), dt.datetime(2022, 1, 2, tzinfo=ZoneInfo("UTC"))]
+    df_dataset = pl.DataFrame(
+        {
+            "station_id": "01048",
+            "dataset": "climate_summary",
+            "parameter": ["tmk", "tmk", "rsk", "rsk", "fm", "fm"],
+            "date": dates * 3,
+            "value": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            "quality": 10.0,
+        },
+    )
+    request = DwdObservationRequest(
+        parameter=["temperature_air_mean_2m", "precipitation_height", "wind_speed"],
+        resolution="daily",
+        settings=default_settings,
+    )
+    stations = StationsResult(
+        stations=request,
+        df=pl.DataFrame({"station_id": ["01048"]}),
+        df_all=pl.DataFrame({"station_id": ["01048"]}),
+        stations_filter=StationsFilter.BY_STATION_ID,
+    )
+    values = request._values.from_stations(stations)
+    with mock.patch.object(
+        DwdObservationValues,
+        "_collect_station_parameter",
+        return_value=df_dataset,
+    ) as mock_collect:
+        df = values._collect_station_data("01048")
+    mock_collect.assert_called_once_with(
+        station_id="01048",
+        parameter=DwdObservationDataset.CLIMATE_SUMMARY,
+        dataset=DwdObservationDataset.CLIMATE_SUMMARY,
+    )
+    assert df.get_column("parameter").to_list() == ["tmk", "tmk", "rsk", "rsk", "fm", "fm"]
+    assert df.get_column("value").to_list() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
@@ -1,6 +1,7 @@
 # Copyright (C) 2018-2023, earthobservations developers.
 # Distributed under the MIT License. See LICENSE for more info.
 import datetime as dt
+from unittest import mock
 from zoneinfo import ZoneInfo
 
 import polars as pl
@@ -14,6 +15,7 @@ from wetterdienst.provider.dwd.mosmix import DwdMosmixRequest
 from wetterdienst.provider.dwd.observation import (
     DwdObservationRequest,
 )
+from wetterdienst.provider.dwd.observation.api import DwdObservationValues
 
 pytest.importorskip("shapely")
 
@@ -225,3 +227,206 @@ def test_interpolation_error_no_start_date():
     with pytest.raises(ValueError) as exec_info:
         request.interpolate(latlon=(52.8, 12.9))
     assert exec_info.match("start_date and end_date are required for interpolation")
+
+
+@pytest.mark.parametrize("parameter", ["temperature_air_mean_2m", "precipitation_height"])
+def test_calculate_interpolation_equals_linear_nd_interpolator(parameter):
+    from scipy.interpolate import LinearNDInterpolator
+
+    from wetterdienst.core.timeseries.interpolate import (
+        calculate_interpolation,
+        get_station_group_ids,
+        get_valid_station_groups,
+    )
+    from wetterdienst.core.timeseries.tools import _ParameterData
+
+    utm_x, utm_y = 500_000.0, 5_500_000.0
+    stations_dict = {
+        "00001": (490_000.0, 5_490_000.0, 14.1),
+        "00002": (512_000.0, 5_491_000.0, 15.0),
+        "00003": (508_000.0, 5_511_000.0, 13.6),
+        "00004": (489_000.0, 5_509_000.0, 14.2),
+        "00005": (520_000.0, 5_500_000.0, 20.0),
+    }
+    values = {
+        "S00001": [1.5, None, 0.0, 3.2, None, 2.0],
+        "S00002": [2.5, 1.0, 0.4, None, None, 0.0],
+        "S00003": [0.0, 4.1, 0.0, 1.1, None, 5.5],
+        "S00004": [3.3, 2.2, 1.0, 0.7, 1.0, 0.0],
+        "S00005": [4.0, 0.5, 0.0, 2.9, None, 1.3],
+    }
+    dates = pl.datetime_range(
+        dt.datetime(2022, 1, 1, tzinfo=ZoneInfo("UTC")),
+        dt.datetime(2022, 1, 1, 5, tzinfo=ZoneInfo("UTC")),
+        interval="1h",
+        eager=True,
+    )
+    param_data = _ParameterData(
+        pl.DataFrame({"date": dates, **values}, schema_overrides=dict.fromkeys(values, pl.Float64)),
+    )
+    given_df = calculate_interpolation(utm_x, utm_y, stations_dict, {parameter: param_data}, 1)
+    # reference with one interpolator per timestamp
+    valid_station_groups = get_valid_station_groups(stations_dict, utm_x, utm_y)
+    expected_values = []
+    expected_station_ids = []
+    for row in param_data.values.drop("date").iter_rows(named=True):
+        available = frozenset([station_id[1:] for station_id, value in row.items() if value is not None])
+        station_ids = get_station_group_ids(valid_station_groups, available)
+        expected_station_ids.append(station_ids)
+        if not station_ids:
+            expected_values.append(None)
+            continue
+        xs, ys, _ = zip(*[stations_dict[station_id] for station_id in station_ids])
+        vals = [row[f"S{station_id}"] for station_id in station_ids]
+        value = LinearNDInterpolator(points=(xs, ys), values=vals)(utm_x, utm_y).item()
+        if parameter == "precipitation_height":
+            value_index = LinearNDInterpolator(points=(xs, ys), values=[float(v > 0) for v in vals])(utm_x, utm_y)
+            value = value if value_index >= 0.5 else 0
+        expected_values.append(round(float(value), 2))
+    assert given_df.get_column("value").to_list() == expected_values
+    assert given_df.get_column("taken_station_ids").to_list() == expected_station_ids
+    assert given_df.get_column("value").null_count() == 2
+
+
+def test_station_groups():
+    from wetterdienst.core.timeseries.interpolate import StationGroups
+
+    station_groups = StationGroups(0.0, 0.5)
+    station_groups.add("00001", 1.0, 1.0)
+    station_groups.add("00002", -1.0, -1.0)
+    station_groups.add("00003", -1.0, 1.0)
+    # stations in given order form a bow tie that doesn't cover the location
+    station_groups.add("00004", 1.0, -1.0)
+    assert station_groups.empty()
+    station_groups.add("00005", 0.0, 2.0)
+    assert list(station_groups) == [
+        ("00001", "00002", "00003", "00005"),
+        ("00001", "00003", "00004", "00005"),
+        ("00002", "00003", "00004", "00005"),
+    ]
+    assert station_groups.get_group_ids(frozenset(["00001", "00002", "00003", "00004", "00005"])) == [
+        "00001",
+        "00002",
+        "00003",
+        "00005",
+    ]
+    assert station_groups.get_group_ids(frozenset(["00002", "00003", "00004", "00005"])) == [
+        "00002",
+        "00003",
+        "00004",
+        "00005",
+    ]
+    assert station_groups.get_group_ids(frozenset(["00001", "00002", "00003", "00004"])) == []
+
+
+def test_interpolate_many_collects_stations_once(default_settings):
+    df_stations = pl.LazyFrame(
+        {
+            "station_id": ["00001", "00002", "00003", "00004", "00005"],
+            "start_date": [dt.datetime(2000, 1, 1)] * 5,
+            "end_date": [dt.datetime(2024, 1, 1)] * 5,
+            "latitude": [50.0, 50.1, 50.1, 49.9, 49.9],
+            "longitude": [8.9, 8.8, 9.0, 8.8, 9.0],
+            "height": [100.0] * 5,
+            "name": ["A", "B", "C", "D", "E"],
+            "state": ["Hessen"] * 5,
+        },
+    )
+    dates = pl.datetime_range(
+        dt.datetime(2022, 1, 1, tzinfo=ZoneInfo("UTC")),
+        dt.datetime(2022, 1, 3, tzinfo=ZoneInfo("UTC")),
+        interval="1d",
+        eager=True,
+    )
+
+    def _collect_station_data(_, station_id):
+        return pl.DataFrame(
+            {
+                "station_id": station_id,
+                "dataset": "climate_summary",
+                "parameter": "tmk",
+                "date": dates,
+                "value": [float(station_id[-1]) + i for i in range(len(dates))],
+                "quality": 10.0,
+            },
+        )
+
+    request = DwdObservationRequest(
+        parameter="temperature_air_mean_2m",
+        resolution="daily",
+        start_date=dt.datetime(2022, 1, 1),
+        end_date=dt.datetime(2022, 1, 3),
+        settings=default_settings,
+    )
+    points = [(50.0, 8.9), (50.01, 8.91)]
+    with (
+        mock.patch.object(DwdObservationRequest, "_all", return_value=df_stations),
+        mock.patch.object(
+            DwdObservationValues,
+            "_collect_station_data",
+            side_effect=_collect_station_data,
+            autospec=True,
+        ) as mock_collect,
+    ):
+        result = request.interpolate_many(points)
+        station_ids = [call.args[1] for call in mock_collect.call_args_list]
+        assert sorted(station_ids) == sorted(set(station_ids))
+        expected_df = pl.concat([request.interpolate(point).df for point in points])
+    assert result.df.get_column("station_id").unique(maintain_order=True).len() == 2
+    assert_frame_equal(result.df, expected_df)
+    features = result.to_ogc_feature_collection()["data"]["features"]
+    assert [feature["geometry"]["coordinates"] for feature in features] == [[8.9, 50.0], [8.91, 50.01]]
+
+
+def test_iter_station_values_without_values():
+    from wetterdienst.core.timeseries.tools import iter_station_values
+
+    df_stations = pl.LazyFrame(
+        {
+            "station_id": ["00001", "00002", "00003"],
+            "start_date": [dt.datetime(2000, 1, 1)] * 3,
+            "end_date": [dt.datetime(2024, 1, 1)] * 3,
+            "latitude": [50.0, 50.1, 50.2],
+            "longitude": [8.9, 8.9, 8.9],
+            "height": [100.0] * 3,
+            "name": ["A", "B", "C"],
+            "state": ["Hessen"] * 3,
+        },
+    )
+
+    def _collect_station_data(_, station_id):
+        # station 00002 has no values
+        return pl.DataFrame(
+            {
+                "station_id": station_id,
+                "dataset": "climate_summary",
+                "parameter": "tmk",
+                "date": [dt.datetime(2022, 1, 1, tzinfo=ZoneInfo("UTC"))],
+                "value": [None if station_id == "00002" else float(station_id[-1])],
+                "quality": 10.0,
+            },
+        )
+
+    settings = Settings(ts_skip_empty=True, ts_skip_threshold=0.5, ts_si_units=False, ignore_env=True)
+    request = DwdObservationRequest(
+        parameter="temperature_air_mean_2m",
+        resolution="daily",
+        start_date=dt.datetime(2022, 1, 1),
+        end_date=dt.datetime(2022, 1, 1),
+        settings=settings,
+    )
+    with (
+        mock.patch.object(DwdObservationRequest, "_all", return_value=df_stations),
+        mock.patch.object(
+            DwdObservationValues,
+            "_collect_station_data",
+            side_effect=_collect_station_data,
+            autospec=True,
+        ),
+    ):
+        stations_ranked = request.filter_by_distance(latlon=(50.0, 8.9), distance=50)
+        for station_values in (None, {}):
+            dfs = list(iter_station_values(stations_ranked, station_values))
+            # the skipped station gets an empty DataFrame, so values stay aligned with the ranked stations
+            assert [df.get_column("value").to_list() for df in dfs] == [[1.0], [], [3.0]]
+        assert list(station_values) == ["00001", "00003"]
@@ -12,7 +12,7 @@ from surrogate import surrogate
 
 from wetterdienst import Provider
 from wetterdienst.core.process import filter_by_date
-from wetterdienst.core.timeseries.export import ExportMixin
+from wetterdienst.core.timeseries.export import ExportMixin, stream_format, stream_to_target
 from wetterdienst.core.timeseries.result import (
     InterpolatedValuesResult,
     StationsFilter,
@@ -417,6 +417,129 @@ def test_values_format_csv_kwargs(df_values):
     assert lines[0] == "01048,climate_summary,temperature_air_max_2m,2019-01-01T00:00:00+00:00,1.3,"
 
 
+@pytest.fixture
+def values_results_stream(df_values):
+    """Values split into multiple results as yielded by ``TimeseriesValues.query()``"""
+    return [
+        ValuesResult(stations=None, values=None, df=df_values[:3]),
+        ValuesResult(stations=None, values=None, df=df_values.clear()),
+        ValuesResult(stations=None, values=None, df=df_values[3:5]),
+        ValuesResult(stations=None, values=None, df=df_values[5:]),
+    ]
+
+
+def test_values_stream_format_csv(df_values, values_results_stream):
+    """Test streaming export of results to csv"""
+    output = "".join(stream_format(values_results_stream, "csv"))
+    assert output == ValuesResult(stations=None, values=None, df=df_values).to_csv()
+
+
+def test_values_stream_format_ndjson(values_results_stream):
+    """Test streaming export of results to ndjson"""
+    lines = "".join(stream_format(values_results_stream, "ndjson")).strip().split("\n")
+    assert len(lines) == 6
+    assert json.loads(lines[-1]) == {
+        "station_id": "01048",
+        "dataset": "climate_summary",
+        "parameter": "temperature_air_max_2m",
+        "date": "2022-01-01T00:00:00+00:00",
+        "value": 4.0,
+        "quality": None,
+    }
+
+
+@pytest.mark.parametrize("suffix", ["csv", "ndjson", "parquet"])
+def test_values_stream_to_target_file(tmp_path, df_values, values_results_stream, suffix):
+    """Test streaming export of results to files"""
+    filename = tmp_path.joinpath(f"observations.{suffix}")
+    assert stream_to_target(values_results_stream, f"file://{filename}") == 3
+    if suffix == "csv":
+        df = pl.read_csv(filename, schema=df_values.schema, try_parse_dates=True)
+    elif suffix == "ndjson":
+        df = pl.read_ndjson(filename).with_columns(pl.col("date").str.to_datetime(time_zone="UTC"))
+    else:
+        df = pl.read_parquet(filename)
+    assert df.get_column("date").to_list() == df_values.get_column("date").to_list()
+    assert df.get_column("value").to_list() == df_values.get_column("value").to_list()
+
+
+@pytest.fixture
+def values_results_stream_wide(default_settings):
+    """Wide values of two stations, the first one lacking a parameter and having no quality"""
+    request = DwdObservationRequest(
+        parameter=["temperature_air_mean_2m", "temperature_air_max_2m"],
+        resolution="daily",
+        settings=default_settings.model_copy(update={"ts_shape": "wide"}),
+    )
+    stations = StationsResult(stations=request, df=pl.DataFrame(), df_all=pl.DataFrame(), stations_filter=None)
+    values = request._values.from_stations(stations)
+    date = dt.datetime(2022, 1, 1, tzinfo=ZoneInfo("UTC"))
+    return [
+        ValuesResult(
+            stations=None,
+            values=values,
+            df=pl.DataFrame(
+                {
+                    "station_id": ["01048"],
+                    "dataset": ["climate_summary"],
+                    "date": [date],
+                    "temperature_air_mean_2m": [1.0],
+                    "qn_temperature_air_mean_2m": [None],
+                },
+            ),
+        ),
+        ValuesResult(
+            stations=None,
+            values=values,
+            df=pl.DataFrame(
+                {
+                    "station_id": ["01049"],
+                    "dataset": ["climate_summary"],
+                    "date": [date],
+                    "temperature_air_mean_2m": [2.0],
+                    "qn_temperature_air_mean_2m": [10.0],
+                    "temperature_air_max_2m": [3.0],
+                    "qn_temperature_air_max_2m": [10.0],
+                },
+            ),
+        ),
+    ]
+
+
+def test_values_stream_format_csv_wide(values_results_stream_wide):
+    """Test streaming export of wide results, whose columns are given by the request rather than the first result"""
+    lines = "".join(stream_format(values_results_stream_wide, "csv")).strip().split("\n")
+    assert lines == [
+        "station_id,dataset,date,temperature_air_mean_2m,qn_temperature_air_mean_2m,temperature_air_max_2m,"
+        "qn_temperature_air_max_2m",
+        "01048,climate_summary,2022-01-01T00:00:00+00:00,1.0,,,",
+        "01049,climate_summary,2022-01-01T00:00:00+00:00,2.0,10.0,3.0,10.0",
+    ]
+
+
+def test_values_stream_to_target_parquet_wide(tmp_path, values_results_stream_wide):
+    """Test streaming export of wide results to parquet, where the first result has columns without data type"""
+    filename = tmp_path.joinpath("observations.parquet")
+    assert stream_to_target(values_results_stream_wide, f"file://{filename}") == 2
+    df = pl.read_parquet(filename)
+    assert df.schema == values_results_stream_wide[0].values.get_schema()
+    assert df.get_column("qn_temperature_air_mean_2m").to_list() == [None, 10.0]
+    assert df.get_column("temperature_air_max_2m").to_list() == [None, 3.0]
+
+
+def test_values_stream_to_target_duckdb(tmp_path, values_results_stream):
+    """Test streaming export of results to duckdb, where the first result replaces the table"""
+    import duckdb
+
+    filename = tmp_path.joinpath("test.duckdb")
+    stream_to_target(values_results_stream[:1], f"duckdb:///{filename}?table=testdrive")
+    stream_to_target(values_results_stream, f"duckdb:///{filename}?table=testdrive")
+    connection = duckdb.connect(str(filename), read_only=True)
+    results = connection.execute("SELECT value FROM testdrive").fetchall()
+    connection.close()
+    assert results == [(1.3,), (1.0,), (1.3,), (2.0,), (3.0,), (4.0,)]
+
+
 def test_interpolated_values_to_dict(df_interpolated_values):
     data = InterpolatedValuesResult(stations=None, df=df_interpolated_values, latlon=(1, 2)).to_dict()
     assert data.keys() == {"values"}
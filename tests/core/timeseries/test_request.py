@@ -1,4 +1,5 @@
 import datetime as dt
+from unittest import mock
 from zoneinfo import ZoneInfo
 
 import polars as pl
@@ -367,3 +368,29 @@ def test_dwd_observation_stations_fail(default_request):
     # Bbox
     with pytest.raises(ValueError):
         default_request.filter_by_bbox(left=10, bottom=10, right=5, top=5)
+
+
+def test_dwd_observation_stations_catalog_cached(default_request):
+    df_stations = pl.LazyFrame(
+        {
+            "station_id": ["02480", "04411", "07341"],
+            "start_date": [dt.datetime(2004, 9, 1), dt.datetime(2002, 1, 24), dt.datetime(2005, 7, 16)],
+            "end_date": [dt.datetime(2024, 1, 1)] * 3,
+            "latitude": [50.0643, 49.9195, 50.0900],
+            "longitude": [8.993, 8.9672, 8.7862],
+            "height": [108.0, 155.0, 119.0],
+            "name": ["Kahl/Main", "Schaafheim-Schlierbach", "Offenbach-Wetterpark"],
+            "state": ["Bayern", "Hessen", "Hessen"],
+        },
+    )
+    with mock.patch.object(DwdObservationRequest, "_all", return_value=df_stations) as mock_all:
+        default_request.all()
+        default_request.filter_by_station_id(station_id="02480")
+        default_request.filter_by_name(name="Kahl/Main")
+        default_request.filter_by_rank(latlon=(50.0, 8.9), rank=2)
+        default_request.filter_by_distance(latlon=(50.0, 8.9), distance=16.13)
+        default_request.filter_by_bbox(left=8.7862, bottom=49.9195, right=8.993, top=50.0900)
+        assert mock_all.call_count == 1
+        default_request.clear_cache()
+        default_request.all()
+        assert mock_all.call_count == 2
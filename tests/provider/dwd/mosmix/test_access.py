@@ -0,0 +1,150 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import datetime as dt
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from unittest import mock
+from zipfile import ZipFile
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from wetterdienst import Settings
+from wetterdienst.provider.dwd.mosmix.access import KMLReader, decode_forecast_values
+
+KML = """<?xml version="1.0" encoding="ISO-8859-1" standalone="no"?>
+<kml:kml xmlns:dwd="https://opendata.dwd.de/weather/lib/pointforecast_dwd_extension_V1_0.xsd"
+    xmlns:kml="http://www.opengis.net/kml/2.2">
+    <kml:Document>
+        <kml:ExtendedData>
+            <dwd:ProductDefinition>
+                <dwd:Issuer>Deutscher Wetterdienst</dwd:Issuer>
+                <dwd:ProductID>MOSMIX</dwd:ProductID>
+                <dwd:GeneratingProcess>DWD MOSMIX hourly, Version 1.0</dwd:GeneratingProcess>
+                <dwd:IssueTime>2024-10-01T03:00:00.000Z</dwd:IssueTime>
+                <dwd:ForecastTimeSteps>
+                    <dwd:TimeStep>2024-10-01T04:00:00.000Z</dwd:TimeStep>
+                    <dwd:TimeStep>2024-10-01T05:00:00.000Z</dwd:TimeStep>
+                    <dwd:TimeStep>2024-10-01T06:00:00.000Z</dwd:TimeStep>
+                </dwd:ForecastTimeSteps>
+            </dwd:ProductDefinition>
+        </kml:ExtendedData>
+        {placemarks}
+    </kml:Document>
+</kml:kml>
+"""
+
+PLACEMARK = """<kml:Placemark>
+            <kml:name>{station_id}</kml:name>
+            <kml:ExtendedData>
+                <dwd:Forecast dwd:elementName="PPPP">
+                    <dwd:value>     101290.00     101280.00     {value}</dwd:value>
+                </dwd:Forecast>
+                <dwd:Forecast dwd:elementName="TTT">
+                    <dwd:value>     275.15     -     -1.50</dwd:value>
+                </dwd:Forecast>
+            </kml:ExtendedData>
+        </kml:Placemark>"""
+
+
+def _create_kmz(station_ids: list[str]) -> BytesIO:
+    placemarks = "\n".join(
+        PLACEMARK.format(station_id=station_id, value=f"{i}.00") for i, station_id in enumerate(station_ids)
+    )
+    buffer = BytesIO()
+    with ZipFile(buffer, "w") as zf:
+        zf.writestr("MOSMIX_S_2024100103.kml", KML.format(placemarks=placemarks))
+    buffer.seek(0)
+    return buffer
+
+
+def test_kml_reader_parses_file_once(default_settings):
+    reader = KMLReader(station_ids=["01001", "01028"], settings=default_settings)
+    with mock.patch.object(KMLReader, "download", return_value=_create_kmz(["01001", "01025", "01028"])) as download:
+        for station_id in ["01001", "01028"]:
+            reader.read("https://opendata.dwd.de/MOSMIX_S_LATEST_240.kmz")
+            df = reader.get_station_forecast(station_id)
+            assert df.columns == ["date", "pppp", "ttt"]
+        download.assert_called_once()
+    assert reader.metadata["issue_time"] == dt.datetime(2024, 10, 1, 3, tzinfo=dt.timezone.utc)
+    assert list(reader.forecasts) == ["01001", "01028"]
+    assert_frame_equal(
+        reader.get_station_forecast("01028"),
+        pl.DataFrame(
+            {
+                "date": [
+                    dt.datetime(2024, 10, 1, 4, tzinfo=dt.timezone.utc),
+                    dt.datetime(2024, 10, 1, 5, tzinfo=dt.timezone.utc),
+                    dt.datetime(2024, 10, 1, 6, tzinfo=dt.timezone.utc),
+                ],
+                "pppp": [101290.0, 101280.0, 2.0],
+                "ttt": [275.15, None, -1.5],
+            },
+        ),
+    )
+    # stations which were not requested are not kept
+    with pytest.raises(IndexError):
+        reader.get_station_forecast("01025")
+
+
+def test_kml_reader_snapshot(tmp_path):
+    settings = Settings(cache_dir=tmp_path, ignore_env=True)
+    url = "https://opendata.dwd.de/weather/local_forecasts/mos/MOSMIX_S/all_stations/kml/MOSMIX_S_2024100103_240.kmz"
+    reader = KMLReader(station_ids=["01001"], settings=settings)
+    with mock.patch.object(KMLReader, "download", return_value=_create_kmz(["01001", "01025", "01028"])):
+        reader.read(url)
+    df_expected = reader.get_station_forecast("01001")
+    snapshot_path = (
+        tmp_path / "snapshot" / "weather/local_forecasts/mos/MOSMIX_S/all_stations/kml/MOSMIX_S_2024100103_240.parquet"
+    )
+    # the snapshot holds all stations, not only the requested ones
+    assert pl.read_parquet(snapshot_path).get_column("station_id").unique(maintain_order=True).to_list() == [
+        "01001",
+        "01025",
+        "01028",
+    ]
+    # another reader is served from the snapshot
+    reader = KMLReader(station_ids=["01001", "01028"], settings=settings, parameters=["ttt"])
+    with mock.patch.object(KMLReader, "download") as download:
+        reader.read(url)
+        download.assert_not_called()
+    assert reader.metadata["issue_time"] == dt.datetime(2024, 10, 1, 3, tzinfo=dt.timezone.utc)
+    assert_frame_equal(reader.get_station_forecast("01001"), df_expected.select("date", "ttt"))
+    assert reader.get_station_forecast("01028").columns == ["date", "ttt"]
+
+
+def test_kml_reader_concurrent_urls(default_settings):
+    urls = [f"https://opendata.dwd.de/MOSMIX_L_LATEST_{station_id}.kmz" for station_id in ("01001", "01028")]
+    reader = KMLReader(station_ids=[], settings=default_settings)
+    barrier = threading.Barrier(2)
+
+    def _read(url):
+        station_id = url[-10:-4]
+        forecasts = reader.read(url)
+        # the other thread reads its file before the forecast is taken
+        barrier.wait(timeout=5)
+        barrier.wait(timeout=5)
+        return reader.get_station_forecast(station_id, forecasts)
+
+    with (
+        mock.patch.object(KMLReader, "download", side_effect=lambda url: _create_kmz([url[-10:-4]])),
+        ThreadPoolExecutor(2) as executor,
+    ):
+        dfs = list(executor.map(_read, urls))
+    assert [df.get_column("pppp").to_list() for df in dfs] == [[101290.0, 101280.0, 0.0]] * 2
+
+
+def test_decode_forecast_values():
+    timesteps = [dt.datetime(2024, 10, 1, hour, tzinfo=dt.timezone.utc) for hour in (4, 5)]
+    df = decode_forecast_values(["TTT", "RR1c"], ["  275.15    -", "-  -"], timesteps)
+    assert_frame_equal(
+        df,
+        pl.DataFrame(
+            {"date": timesteps, "ttt": [275.15, None], "rr1c": [None, None]},
+            schema_overrides={"rr1c": pl.Float64},
+        ),
+    )
+    with pytest.raises(ValueError):
+        decode_forecast_values(["TTT"], ["275.15"], timesteps)
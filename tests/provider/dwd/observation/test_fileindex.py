@@ -2,6 +2,10 @@
 # Distributed under the MIT License. See LICENSE for more info.
 """tests for file index creation"""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
 import polars as pl
 import pytest
 
@@ -16,6 +20,7 @@ from wetterdienst.provider.dwd.observation.fileindex import (
     create_file_index_for_climate_observations,
     create_file_list_for_climate_observations,
 )
+from wetterdienst.settings import Settings
 
 
 @pytest.mark.remote
@@ -85,3 +90,92 @@ def test_create_file_list_for_dwd_server(default_settings):
         "10_minutes/air_temperature/historical/"
         "10minutenwerte_TU_00003_19930428_19991231_hist.zip",
     ]
+
+
+def test_file_index_cached(monkeypatch, tmp_path):
+    settings = Settings(cache_dir=tmp_path, ignore_env=True)
+    monkeypatch.setattr("wetterdienst.provider.dwd.observation.fileindex._file_index_cache", {})
+    url = "https://opendata.dwd.de/climate_environment/CDC/observations_germany/climate/10_minutes/air_temperature/"
+    files = [
+        f"{url}historical/10minutenwerte_TU_00003_19930428_19991231_hist.zip",
+        f"{url}historical/10minutenwerte_TU_00003_20000101_20091231_hist.zip",
+        f"{url}historical/10minutenwerte_TU_00044_20070209_20091231_hist.zip",
+    ]
+    with mock.patch(
+        "wetterdienst.provider.dwd.observation.fileindex.list_remote_files_fsspec",
+        return_value=files,
+    ) as mock_list:
+        for station_id, expected in [("00003", files[:2]), ("00044", files[2:]), ("00001", [])]:
+            remote_files = create_file_list_for_climate_observations(
+                station_id=station_id,
+                dataset=DwdObservationDataset.TEMPERATURE_AIR,
+                resolution=Resolution.MINUTE_10,
+                period=Period.HISTORICAL,
+                settings=settings,
+            )
+            assert remote_files.to_list() == expected
+        remote_files = create_file_list_for_climate_observations(
+            station_id="00003",
+            dataset=DwdObservationDataset.TEMPERATURE_AIR,
+            resolution=Resolution.MINUTE_10,
+            period=Period.HISTORICAL,
+            date_range="20000101_20091231",
+            settings=settings,
+        )
+        assert remote_files.to_list() == files[1:2]
+        assert mock_list.call_count == 1
+        # parsed file index is read from the cache directory when it's not in memory
+        monkeypatch.setattr("wetterdienst.provider.dwd.observation.fileindex._file_index_cache", {})
+        file_index = create_file_index_for_climate_observations(
+            DwdObservationDataset.TEMPERATURE_AIR,
+            Resolution.MINUTE_10,
+            Period.HISTORICAL,
+            settings=settings,
+        ).collect()
+        assert mock_list.call_count == 1
+    assert file_index.get_column("date_range").to_list() == [
+        "19930428_19991231",
+        "20000101_20091231",
+        "20070209_20091231",
+    ]
+
+
+def test_file_index_created_once_per_key(monkeypatch, tmp_path):
+    settings = Settings(cache_dir=tmp_path, ignore_env=True)
+    monkeypatch.setattr("wetterdienst.provider.dwd.observation.fileindex._file_index_cache", {})
+    temperature_listed = threading.Event()
+    release_temperature = threading.Event()
+
+    def list_remote_files(url, settings, ttl):  # noqa: ARG001
+        if "air_temperature" in url:
+            temperature_listed.set()
+            assert release_temperature.wait(timeout=5), "listing was not released"
+            return [f"{url}10minutenwerte_TU_00003_19930428_19991231_hist.zip"]
+        return [f"{url}10minutenwerte_nieder_00003_19930428_19991231_hist.zip"]
+
+    def get_file_index(dataset, settings=settings):
+        return create_file_index_for_climate_observations(
+            dataset, Resolution.MINUTE_10, Period.HISTORICAL, settings=settings
+        ).collect()
+
+    with (
+        mock.patch(
+            "wetterdienst.provider.dwd.observation.fileindex.list_remote_files_fsspec",
+            side_effect=list_remote_files,
+        ) as mock_list,
+        ThreadPoolExecutor(max_workers=4) as executor,
+    ):
+        futures = [executor.submit(get_file_index, DwdObservationDataset.TEMPERATURE_AIR) for _ in range(4)]
+        assert temperature_listed.wait(timeout=10)
+        # another file index is created while the first one is still being listed
+        assert get_file_index(DwdObservationDataset.PRECIPITATION).get_column("station_id").to_list() == ["00003"]
+        assert (
+            get_file_index(
+                DwdObservationDataset.PRECIPITATION, Settings(cache_dir=tmp_path / "other", ignore_env=True)
+            ).height
+            == 1
+        )
+        release_temperature.set()
+        assert [future.result().height for future in futures] == [1] * 4
+    # the file index is created once per dataset and cache directory
+    assert mock_list.call_count == 3
@@ -0,0 +1,152 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import datetime as dt
+import json
+import os
+import time
+from io import BytesIO
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+
+from wetterdienst import Period, Resolution, Settings
+from wetterdienst.provider.dwd.observation import DwdObservationDataset
+from wetterdienst.provider.dwd.observation.store import (
+    MANIFEST_FILENAME,
+    collect_climate_observations_data_from_store,
+    get_store_partition,
+    sync_climate_observations_store,
+)
+
+PAYLOAD = b"""STATIONS_ID;MESS_DATUM;QN_3;  FX;eor
+      1048;20200101;   10;   5.0;eor
+      1048;20200102;   10;   6.0;eor
+      1048;20200103;   10;   7.0;eor
+"""
+
+
+@pytest.fixture
+def settings_store(tmp_path):
+    return Settings(cache_dir=tmp_path, ts_store=True, ignore_env=True)
+
+
+def _download(remote_files, settings):  # noqa: ARG001
+    return [(remote_file, BytesIO(PAYLOAD)) for remote_file in remote_files]
+
+
+def _collect(remote_files, settings, **kwargs):
+    return collect_climate_observations_data_from_store(
+        pl.Series(remote_files),
+        "01048",
+        DwdObservationDataset.CLIMATE_SUMMARY,
+        Resolution.DAILY,
+        Period.HISTORICAL,
+        settings,
+        **kwargs,
+    ).collect()
+
+
+@mock.patch("wetterdienst.provider.dwd.observation.store.create_file_list_for_climate_observations")
+@mock.patch(
+    "wetterdienst.provider.dwd.observation.store.download_climate_observations_data_parallel",
+    side_effect=_download,
+)
+def test_store_filled_once_and_refreshed_incrementally(mock_download, mock_file_list, settings_store):
+    remote_files = ["tageswerte_KL_01048_20200101_20200103_hist.zip"]
+    mock_file_list.return_value = pl.Series(remote_files)
+    df = _collect(remote_files, settings_store)
+    assert df.get_column("date").to_list() == [
+        dt.datetime(2020, 1, 1, tzinfo=ZoneInfo("UTC")),
+        dt.datetime(2020, 1, 2, tzinfo=ZoneInfo("UTC")),
+        dt.datetime(2020, 1, 3, tzinfo=ZoneInfo("UTC")),
+    ]
+    assert mock_download.call_count == 1
+    partition = get_store_partition(
+        "01048", DwdObservationDataset.CLIMATE_SUMMARY, Resolution.DAILY, Period.HISTORICAL, settings_store
+    )
+    assert [path.name for path in partition.iterdir()] == ["tageswerte_KL_01048_20200101_20200103_hist.parquet"]
+    # stored data is read without downloading again and filtered by date
+    df = _collect(
+        remote_files,
+        settings_store,
+        start_date=dt.datetime(2020, 1, 2, tzinfo=ZoneInfo("UTC")),
+        end_date=dt.datetime(2020, 1, 2, tzinfo=ZoneInfo("UTC")),
+    )
+    assert df.get_column("date").to_list() == [dt.datetime(2020, 1, 2, tzinfo=ZoneInfo("UTC"))]
+    assert mock_download.call_count == 1
+    # a new file in the file index replaces the outdated one
+    remote_files = ["tageswerte_KL_01048_20200101_20200104_hist.zip"]
+    mock_file_list.return_value = pl.Series(remote_files)
+    _collect(remote_files, settings_store)
+    assert mock_download.call_count == 2
+    assert [path.name for path in partition.iterdir()] == ["tageswerte_KL_01048_20200101_20200104_hist.parquet"]
+
+
+@mock.patch("wetterdienst.provider.dwd.observation.store.create_file_index_for_climate_observations")
+@mock.patch(
+    "wetterdienst.provider.dwd.observation.store.download_climate_observations_data_parallel",
+    side_effect=_download,
+)
+def test_store_sync_resumable(mock_download, mock_file_index, settings_store):
+    mock_file_index.return_value = pl.LazyFrame(
+        {
+            "filename": [
+                "tageswerte_KL_01048_20200101_20200103_hist.zip",
+                "tageswerte_KL_01050_20200101_20200103_hist.zip",
+            ],
+            "station_id": ["01048", "01050"],
+        },
+    )
+    summary = sync_climate_observations_store(
+        DwdObservationDataset.CLIMATE_SUMMARY, Resolution.DAILY, Period.HISTORICAL, settings_store
+    )
+    assert summary == {"synced": 2, "skipped": 0, "failed": 0}
+    assert mock_download.call_count == 2
+    manifest_path = (
+        get_store_partition(
+            "01048", DwdObservationDataset.CLIMATE_SUMMARY, Resolution.DAILY, Period.HISTORICAL, settings_store
+        ).parent
+        / MANIFEST_FILENAME
+    )
+    manifest = json.loads(manifest_path.read_text())
+    assert sorted(manifest) == [
+        "station_id=01048/tageswerte_KL_01048_20200101_20200103_hist.parquet",
+        "station_id=01050/tageswerte_KL_01050_20200101_20200103_hist.parquet",
+    ]
+    # a run that was interrupted before the second file was recorded only syncs that file
+    manifest.pop("station_id=01050/tageswerte_KL_01050_20200101_20200103_hist.parquet")
+    manifest_path.write_text(json.dumps(manifest))
+    summary = sync_climate_observations_store(
+        DwdObservationDataset.CLIMATE_SUMMARY, Resolution.DAILY, Period.HISTORICAL, settings_store
+    )
+    assert summary == {"synced": 1, "skipped": 1, "failed": 0}
+    assert mock_download.call_count == 3
+
+
+@mock.patch("wetterdienst.provider.dwd.observation.store.create_file_index_for_climate_observations")
+@mock.patch(
+    "wetterdienst.provider.dwd.observation.store.download_climate_observations_data_parallel",
+    side_effect=_download,
+)
+def test_store_sync_recent_kept_until_expiry(mock_download, mock_file_index, tmp_path):
+    mock_file_index.return_value = pl.LazyFrame(
+        {"filename": ["tageswerte_KL_01048_akt.zip"], "station_id": ["01048"]},
+    )
+    settings = Settings(cache_dir=tmp_path, ts_store=True, ts_store_expiry=3600, ignore_env=True)
+    args = (DwdObservationDataset.CLIMATE_SUMMARY, Resolution.DAILY, Period.RECENT)
+    assert sync_climate_observations_store(*args, settings) == {"synced": 1, "skipped": 0, "failed": 0}
+    path = get_store_partition("01048", *args, settings) / "tageswerte_KL_01048_akt.parquet"
+    # synced recent files are read from the store until the expiry of the store
+    os.utime(path, (time.time() - 600, time.time() - 600))
+    assert sync_climate_observations_store(*args, settings) == {"synced": 0, "skipped": 1, "failed": 0}
+    df = collect_climate_observations_data_from_store(
+        pl.Series(["tageswerte_KL_01048_akt.zip"]), "01048", *args, settings
+    ).collect()
+    assert df.height == 3
+    assert mock_download.call_count == 1
+    # and are synced again afterwards
+    settings = settings.model_copy(update={"ts_store_expiry": 300})
+    assert sync_climate_observations_store(*args, settings) == {"synced": 1, "skipped": 0, "failed": 0}
+    assert mock_download.call_count == 2
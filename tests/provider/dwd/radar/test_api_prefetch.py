@@ -0,0 +1,60 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import bz2
+import datetime as dt
+import threading
+import time
+from io import BytesIO
+from unittest import mock
+
+import polars as pl
+import pytest
+
+from wetterdienst.provider.dwd.radar import DwdRadarParameter, DwdRadarValues
+
+URL = "https://opendata.dwd.de/weather/radar/composite/wn/WN{:%y%m%d%H%M}_000.bz2"
+
+
+@pytest.fixture
+def file_index():
+    dates = [dt.datetime(2024, 10, 1, 12, minute) for minute in range(0, 60, 5)]
+    return pl.DataFrame({"filename": [URL.format(date) for date in dates], "datetime": dates})
+
+
+@pytest.mark.parametrize("lookahead", [0, 4])
+def test_radar_prefetch_keeps_order(file_index, default_settings, lookahead):
+    in_flight = []
+    lock = threading.Lock()
+
+    def _download_file(url, **_):
+        with lock:
+            in_flight.append(url)
+        # later files finish downloading first
+        time.sleep(0.02 * (12 - file_index.get_column("filename").to_list().index(url)))
+        return BytesIO(bz2.compress(url.encode()))
+
+    request = DwdRadarValues(
+        parameter=DwdRadarParameter.WN_REFLECTIVITY,
+        start_date=dt.datetime(2024, 10, 1, 12),
+        end_date=dt.datetime(2024, 10, 1, 13),
+        settings=default_settings,
+        lookahead=lookahead,
+    )
+    with (
+        mock.patch("wetterdienst.provider.dwd.radar.api.create_fileindex_radar", return_value=file_index),
+        mock.patch("wetterdienst.provider.dwd.radar.api.download_file", side_effect=_download_file),
+        mock.patch.object(
+            DwdRadarValues,
+            "_extract_generic_data",
+            side_effect=DwdRadarValues._extract_generic_data,
+        ) as extract,
+    ):
+        results = request.query()
+        first = next(results)
+        # files are downloaded ahead of the one that is yielded, but only extracted when they are consumed
+        assert len(in_flight) == lookahead + 1
+        assert extract.call_count == 1
+        results = [first, *results]
+    assert [result.url for result in results] == file_index.get_column("filename").to_list()
+    assert [result.timestamp for result in results] == file_index.get_column("datetime").to_list()
+    assert [result.data.read().decode() for result in results] == file_index.get_column("filename").to_list()
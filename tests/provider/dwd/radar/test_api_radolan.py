@@ -0,0 +1,71 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import datetime as dt
+import tarfile
+from io import BytesIO
+from unittest import mock
+
+import polars as pl
+import pytest
+
+from wetterdienst import Settings
+from wetterdienst.provider.dwd.radar import (
+    DwdRadarParameter,
+    DwdRadarPeriod,
+    DwdRadarResolution,
+    DwdRadarValues,
+)
+
+URL = "https://opendata.dwd.de/climate_environment/CDC/grids_germany/hourly/radolan/historical/bin/2019/RW201908.tar.gz"
+
+
+def _create_archive() -> bytes:
+    buffer = BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for hour in range(3):
+            name = f"raa01-rw_10000-190808{hour:02d}50-dwd---bin"
+            payload = name.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(payload)
+            tar.addfile(info, BytesIO(payload))
+    return buffer.getvalue()
+
+
+def _query(settings, start_date):
+    request = DwdRadarValues(
+        parameter=DwdRadarParameter.RADOLAN_CDC,
+        resolution=DwdRadarResolution.HOURLY,
+        period=DwdRadarPeriod.HISTORICAL,
+        start_date=start_date,
+        end_date=dt.timedelta(minutes=1),
+        settings=settings,
+    )
+    return list(request.query())
+
+
+@pytest.mark.parametrize("cache_disable", [False, True])
+def test_radar_radolan_cdc_historic_reads_requested_members(tmp_path, cache_disable):
+    settings = Settings(cache_dir=tmp_path, cache_disable=cache_disable, ignore_env=True)
+    file_index = pl.DataFrame({"filename": [URL], "datetime": [dt.datetime(2019, 8, 1)]})
+    archive = _create_archive()
+    with (
+        mock.patch("wetterdienst.provider.dwd.radar.api.create_fileindex_radolan_cdc", return_value=file_index),
+        mock.patch(
+            "wetterdienst.provider.dwd.radar.api.download_file",
+            side_effect=lambda **_: BytesIO(archive),
+        ) as download,
+    ):
+        results = _query(settings, "2019-08-08 01:50")
+        assert [result.filename for result in results] == ["raa01-rw_10000-1908080150-dwd---bin"]
+        assert results[0].timestamp == dt.datetime(2019, 8, 8, 1, 50)
+        assert results[0].url == URL
+        assert results[0].data.read() == b"raa01-rw_10000-1908080150-dwd---bin"
+        # another hour of the month is read from the decompressed copy of the archive
+        results = _query(settings, "2019-08-08 02:50")
+        assert [result.filename for result in results] == ["raa01-rw_10000-1908080250-dwd---bin"]
+    if cache_disable:
+        assert download.call_count == 2
+    else:
+        assert download.call_count == 1
+        path = tmp_path / "radolan/climate_environment/CDC/grids_germany/hourly/radolan/historical/bin/2019"
+        assert sorted(file.name for file in path.iterdir()) == ["RW201908.json", "RW201908.tar"]
@@ -0,0 +1,52 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import datetime as dt
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+from wetterdienst.provider.dwd.radar.api import RadarResult
+from wetterdienst.provider.dwd.radar.cube import RadolanCube, read_radolan_composite, write_radolan_cube
+
+
+def _create_composite(date: dt.datetime, value: int) -> BytesIO:
+    header = f"RW{date:%d%H%M}10000{date:%m%y}BY1620130VS 3SW   2.28.0PR E-01INT  60GP 900x 900MS 0:"
+    raw = np.full((900, 900), value, dtype="<u2")
+    # no data flag
+    raw[0, 0] = 0x2000 | 5
+    # negative flag
+    raw[0, 1] = 0x4000 | 5
+    return BytesIO(header.encode() + b"\x03" + raw.tobytes())
+
+
+@pytest.fixture
+def results():
+    dates = [dt.datetime(2019, 8, 8, hour, 50) for hour in range(3)]
+    return [RadarResult(data=_create_composite(date, hour), timestamp=date) for hour, date in enumerate(dates)]
+
+
+def test_read_radolan_composite():
+    attrs, values = read_radolan_composite(_create_composite(dt.datetime(2019, 8, 8, 0, 50), 12))
+    assert attrs == {"product": "RW", "nrow": 900, "ncol": 900, "precision": 0.1}
+    assert values.dtype == np.float32
+    assert np.isnan(values[0, 0])
+    assert values[0, 1] == pytest.approx(-0.5)
+    assert values[1, 1] == pytest.approx(1.2)
+    with pytest.raises(ValueError):
+        read_radolan_composite(BytesIO(b"no radolan"))
+
+
+def test_radolan_cube(tmp_path, results):
+    cube = write_radolan_cube(results, tmp_path / "cube")
+    assert isinstance(cube.data, np.memmap)
+    assert cube.data.shape == (3, 900, 900)
+    # a cube can be opened again without decoding the composites
+    cube = RadolanCube(tmp_path / "cube")
+    assert cube.timestamps == [result.timestamp for result in results]
+    assert cube.sel_time(dt.datetime(2019, 8, 8, 1), dt.datetime(2019, 8, 8, 2, 50)).shape == (2, 900, 900)
+    assert cube.sel_point(-522.0, -4658.0).tolist() == pytest.approx([-0.5, -0.5, -0.5])
+    assert cube.sel_point(-500.0, -4000.0).tolist() == pytest.approx([0.0, 0.1, 0.2])
+    assert cube.sel_bbox(-500.0, -4000.0, -490.5, -3995.0, start_date=dt.datetime(2019, 8, 8, 2)).shape == (1, 6, 10)
+    with pytest.raises(ValueError):
+        cube.sel_point(-600.0, -4000.0)
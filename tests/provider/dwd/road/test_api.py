@@ -1,7 +1,20 @@
+import datetime as dt
+from io import BytesIO
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import polars as pl
 import pytest
 
 from wetterdienst import Settings
-from wetterdienst.provider.dwd.road.api import DwdRoadRequest, DwdRoadStationGroup
+from wetterdienst.core.timeseries.result import StationsFilter, StationsResult
+from wetterdienst.provider.dwd.road.api import (
+    DECODE_MAX_WORKERS,
+    DwdRoadRequest,
+    DwdRoadStationGroup,
+    DwdRoadValues,
+    _get_decode_executor,
+)
 from wetterdienst.util.cache import CacheExpiry
 from wetterdienst.util.eccodes import ensure_eccodes, ensure_pdbufr
 from wetterdienst.util.network import list_remote_files_fsspec
@@ -44,3 +57,52 @@ def test_dwd_road_weather_station_groups():
     if "quality-assured" in files:
         files.remove("quality-assured")
     assert files == {group.value for group in DwdRoadStationGroup}
+
+
+@mock.patch("wetterdienst.provider.dwd.road.api.check_pdbufr")
+def test_dwd_road_weather_decode_station_group_once(_, tmp_path):
+    date = dt.datetime(2024, 10, 1, 12, tzinfo=ZoneInfo("UTC"))
+    url = "https://opendata.dwd.de/weather/weather_reports/road_weather_stations/KK/roadweather_KK_{}.bin"
+    file_index = pl.DataFrame({"filename": [url.format(1), url.format(2)], "date": [date, date]})
+
+    def _parse(file, executor):  # noqa: ARG001
+        return pl.DataFrame(
+            {
+                "station_id": ["A006", "A006", "A007", "A007"],
+                "date": [date] * 4,
+                "parameter": ["airtemperature", "dewpointtemperature"] * 2,
+                "value": [280.0, 275.0, 281.0, 276.0],
+                "quality": [None] * 4,
+            },
+            schema_overrides={"quality": pl.Float64},
+        )
+
+    settings = Settings(cache_dir=tmp_path, ignore_env=True)
+    request = DwdRoadRequest(parameter="minute_15", settings=settings)
+    stations = StationsResult(
+        stations=request,
+        df=pl.DataFrame({"station_id": ["A006", "A007"], "station_group": ["KK", "KK"]}),
+        df_all=pl.DataFrame({"station_id": ["A006", "A007"], "station_group": ["KK", "KK"]}),
+        stations_filter=StationsFilter.BY_STATION_ID,
+    )
+    values = request._values.from_stations(stations)
+    with (
+        mock.patch.object(DwdRoadValues, "_create_file_index_for_dwd_road_weather_station", return_value=file_index),
+        mock.patch("wetterdienst.util.archive.download_file", side_effect=lambda **_: BytesIO(b"BUFR")) as download,
+        mock.patch("wetterdienst.provider.dwd.road.api._parse_dwd_road_weather_data", side_effect=_parse) as parse,
+    ):
+        df_a006 = values._collect_station_data("A006")
+        df_a007 = values._collect_station_data("A007")
+    # each file is downloaded and decoded once for all stations of the group
+    assert download.call_count == 2
+    assert parse.call_count == 2
+    assert df_a006.get_column("station_id").unique().to_list() == ["A006"]
+    assert df_a007.get_column("value").to_list() == [281.0, 276.0]
+
+
+def test_dwd_road_weather_decode_executor():
+    executor = _get_decode_executor()
+    # one pool of spawned processes is shared by all stations
+    assert _get_decode_executor() is executor
+    assert executor._mp_context.get_start_method() == "spawn"
+    assert executor._max_workers == DECODE_MAX_WORKERS
@@ -16,13 +16,20 @@ def test_default_settings(caplog):
     default_settings = Settings.default()
     assert not default_settings.cache_disable
     assert re.match(WD_CACHE_DIR_PATTERN, str(default_settings.cache_dir))
+    assert default_settings.cache_stale_while_revalidate == 0
+    assert default_settings.cache_max_size is None
+    assert default_settings.cache_max_size_per_bucket == {}
     assert default_settings.fsspec_client_kwargs == {}
+    assert default_settings.fsspec_pool_size_per_host == {"default": 10}
     assert default_settings.ts_humanize
     assert default_settings.ts_shape == "long"
     assert default_settings.ts_si_units
     assert not default_settings.ts_skip_empty
     assert default_settings.ts_skip_threshold == 0.95
     assert not default_settings.ts_dropna
+    assert default_settings.ts_max_workers == 1
+    assert not default_settings.ts_store
+    assert default_settings.ts_store_expiry == 300
     assert default_settings.ts_interpolation_station_distance == {
         "default": 40.0,
         "precipitation_height": 20.0,
@@ -36,12 +43,26 @@ def test_default_settings(caplog):
 def test_settings_envs(caplog):
     """Test default settings but with multiple envs set"""
     os.environ["WD_CACHE_DISABLE"] = "1"
+    os.environ["WD_CACHE_STALE_WHILE_REVALIDATE"] = "600"
+    os.environ["WD_CACHE_MAX_SIZE"] = "1000000000"
+    os.environ["WD_CACHE_MAX_SIZE_PER_BUCKET"] = "default=500000000,snapshot=100000000"
     os.environ["WD_TS_SHAPE"] = "wide"
+    os.environ["WD_TS_MAX_WORKERS"] = "4"
+    os.environ["WD_TS_STORE"] = "1"
+    os.environ["WD_TS_STORE_EXPIRY"] = "86400"
+    os.environ["WD_FSSPEC_POOL_SIZE_PER_HOST"] = "opendata.dwd.de=20"
     os.environ["WD_TS_INTERPOLATION_STATION_DISTANCE"] = "precipitation_height=40.0,other=42"
     caplog.set_level(logging.INFO)
     settings = Settings()
     assert caplog.messages[0] == "Wetterdienst cache is disabled"
+    assert settings.cache_stale_while_revalidate == 600
+    assert settings.cache_max_size == 1000000000
+    assert settings.cache_max_size_per_bucket == {"default": 500000000, "snapshot": 100000000}
     assert settings.ts_shape == "wide"
+    assert settings.ts_max_workers == 4
+    assert settings.ts_store
+    assert settings.ts_store_expiry == 86400
+    assert settings.fsspec_pool_size_per_host == {"default": 10, "opendata.dwd.de": 20}
     assert settings.ts_interpolation_station_distance == {
         "default": 40.0,
         "precipitation_height": 40.0,
@@ -1,6 +1,9 @@
 # Copyright (C) 2018-2021, earthobservations developers.
 # Distributed under the MIT License. See LICENSE for more info.
 import json
+import os
+import time
+from unittest import mock
 
 import pytest
 from click.testing import CliRunner
@@ -32,10 +35,47 @@ def test_cli_help():
         "  interpolate\n"
         "  summarize\n"
         "  radar\n"
-        "  stripes\n" in result.output
+        "  stripes\n"
+        "  sync\n" in result.output
     )
 
 
+def test_cli_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("WD_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("WD_CACHE_MAX_SIZE", "1000")
+    old = tmp_path / "snapshot" / "old.parquet"
+    new = tmp_path / "fsspec" / "ttl-FIVE_MINUTES" / "new"
+    for path in (old, new):
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"x" * 100)
+    two_days_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(old, (two_days_ago, two_days_ago))
+    runner = CliRunner()
+    result = runner.invoke(cli, "cache")
+    assert result.output.strip() == str(tmp_path)
+    result = runner.invoke(cli, "cache stats")
+    assert json.loads(result.output) == {
+        "cache_dir": str(tmp_path),
+        "buckets": {
+            "fsspec/ttl-FIVE_MINUTES": {"size": 100, "count": 1},
+            "snapshot": {"size": 100, "count": 1},
+        },
+        "total": {"size": 200, "count": 2},
+        "max_size": 1000,
+        "max_size_per_bucket": {},
+    }
+    result = runner.invoke(cli, "cache prune --max-size=150")
+    assert json.loads(result.output) == {"evicted": 1, "size": 100}
+    assert not old.exists()
+    result = runner.invoke(cli, "cache clear --older-than=1d")
+    assert json.loads(result.output) == {"removed": 0, "size": 0}
+    result = runner.invoke(cli, "cache clear")
+    assert json.loads(result.output) == {"removed": 1, "size": 100}
+    assert not new.exists()
+    result = runner.invoke(cli, "cache clear --older-than=1x")
+    assert result.exit_code == 2
+
+
 def test_cli_about_parameters():
     """Test cli coverage of dwd parameters"""
     runner = CliRunner()
@@ -79,6 +119,31 @@ def test_no_network(caplog):
     assert "No API available for provider DWD and network abc" in caplog.text
 
 
+def test_cli_sync_not_available(caplog):
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        "sync --provider=dwd --network=mosmix --parameter=large --resolution=large",
+    )
+    assert result.exit_code == 1
+    assert "Syncing is only available for provider DWD and network observation" in caplog.text
+
+
+def test_cli_sync_pads_station_ids():
+    runner = CliRunner()
+    with mock.patch(
+        "wetterdienst.provider.dwd.observation.store.sync_climate_observations_store",
+        return_value={"synced": 1, "skipped": 0, "failed": 0},
+    ) as sync:
+        result = runner.invoke(
+            cli,
+            "sync --provider=dwd --network=observation --parameter=kl --resolution=daily --period=recent "
+            "--station=1048,01050",
+        )
+    assert result.exit_code == 0
+    assert sync.call_args.kwargs["station_id"] == ["01048", "01050"]
+
+
 @pytest.mark.remote
 def test_cli_interpolate():
     runner = CliRunner()
@@ -1,5 +1,9 @@
 # Copyright (C) 2018-2021, earthobservations developers.
 # Distributed under the MIT License. See LICENSE for more info.
+import json
+import time
+from unittest import mock
+
 import pytest
 from dirty_equals import IsNumber, IsStr
 
@@ -322,6 +326,48 @@ def test_dwd_values_sql_long(client):
     }
 
 
+@pytest.mark.remote
+def test_dwd_values_stream_ndjson(client):
+    response = client.get(
+        "/api/values",
+        params={
+            "provider": "dwd",
+            "network": "observation",
+            "station": "01048,4411",
+            "parameter": "kl",
+            "resolution": "daily",
+            "date": "2019-12-01/2019-12-31",
+            "si-units": False,
+            "format": "ndjson",
+            "stream": True,
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert {item["station_id"] for item in items} == {"01048", "04411"}
+    assert items[0].keys() == {"station_id", "dataset", "parameter", "date", "value", "quality"}
+
+
+def test_values_stream_wrong_format(client):
+    response = client.get(
+        "/api/values",
+        params={
+            "provider": "dwd",
+            "network": "observation",
+            "station": "01048",
+            "parameter": "kl",
+            "resolution": "daily",
+            "format": "json",
+            "stream": True,
+        },
+    )
+    assert response.status_code == 400
+    assert response.json() == {
+        "detail": "Query argument 'format' must be one of 'csv' or 'ndjson' when using 'stream'",
+    }
+
+
 @pytest.mark.remote
 def test_dwd_interpolate(client):
     response = client.get(
@@ -650,3 +696,18 @@ def test_stripes_values_wrong_dpi(client):
     )
     assert response.status_code == 400
     assert response.json() == {"detail": "Query argument 'dpi' must be more than 0"}
+
+
+def test_lifespan_refresh_hot_keys(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from wetterdienst.ui import restapi
+
+    monkeypatch.setenv("WD_CACHE_STALE_WHILE_REVALIDATE", "600")
+    monkeypatch.setattr(restapi, "HOT_KEYS_REFRESH_INTERVAL", 0.01)
+    with mock.patch.object(restapi, "refresh_hot_keys", return_value=0) as refresh_hot_keys:
+        with TestClient(restapi.app):
+            deadline = time.time() + 5
+            while not refresh_hot_keys.called and time.time() < deadline:
+                time.sleep(0.01)
+    refresh_hot_keys.assert_called_with(margin=0.02)
@@ -0,0 +1,49 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+from collections import OrderedDict
+from io import BytesIO
+from unittest import mock
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from wetterdienst import Settings
+from wetterdienst.util import archive
+from wetterdienst.util.archive import read_parsed_file
+
+URL = "https://danepubliczne.imgw.pl/data/dane_pomiarowo_obserwacyjne/dane_hydrologiczne/dobowe/1951/codz_1951_01.zip"
+
+
+@pytest.fixture
+def parsed_file_cache(monkeypatch):
+    parsed_file_cache = OrderedDict()
+    monkeypatch.setattr(archive, "_parsed_file_cache", parsed_file_cache)
+    return parsed_file_cache
+
+
+def _parse(file_in_bytes: BytesIO) -> pl.DataFrame:
+    return pl.read_csv(file_in_bytes, schema_overrides={"station_id": pl.String})
+
+
+@mock.patch(
+    "wetterdienst.util.archive.download_file",
+    side_effect=lambda **_: BytesIO(b"station_id,value\n150160180,1.0\n149180020,2.0\n150160180,3.0\n"),
+)
+def test_read_parsed_file(mock_download, parsed_file_cache, tmp_path):
+    settings = Settings(cache_dir=tmp_path, ignore_env=True)
+    parse = mock.Mock(side_effect=_parse)
+    df = read_parsed_file(URL, "150160180", parse, settings)
+    assert_frame_equal(df, pl.DataFrame({"station_id": ["150160180", "150160180"], "value": [1.0, 3.0]}))
+    # another station is filtered from the parsed file held in memory
+    df = read_parsed_file(URL, "149180020", parse, settings)
+    assert df.get_column("value").to_list() == [2.0]
+    assert mock_download.call_count == 1
+    assert parse.call_count == 1
+    # a later request reads the parsed file from the cache directory
+    parsed_file_cache.clear()
+    df = read_parsed_file(URL, "150160180", parse, settings)
+    assert df.get_column("value").to_list() == [1.0, 3.0]
+    assert mock_download.call_count == 1
+    assert parse.call_count == 1
+    assert (tmp_path / "parsed/ttl-FIVE_MINUTES" / URL.split("://")[1]).with_suffix(".parquet").exists()
@@ -0,0 +1,109 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import os
+import time
+
+from diskcache import Cache
+
+from wetterdienst.settings import Settings
+from wetterdienst.util.cache import CacheIndex
+
+
+def _write(path, size: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def _age(index: CacheIndex, path, seconds: float):
+    accessed = time.time() - seconds
+    index._connection.execute(
+        "UPDATE entries SET accessed = ? WHERE path = ?",
+        (accessed, path.relative_to(index.cache_dir).as_posix()),
+    )
+
+
+def test_cache_index_stats(tmp_path):
+    index = CacheIndex(tmp_path)
+    bucket = tmp_path / "fsspec" / "ttl-FIVE_MINUTES"
+    index.add(_write(bucket / "a", 100), [_write(bucket / "a.validators", 10)])
+    index.add(_write(bucket / "b", 200))
+    index.add(_write(tmp_path / "snapshot" / "weather" / "c.parquet", 50))
+    # updating an entry replaces its size
+    index.add(_write(bucket / "b", 300))
+    with Cache(tmp_path / "300.0") as listings:
+        listings.set("https://opendata.dwd.de/", ["a", "b"])
+    stats = index.stats()
+    assert stats["fsspec/ttl-FIVE_MINUTES"] == {"size": 410, "count": 2}
+    assert stats["snapshot"] == {"size": 50, "count": 1}
+    assert stats["listings/300.0"]["count"] == 1
+
+
+def test_cache_index_evict_least_recently_used(tmp_path):
+    index = CacheIndex(tmp_path)
+    bucket = tmp_path / "fsspec" / "ttl-FIVE_MINUTES"
+    files = [_write(bucket / name, 100) for name in "abc"]
+    for i, file in enumerate(files):
+        index.add(file, [_write(file.with_name(file.name + ".validators"), 0)])
+        _age(index, file, 300 - i * 100)
+    # a is used recently, so b is the least recently used one
+    index.touch(files[0])
+    settings = Settings(cache_dir=tmp_path, cache_max_size_per_bucket={"fsspec/ttl-FIVE_MINUTES": 250}, ignore_env=True)
+    assert index.evict(settings) == (1, 100)
+    assert not files[1].exists()
+    assert not files[1].with_name("b.validators").exists()
+    assert files[0].exists() and files[2].exists()
+    # the total budget applies to all buckets together
+    index.add(_write(tmp_path / "parsed" / "ttl-FIVE_MINUTES" / "d.parquet", 100))
+    settings = Settings(cache_dir=tmp_path, cache_max_size=150, ignore_env=True)
+    assert index.evict(settings) == (2, 200)
+    assert index.stats() == {"parsed/ttl-FIVE_MINUTES": {"size": 100, "count": 1}}
+
+
+def test_cache_index_add_evicts_beyond_budget(tmp_path):
+    index = CacheIndex(tmp_path)
+    settings = Settings(cache_dir=tmp_path, cache_max_size_per_bucket={"default": 150}, ignore_env=True)
+    bucket = tmp_path / "parsed" / "ttl-FIVE_MINUTES"
+    index.add(_write(bucket / "a.parquet", 100), settings=settings)
+    _age(index, bucket / "a.parquet", 100)
+    index.add(_write(bucket / "b.parquet", 100), settings=settings)
+    assert not (bucket / "a.parquet").exists()
+    assert index.stats()["parsed/ttl-FIVE_MINUTES"] == {"size": 100, "count": 1}
+
+
+def test_cache_index_clear(tmp_path):
+    index = CacheIndex(tmp_path)
+    bucket = tmp_path / "fsspec" / "ttl-TWELVE_HOURS"
+    old = _write(bucket / "old", 100)
+    new = _write(bucket / "new", 100)
+    index.add(old)
+    index.add(new)
+    _age(index, old, 3 * 24 * 60 * 60)
+    assert index.clear(older_than=24 * 60 * 60) == (1, 100)
+    assert not old.exists()
+    assert new.exists()
+    assert index.clear() == (1, 100)
+    assert not new.exists()
+    assert index.stats() == {}
+
+
+def test_cache_index_scan_existing_files(tmp_path):
+    radolan = tmp_path / "radolan" / "climate_environment" / "RW-200901.tar"
+    _write(radolan, 100)
+    _write(radolan.with_suffix(".json"), 10)
+    fsspec = tmp_path / "fsspec" / "ttl-FIVE_MINUTES"
+    _write(fsspec / "cache", 10)
+    _write(fsspec / "a", 100)
+    _write(fsspec / "a.validators", 10)
+    _write(fsspec / "b.lock", 0)
+    os.utime(fsspec / "a", (time.time() - 100, time.time() - 100))
+    index = CacheIndex(tmp_path)
+    assert index.stats() == {
+        "fsspec/ttl-FIVE_MINUTES": {"size": 110, "count": 1},
+        "radolan": {"size": 110, "count": 1},
+    }
+    # the modification time of existing files is their last access
+    settings = Settings(cache_dir=tmp_path, cache_max_size=150, ignore_env=True)
+    assert index.evict(settings) == (1, 110)
+    assert not (fsspec / "a").exists()
+    assert radolan.exists()
@@ -4,7 +4,13 @@ import numpy as np
 import polars as pl
 from polars.testing import assert_series_equal
 
-from wetterdienst.util.geo import Coordinates, convert_dm_to_dd, convert_dms_string_to_dd, derive_nearest_neighbours
+from wetterdienst.util.geo import (
+    Coordinates,
+    SpatialIndex,
+    convert_dm_to_dd,
+    convert_dms_string_to_dd,
+    derive_nearest_neighbours,
+)
 
 
 def test_get_coordinates():
@@ -60,3 +66,38 @@ def test_derive_nearest_neighbours():
     )
     np.testing.assert_array_almost_equal(distances, np.array([[0.001594], [0.002133]]))
     np.testing.assert_array_almost_equal(indices_nearest_neighbours, np.array([[2], [5]]))
+
+
+def test_spatial_index_query():
+    metadata = pl.DataFrame(
+        {
+            "latitude": [52.1042, 52.8568, 49.9195, 55.0, 48.2639, 51.2835],
+            "longitude": [8.7521, 11.1319, 8.9671, 6.3333, 8.8134, 9.359],
+        },
+    )
+    index = SpatialIndex(latitudes=metadata.get_column("latitude"), longitudes=metadata.get_column("longitude"))
+    assert len(index) == 6
+    coords = Coordinates(np.array([50.0, 51.4]), np.array([8.9, 9.3]))
+    distances, indices = index.query(coords, k=2)
+    np.testing.assert_array_almost_equal(distances, np.array([[0.001594, 0.02297], [0.002133, 0.013642]]))
+    np.testing.assert_array_equal(indices, np.array([[2, 5], [5, 0]]))
+    # k is capped at the number of stations
+    _, indices = index.query(coords, k=10)
+    assert indices.shape == (2, 6)
+
+
+def test_spatial_index_query_radius():
+    metadata = pl.DataFrame(
+        {
+            "latitude": [52.1042, 52.8568, 49.9195, 55.0, 48.2639, 51.2835],
+            "longitude": [8.7521, 11.1319, 8.9671, 6.3333, 8.8134, 9.359],
+        },
+    )
+    index = SpatialIndex(latitudes=metadata.get_column("latitude"), longitudes=metadata.get_column("longitude"))
+    coords = Coordinates(np.array([50.0, 51.4, 0.0]), np.array([8.9, 9.3, 0.0]))
+    distances, indices = index.query_radius(coords, radius=0.02)
+    np.testing.assert_array_almost_equal(distances[0], np.array([0.001594]))
+    np.testing.assert_array_equal(indices[0], np.array([2]))
+    np.testing.assert_array_almost_equal(distances[1], np.array([0.002133, 0.013642]))
+    np.testing.assert_array_equal(indices[1], np.array([5, 0]))
+    assert indices[2].size == 0
@@ -1,11 +1,288 @@
 # Copyright (C) 2018-2021, earthobservations developers.
 # Distributed under the MIT License. See LICENSE for more info.
+import functools
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
 from wetterdienst.settings import Settings
-from wetterdienst.util.cache import CacheExpiry
-from wetterdienst.util.network import NetworkFilesystemManager
+from wetterdienst.util import network
+from wetterdienst.util.cache import CacheExpiry, CacheIndex
+from wetterdienst.util.network import (
+    FileDirCache,
+    NetworkFilesystemManager,
+    download_file,
+    list_remote_files_fsspec,
+    refresh_hot_keys,
+)
+
+
+class RecordingHTTPRequestHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def parse_request(self):
+        parsed = super().parse_request()
+        if parsed:
+            self.server.requests.append((self.client_address, self.command, self.path, dict(self.headers)))
+        return parsed
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        super().do_GET()
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    directory = tmp_path / "server"
+    (directory / "data").mkdir(parents=True)
+    for i in range(3):
+        (directory / "data" / f"file_{i}.txt").write_text(f"content {i}")
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(RecordingHTTPRequestHandler, directory=str(directory))
+    )
+    server.requests = []
+    server.delay = 0
+    server.directory = directory
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_port}/{path}"
 
 
 def test_create_fsspec_filesystem():
     fs1 = NetworkFilesystemManager.get(settings=Settings.default(), ttl=CacheExpiry.METAINDEX)
     fs2 = NetworkFilesystemManager.get(settings=Settings.default(), ttl=CacheExpiry.METAINDEX)
     assert id(fs1) == id(fs2)
+
+
+def test_network_pooled_client(http_server, tmp_path):
+    host = f"127.0.0.1:{http_server.server_port}"
+    settings = Settings(cache_dir=tmp_path / "cache", fsspec_pool_size_per_host={host: 2}, ignore_env=True)
+    files = list_remote_files_fsspec(_url(http_server, "data/"), settings=settings, ttl=CacheExpiry.NO_CACHE)
+    assert sorted(files) == [_url(http_server, f"data/file_{i}.txt") for i in range(3)]
+    for ttl in (CacheExpiry.NO_CACHE, CacheExpiry.FIVE_MINUTES):
+        for i in range(3):
+            file = download_file(_url(http_server, f"data/file_{i}.txt"), settings, ttl)
+            assert file.read() == f"content {i}".encode()
+    # all requests to the host went through one kept-alive connection
+    assert len({client_address for client_address, *_ in http_server.requests}) == 1
+    fs = NetworkFilesystemManager.get_http(settings, CacheExpiry.NO_CACHE, _url(http_server, "data/"))
+    assert fs._session.connector.limit_per_host == 2
+    # settings with another pool size get a client with their own limit
+    settings = Settings(cache_dir=tmp_path / "cache", fsspec_pool_size_per_host={host: 3}, ignore_env=True)
+    assert download_file(_url(http_server, "data/file_0.txt"), settings, CacheExpiry.NO_CACHE).read() == b"content 0"
+    fs = NetworkFilesystemManager.get_http(settings, CacheExpiry.NO_CACHE, _url(http_server, "data/"))
+    assert fs._session.connector.limit_per_host == 3
+
+
+def test_network_revalidate_expired_file(http_server, tmp_path):
+    settings = Settings(cache_dir=tmp_path / "cache", ignore_env=True)
+    url = _url(http_server, "data/file_0.txt")
+    assert download_file(url, settings, ttl=1).read() == b"content 0"
+    # served from the cache while it is valid
+    assert download_file(url, settings, ttl=1).read() == b"content 0"
+    assert len(http_server.requests) == 1
+    time.sleep(1.1)
+    # an expired file is revalidated with a conditional request and kept as it is not modified
+    assert download_file(url, settings, ttl=1).read() == b"content 0"
+    assert len(http_server.requests) == 2
+    assert "If-Modified-Since" in http_server.requests[-1][3]
+    # the expiration was extended
+    assert download_file(url, settings, ttl=1).read() == b"content 0"
+    assert len(http_server.requests) == 2
+    time.sleep(1.1)
+    # a modified file is downloaded again
+    file = http_server.directory / "data" / "file_0.txt"
+    file.write_text("modified content 0")
+    os.utime(file, (time.time() + 10, time.time() + 10))
+    assert download_file(url, settings, ttl=1).read() == b"modified content 0"
+    assert len(http_server.requests) == 3
+
+
+def _wait_for(condition, timeout: float = 5) -> None:
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.05)
+
+
+def test_network_stale_while_revalidate(http_server, tmp_path):
+    settings = Settings(cache_dir=tmp_path / "cache", cache_stale_while_revalidate=60, ignore_env=True)
+    url = _url(http_server, "data/file_0.txt")
+    assert download_file(url, settings, ttl=1).read() == b"content 0"
+    files = list_remote_files_fsspec(_url(http_server, "data/"), settings=settings, ttl=1)
+    assert len(files) == 3
+    time.sleep(1.1)
+    file = http_server.directory / "data" / "file_0.txt"
+    file.write_text("modified content 0")
+    os.utime(file, (time.time() + 10, time.time() + 10))
+    (http_server.directory / "data" / "file_3.txt").write_text("content 3")
+    # expired entries are served while they are refreshed in the background
+    assert download_file(url, settings, ttl=1).read() == b"content 0"
+    assert list_remote_files_fsspec(_url(http_server, "data/"), settings=settings, ttl=1) == files
+    _wait_for(lambda: len(http_server.requests) == 4 and not network._refreshing)
+    assert download_file(url, settings, ttl=1).read() == b"modified content 0"
+    assert len(list_remote_files_fsspec(_url(http_server, "data/"), settings=settings, ttl=1)) == 4
+    assert len(http_server.requests) == 4
+
+
+def test_network_refresh_hot_keys(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(network, "_hot_keys", {})
+    settings = Settings(cache_dir=tmp_path / "cache", cache_stale_while_revalidate=60, ignore_env=True)
+    url = _url(http_server, "data/file_1.txt")
+    assert download_file(url, settings, ttl=2).read() == b"content 1"
+    assert refresh_hot_keys(margin=0) == 0
+    file = http_server.directory / "data" / "file_1.txt"
+    file.write_text("modified content 1")
+    os.utime(file, (time.time() + 10, time.time() + 10))
+    # entries which expire within the margin are refreshed
+    assert refresh_hot_keys(margin=2) == 1
+    assert len(http_server.requests) == 2
+    assert download_file(url, settings, ttl=2).read() == b"modified content 1"
+    assert len(http_server.requests) == 2
+
+
+def test_network_single_flight_download_threads(http_server, tmp_path):
+    http_server.delay = 0.5
+    settings = Settings(cache_dir=tmp_path / "cache", ignore_env=True)
+    url = _url(http_server, "data/file_2.txt")
+    with ThreadPoolExecutor(8) as executor:
+        contents = list(executor.map(lambda _: download_file(url, settings, CacheExpiry.FIVE_MINUTES).read(), range(8)))
+    assert contents == [b"content 2"] * 8
+    assert len(http_server.requests) == 1
+
+
+def test_network_single_flight_download_processes(http_server, tmp_path):
+    http_server.delay = 3
+    url = _url(http_server, "data/file_2.txt")
+    script = (
+        "from wetterdienst.settings import Settings;"
+        "from wetterdienst.util.cache import CacheExpiry;"
+        "from wetterdienst.util.network import download_file;"
+        f"settings = Settings(cache_dir={str(tmp_path / 'cache')!r}, ignore_env=True);"
+        f"print(download_file({url!r}, settings, CacheExpiry.FIVE_MINUTES).read().decode())"
+    )
+    processes = [subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE) for _ in range(3)]  # noqa: S603
+    outputs = [process.communicate(timeout=60)[0] for process in processes]
+    assert outputs == [b"content 2\n"] * 3
+    assert len(http_server.requests) == 1
+
+
+def test_network_single_flight_stale_lock_file(http_server, tmp_path):
+    settings = Settings(cache_dir=tmp_path / "cache", ignore_env=True)
+    url = _url(http_server, "data/file_2.txt")
+    fs = NetworkFilesystemManager.get(settings, CacheExpiry.FIVE_MINUTES, url)
+    fs._mkcache()
+    lock = tmp_path / "cache" / "fsspec" / "ttl-FIVE_MINUTES" / (fs._mapper(url) + network.LOCK_SUFFIX)
+    lock.write_text("0")
+    os.utime(lock, (time.time() - network.LOCK_TIMEOUT - 1,) * 2)
+    assert download_file(url, settings, CacheExpiry.FIVE_MINUTES).read() == b"content 2"
+    assert not lock.exists()
+
+
+def test_network_evict_least_recently_used(http_server, tmp_path):
+    settings = Settings(cache_dir=tmp_path / "cache", ignore_env=True)
+    urls = [_url(http_server, f"data/file_{i}.txt") for i in range(3)]
+    download_file(urls[0], settings, CacheExpiry.FIVE_MINUTES)
+    # the budget of the bucket is enough for one file and its validators
+    size = CacheIndex.get(tmp_path / "cache").stats()["fsspec/ttl-FIVE_MINUTES"]["size"]
+    settings = Settings(
+        cache_dir=tmp_path / "cache",
+        cache_max_size_per_bucket={"fsspec/ttl-FIVE_MINUTES": size},
+        ignore_env=True,
+    )
+    for url in urls[1:]:
+        assert download_file(url, settings, CacheExpiry.FIVE_MINUTES).read()
+    fs = NetworkFilesystemManager.get(settings, CacheExpiry.FIVE_MINUTES, urls[0])
+    bucket = tmp_path / "cache" / "fsspec" / "ttl-FIVE_MINUTES"
+    # only the file which was downloaded last is kept
+    assert [(bucket / fs._mapper(url)).exists() for url in urls] == [False, False, True]
+
+
+def test_network_single_flight_refresh_lock_file(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(network, "LOCK_TIMEOUT", 0.5)
+    monkeypatch.setattr(network, "LOCK_REFRESH_INTERVAL", 0.1)
+    http_server.delay = 1.5
+    settings = Settings(cache_dir=tmp_path / "cache", ignore_env=True)
+    url = _url(http_server, "data/file_2.txt")
+    fs = NetworkFilesystemManager.get(settings, CacheExpiry.FIVE_MINUTES, url)
+    lock = tmp_path / "cache" / "fsspec" / "ttl-FIVE_MINUTES" / (fs._mapper(url) + network.LOCK_SUFFIX)
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(download_file, url, settings, CacheExpiry.FIVE_MINUTES)
+        _wait_for(lock.exists)
+        # the lock of a download which takes longer than the timeout is kept alive
+        while not future.done():
+            assert not network._is_stale_lock_file(lock)
+            time.sleep(0.05)
+        assert future.result().read() == b"content 2"
+    assert not lock.exists()
+
+
+def test_network_single_flight_lock_file_of_finished_process(tmp_path):
+    process = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, check=True)  # noqa: S603
+    lock = tmp_path / "file.lock"
+    lock.write_text(f"{socket.gethostname()}:{process.stdout.decode().strip()}")
+    # the process which holds the lock is gone, so waiters do not wait for the timeout
+    assert network._is_stale_lock_file(lock)
+    lock.write_text(network._get_lock_owner())
+    assert not network._is_stale_lock_file(lock)
+
+
+def test_network_single_flight_lock_file_taken_over(tmp_path):
+    lock = tmp_path / "file.lock"
+    assert network._acquire_lock_file(lock)
+    with network._hold_lock_file(lock):
+        lock.write_text("other-host:1")
+    # the lock of another process is not removed
+    assert lock.read_text() == "other-host:1"
+
+
+def test_file_dir_cache_iterates_stored_keys(tmp_path):
+    dircache = FileDirCache(
+        use_listings_cache=True,
+        listings_expiry_time=60,
+        listings_cache_location=tmp_path,
+        stale_while_revalidate=60,
+    )
+    dircache["a"] = [{"name": "a"}]
+    dircache["b"] = [{"name": "b"}]
+    dircache._cache.set("b", [{"name": "b"}], expire=120, tag=time.time() - 90)
+    # expired listings which are still kept are counted and iterated without reading them
+    assert len(dircache) == 2
+    assert sorted(dircache) == ["a", "b"]
+    assert "b" not in dircache
+
+
+def test_network_single_flight_open(http_server, tmp_path):
+    http_server.delay = 0.5
+    settings = Settings(cache_dir=tmp_path / "cache", ignore_env=True)
+    url = _url(http_server, "data/file_2.txt")
+    fs = NetworkFilesystemManager.get(settings, CacheExpiry.FIVE_MINUTES, url)
+
+    def _open(_):
+        with fs.open(url, block_size=0) as f:
+            return f.read()
+
+    with ThreadPoolExecutor(8) as executor:
+        contents = list(executor.map(_open, range(8)))
+    # files opened for reading go through the cache like downloads
+    assert contents == [b"content 2"] * 8
+    assert len(http_server.requests) == 1
+    bucket = tmp_path / "cache" / "fsspec" / "ttl-FIVE_MINUTES"
+    assert CacheIndex.get(tmp_path / "cache").stats()["fsspec/ttl-FIVE_MINUTES"]["count"] == 1
+    assert (bucket / (fs._mapper(url) + network.VALIDATORS_SUFFIX)).exists()
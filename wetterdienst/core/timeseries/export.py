@@ -7,6 +7,8 @@ import logging
 from abc import abstractmethod
 from copy import copy
 from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
 from urllib.parse import urlunparse
 
 import polars as pl
@@ -15,6 +17,9 @@ import polars.selectors as cs
 from wetterdienst.metadata.columns import Columns
 from wetterdienst.util.url import ConnectionString
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
 log = logging.getLogger(__name__)
 
 
@@ -112,7 +117,7 @@ class ExportMixin:
         df = duckdb.query_df(df, "data", sql).pl()
         return df.with_columns(pl.col(Columns.DATE.value).dt.replace_time_zone("UTC"))
 
-    def to_target(self, target: str):
+    def to_target(self, target: str, if_exists: Literal["replace", "append"] = "replace"):
         """
         Emit Pandas DataFrame to target. A target
         is identified by a connection string.
@@ -130,6 +135,7 @@ class ExportMixin:
         - https://docs.sqlalchemy.org/en/13/dialects/
 
         :param target: Target connection string.
+        :param if_exists: whether to replace or append to an existing database table, files are always replaced
         :return: self
         """
 
@@ -149,6 +155,14 @@ class ExportMixin:
                 df = convert_datetimes(self.df)
                 df.write_excel(filepath)
 
+            elif target.endswith(".csv"):
+                log.info(f"Writing to CSV file '{filepath}'")
+                Path(filepath).write_text(self.to_csv())
+
+            elif target.endswith((".ndjson", ".jsonl")):
+                log.info(f"Writing to NDJSON file '{filepath}'")
+                convert_datetimes(self.df).write_ndjson(filepath)
+
             elif target.endswith(".feather"):
                 # https://arrow.apache.org/docs/python/feather.html
                 log.info(f"Writing to Feather file '{filepath}'")
@@ -255,8 +269,11 @@ class ExportMixin:
 
             connection = duckdb.connect(database=database, read_only=False)
             connection.register("origin", df)
-            connection.execute(f"DROP TABLE IF EXISTS {tablename};")
-            connection.execute(f"CREATE TABLE {tablename} AS SELECT * FROM origin;")  # noqa:S608
+            if if_exists == "append":
+                connection.execute(f"INSERT INTO {tablename} SELECT * FROM origin;")  # noqa:S608
+            else:
+                connection.execute(f"DROP TABLE IF EXISTS {tablename};")
+                connection.execute(f"CREATE TABLE {tablename} AS SELECT * FROM origin;")  # noqa:S608
             connection.close()
 
             log.info("Writing to DuckDB finished")
@@ -469,7 +486,7 @@ class ExportMixin:
                 name=tablename,
                 con=cratedb_target,
                 schema=database,
-                if_exists="replace",
+                if_exists=if_exists,
                 index=False,
                 chunksize=5000,
             )
@@ -512,7 +529,7 @@ class ExportMixin:
             self.df.to_pandas().to_sql(
                 name=tablename,
                 con=target,
-                if_exists="replace",
+                if_exists=if_exists,
                 index=False,
                 method="multi",
                 chunksize=chunk_size,
@@ -536,3 +553,120 @@ def convert_datetimes(df: pl.DataFrame) -> pl.DataFrame:
                 pl.col(date_column).map_elements(lambda v: v.isoformat() if v else None, return_dtype=pl.String),
             )
     return df
+
+
+def _get_stream_schema(result: ExportMixin) -> pl.Schema:
+    """
+    Get the schema of streamed outputs, as they can't change their columns afterwards. Values results take it from
+    the requested parameters and shape, so that it does not depend on the data of the first station. Otherwise the
+    schema of the first result is used with columns of unknown type (only nulls) becoming floats.
+
+    :param result: first non-empty streamed result
+    :return: schema of the streamed output
+    """
+    values = getattr(result, "values", None)
+    if values is not None:
+        return values.get_schema()
+    return pl.Schema({name: pl.Float64 if dtype == pl.Null else dtype for name, dtype in result.df.schema.items()})
+
+
+def _align_to_schema(df: pl.DataFrame, schema: pl.Schema) -> pl.DataFrame:
+    """
+    Align a DataFrame to the schema of a streamed output. Missing columns are filled with nulls, additional columns
+    are dropped and all columns are cast to the data type of the schema.
+
+    :param df: DataFrame to align
+    :param schema: schema of the streamed output
+    :return: aligned DataFrame
+    """
+    dropped = set(df.columns).difference(schema.names())
+    if dropped:
+        log.warning(f"Dropping columns {sorted(dropped)} which are not part of the streamed output")
+    return df.select(
+        pl.col(name).cast(dtype) if name in df.columns else pl.lit(None, dtype=dtype).alias(name)
+        for name, dtype in schema.items()
+    )
+
+
+def stream_format(results: Iterable[ExportMixin], fmt: str) -> Iterator[str]:
+    """
+    Format results one after another, so that only one result is held in memory at a time.
+
+    :param results: iterable of results e.g. from ``TimeseriesValues.query()``
+    :param fmt: output format, one of "csv" or "ndjson"
+    :return: iterator of formatted chunks
+    """
+    fmt = fmt.lower()
+    if fmt not in ("csv", "ndjson"):
+        raise KeyError("Unknown streaming output format")
+    schema = None
+    for result in results:
+        if result.df.is_empty():
+            continue
+        include_header = schema is None
+        if schema is None:
+            schema = _get_stream_schema(result)
+        result.df = _align_to_schema(result.df, schema)
+        if fmt == "csv":
+            yield result.to_csv(include_header=include_header)
+        else:
+            yield convert_datetimes(result.df).write_ndjson()
+
+
+def stream_to_target(results: Iterable[ExportMixin], target: str) -> int:
+    """
+    Emit results one after another to target, so that only one result is held in memory at a time. CSV, NDJSON
+    and Parquet files are written incrementally, each result becoming a row group of the Parquet file. Database
+    tables are replaced by the first result and appended to by the following ones. Other file types can't be
+    appended to, thus their results are collected first.
+
+    :param results: iterable of results e.g. from ``TimeseriesValues.query()``
+    :param target: Target connection string.
+    :return: number of exported non-empty results
+    """
+    count = 0
+    if target.startswith("file://"):
+        filepath = ConnectionString(target).path
+        if target.endswith((".csv", ".ndjson", ".jsonl")):
+            fmt = "csv" if target.endswith(".csv") else "ndjson"
+            log.info(f"Streaming records to {fmt.upper()} file '{filepath}'")
+            with Path(filepath).open("w") as f:
+                for chunk in stream_format(results, fmt):
+                    f.write(chunk)
+                    count += 1
+            return count
+        if target.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            log.info(f"Streaming records to Parquet file '{filepath}'")
+            schema = None
+            writer = None
+            try:
+                for result in results:
+                    if result.df.is_empty():
+                        continue
+                    if schema is None:
+                        schema = _get_stream_schema(result)
+                    table = _align_to_schema(result.df, schema).to_arrow()
+                    if writer is None:
+                        writer = pq.ParquetWriter(filepath, table.schema)
+                    writer.write_table(table)
+                    count += 1
+            finally:
+                if writer:
+                    writer.close()
+            return count
+        log.info(f"Streaming is not supported for target {target}, collecting all records first")
+        data = [result for result in results if not result.df.is_empty()]
+        if not data:
+            return count
+        result = copy(data[-1])
+        result.df = pl.concat([r.df for r in data], how="diagonal_relaxed")
+        result.to_target(target)
+        return len(data)
+    for result in results:
+        if result.df.is_empty():
+            continue
+        result.to_target(target, if_exists="append" if count else "replace")
+        count += 1
+    return count
@@ -4,34 +4,36 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from functools import lru_cache
-from itertools import combinations
-from queue import Queue
+from itertools import chain, combinations
+from math import comb
 from typing import TYPE_CHECKING
 
+import numpy as np
 import polars as pl
 import utm
-from scipy.interpolate import LinearNDInterpolator
-from shapely.geometry import Point, Polygon
+from scipy.spatial import Delaunay
 from tqdm import tqdm
 
-from wetterdienst.core.timeseries.tools import _ParameterData, extract_station_values
+from wetterdienst.core.timeseries.tools import _ParameterData, extract_station_values, iter_station_values
 from wetterdienst.metadata.columns import Columns
 from wetterdienst.metadata.parameter import Parameter
 from wetterdienst.util.logging import TqdmToLogger
 
 if TYPE_CHECKING:
-    from enum import Enum
-
     from wetterdienst.core.timeseries.request import TimeseriesRequest
     from wetterdienst.core.timeseries.result import StationsResult
 
 log = logging.getLogger(__name__)
 
 
-def get_interpolated_df(request: TimeseriesRequest, latitude: float, longitude: float) -> pl.DataFrame:
+def get_interpolated_df(
+    request: TimeseriesRequest,
+    latitude: float,
+    longitude: float,
+    station_values: dict[str, pl.DataFrame] | None = None,
+) -> pl.DataFrame:
     utm_x, utm_y, _, _ = utm.from_latlon(latitude, longitude)
-    stations_dict, param_dict = request_stations(request, latitude, longitude, utm_x, utm_y)
+    stations_dict, param_dict = request_stations(request, latitude, longitude, utm_x, utm_y, station_values)
     return calculate_interpolation(utm_x, utm_y, stations_dict, param_dict, request.interp_use_nearby_station_until_km)
 
 
@@ -41,29 +43,32 @@ def request_stations(
     longitude: float,
     utm_x: float,
     utm_y: float,
+    station_values: dict[str, pl.DataFrame] | None = None,
 ) -> tuple[dict, dict]:
     param_dict = {}
     stations_dict = {}
+    station_groups = StationGroups(utm_x, utm_y)
     distance = max(request.settings.ts_interpolation_station_distance.values())
     stations_ranked = request.filter_by_distance(latlon=(latitude, longitude), distance=distance)
     df_stations_ranked = stations_ranked.df
     tqdm_out = TqdmToLogger(log, level=logging.INFO)
-    for station, result in tqdm(
-        zip(df_stations_ranked.iter_rows(named=True), stations_ranked.values.query()),
+    for station, result_df in tqdm(
+        zip(df_stations_ranked.iter_rows(named=True), iter_station_values(stations_ranked, station_values)),
         total=len(df_stations_ranked),
         desc="querying stations for interpolation",
         unit="station",
         file=tqdm_out,
     ):
-        valid_station_groups_exists = not get_valid_station_groups(stations_dict, utm_x, utm_y).empty()
+        valid_station_groups_exists = not station_groups.empty()
         # check if all parameters found enough stations and the stations build a valid station group
         if len(param_dict) > 0 and all(param.finished for param in param_dict.values()) and valid_station_groups_exists:
             break
-        if result.df.drop_nulls("value").is_empty():
+        if result_df.drop_nulls("value").is_empty():
             continue
-        utm_x, utm_y = utm.from_latlon(station["latitude"], station["longitude"])[:2]
-        stations_dict[station["station_id"]] = (utm_x, utm_y, station["distance"])
-        apply_station_values_per_parameter(result.df, stations_ranked, param_dict, station, valid_station_groups_exists)
+        station_utm_x, station_utm_y = utm.from_latlon(station["latitude"], station["longitude"])[:2]
+        stations_dict[station["station_id"]] = (station_utm_x, station_utm_y, station["distance"])
+        station_groups.add(station["station_id"], station_utm_x, station_utm_y)
+        apply_station_values_per_parameter(result_df, stations_ranked, param_dict, station, valid_station_groups_exists)
     return stations_dict, param_dict
 
 
@@ -142,19 +147,14 @@ def calculate_interpolation(
     ]
     for parameter, param_data in param_dict.items():
         param_df = pl.DataFrame({Columns.DATE.value: param_data.values.get_column(Columns.DATE.value)})
-        results = []
-        for row in param_data.values.select(pl.all().exclude("date")).iter_rows(named=True):
-            results.append(
-                apply_interpolation(row, stations_dict, valid_station_groups, parameter, utm_x, utm_y, nearby_stations),
-            )
-        results = pl.DataFrame(
-            results,
-            schema={
-                Columns.PARAMETER.value: pl.String,
-                Columns.VALUE.value: pl.Float64,
-                Columns.DISTANCE_MEAN.value: pl.Float64,
-                Columns.TAKEN_STATION_IDS.value: pl.List(inner=pl.String),
-            },
+        results = apply_interpolation(
+            param_data.values.select(pl.all().exclude("date")),
+            stations_dict,
+            valid_station_groups,
+            parameter,
+            utm_x,
+            utm_y,
+            nearby_stations,
         )
         param_df = pl.concat([param_df, results], how="horizontal")
         data.append(param_df)
@@ -168,69 +168,236 @@ def calculate_interpolation(
     )
 
 
-def get_valid_station_groups(stations_dict: dict, utm_x: float, utm_y: float) -> Queue:
-    point = Point(utm_x, utm_y)
-    valid_groups = Queue()
-    # get all combinations of 4 stations
-    for station_group in combinations(stations_dict.keys(), 4):
-        coords = [(stations_dict[s][0], stations_dict[s][1]) for s in station_group]
-        pol = Polygon(coords)
-        if pol.covers(point):
-            valid_groups.put(station_group)
-    return valid_groups
+class StationGroups:
+    """
+    Groups of four stations whose polygon covers the interpolated location. Stations are added one after another in
+    order of their distance and only the groups that contain the new station are checked, which are evaluated at once
+    with a vectorized point in polygon test. Groups are kept in the order of itertools.combinations over the stations,
+    so the first group of which all stations have values is the closest one.
+    """
+
+    def __init__(self, utm_x: float, utm_y: float):
+        self.utm_x = utm_x
+        self.utm_y = utm_y
+        self.station_ids = []
+        self._coordinates = np.empty((0, 2))
+        self._groups = np.empty((0, 4), dtype=int)
+        self._group_ids_cache = {}
+
+    def __len__(self) -> int:
+        return self._groups.shape[0]
+
+    def __iter__(self):
+        return (tuple(self.station_ids[i] for i in group) for group in self._groups)
+
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def add(self, station_id: str, utm_x: float, utm_y: float) -> None:
+        """
+        Add a station and all valid groups of four stations that it forms with the previously added stations.
+        :param station_id: station id
+        :param utm_x: utm x of station
+        :param utm_y: utm y of station
+        """
+        index = len(self.station_ids)
+        self.station_ids.append(station_id)
+        self._coordinates = np.vstack([self._coordinates, [utm_x, utm_y]])
+        self._group_ids_cache = {}
+        if index < 3:
+            return
+        triples = np.fromiter(
+            chain.from_iterable(combinations(range(index), 3)),
+            dtype=int,
+            count=comb(index, 3) * 3,
+        ).reshape(-1, 3)
+        groups = np.column_stack([triples, np.full(triples.shape[0], index)])
+        groups = groups[self._covers(self._coordinates[groups])]
+        if groups.size:
+            groups = np.concatenate([self._groups, groups])
+            # restore order of itertools.combinations over all stations
+            self._groups = groups[np.lexsort(groups.T[::-1])]
+
+    def _covers(self, polygons: np.ndarray) -> np.ndarray:
+        """
+        Check which polygons cover the interpolated location, the boundary is included. Uses the crossing number of
+        a ray from the location, same as shapely does for the polygon of the vertices in given order.
+        :param polygons: array of shape (polygons, vertices, 2)
+        :return: boolean array, True if polygon covers the location
+        """
+        xi, yi = polygons[..., 0], polygons[..., 1]
+        xj, yj = np.roll(xi, -1, axis=1), np.roll(yi, -1, axis=1)
+        px, py = self.utm_x, self.utm_y
+        on_edge = (
+            ((xj - xi) * (py - yi) == (yj - yi) * (px - xi))
+            & (np.minimum(xi, xj) <= px)
+            & (px <= np.maximum(xi, xj))
+            & (np.minimum(yi, yj) <= py)
+            & (py <= np.maximum(yi, yj))
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = ((yi > py) != (yj > py)) & (px < (xj - xi) * (py - yi) / (yj - yi) + xi)
+        return on_edge.any(axis=1) | (crossing.sum(axis=1) % 2 == 1)
 
+    def get_group_ids(self, station_ids: frozenset) -> list[str]:
+        """
+        Get the closest group of which all stations are in the given station ids.
+        :param station_ids: station ids that have values
+        :return: list of station ids of the group, empty if no group is available
+        """
+        if station_ids not in self._group_ids_cache:
+            group_ids = []
+            if not self.empty():
+                available = np.array([station_id in station_ids for station_id in self.station_ids])
+                complete = available[self._groups].all(axis=1)
+                if complete.any():
+                    group_ids = [self.station_ids[i] for i in self._groups[complete.argmax()]]
+            self._group_ids_cache[station_ids] = group_ids
+        return list(self._group_ids_cache[station_ids])
 
-@lru_cache
-def get_station_group_ids(valid_station_groups: Queue, vals_index: frozenset) -> list:
-    for item in valid_station_groups.queue:
-        if set(item).issubset(vals_index):
-            return list(item)
-    return []
+
+def get_valid_station_groups(stations_dict: dict, utm_x: float, utm_y: float) -> StationGroups:
+    station_groups = StationGroups(utm_x, utm_y)
+    for station_id, (station_utm_x, station_utm_y, _) in stations_dict.items():
+        station_groups.add(station_id, station_utm_x, station_utm_y)
+    return station_groups
+
+
+def get_station_group_ids(valid_station_groups: StationGroups, vals_index: frozenset) -> list:
+    return valid_station_groups.get_group_ids(vals_index)
+
+
+def get_barycentric_weights(
+    xs: list[float],
+    ys: list[float],
+    utm_x: float,
+    utm_y: float,
+) -> tuple[np.ndarray, np.ndarray] | tuple[None, None]:
+    """
+    Triangulate the given station coordinates and get the barycentric weights of the interpolated location within
+    the enclosing triangle, equal to what LinearNDInterpolator does for a single point.
+    :param xs: utm x of stations
+    :param ys: utm y of stations
+    :param utm_x: utm x of interpolated location
+    :param utm_y: utm y of interpolated location
+    :return: indices of the triangle vertices and their weights, None if the location is outside of the stations
+    """
+    tri = Delaunay(np.column_stack([np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)]))
+    simplex = tri.find_simplex(np.array([[utm_x, utm_y]]))[0]
+    if simplex == -1:
+        return None, None
+    transform = tri.transform[simplex]
+    # same order of operations as scipy to get identical results
+    c0 = 0.0 + transform[0, 0] * (utm_x - transform[2, 0])
+    c0 = c0 + transform[0, 1] * (utm_y - transform[2, 1])
+    c1 = 0.0 + transform[1, 0] * (utm_x - transform[2, 0])
+    c1 = c1 + transform[1, 1] * (utm_y - transform[2, 1])
+    c2 = 1.0 - c0 - c1
+    return tri.simplices[simplex], np.array([c0, c1, c2])
+
+
+def apply_barycentric_weights(
+    values: np.ndarray,
+    vertices: np.ndarray | None,
+    weights: np.ndarray | None,
+) -> np.ndarray:
+    """
+    Apply barycentric weights to the values of all timestamps at once.
+    :param values: array of shape (timestamps, stations)
+    :param vertices: indices of stations forming the enclosing triangle
+    :param weights: barycentric weights of the interpolated location
+    :return: interpolated values, NaN if the location is outside of the stations
+    """
+    if vertices is None:
+        return np.full(values.shape[0], np.nan)
+    result = np.zeros(values.shape[0])
+    for vertex, weight in zip(vertices, weights):
+        result = result + weight * values[:, vertex]
+    return result
 
 
 def apply_interpolation(
-    row,
+    df_values: pl.DataFrame,
     stations_dict: dict,
-    valid_station_groups: Queue,
-    parameter: Enum,
+    valid_station_groups: StationGroups,
+    parameter: str,
     utm_x: float,
     utm_y: float,
     nearby_stations: list[str],
-) -> tuple[Enum, float | None, float | None, list[str]]:
+) -> pl.DataFrame:
     """
-    Interpolation function that is being applied over each row of the accumulated data of different stations.
-    :param row: row with values of each station
+    Interpolation function that is being applied over the accumulated data of different stations. Timestamps are
+    grouped by the set of stations that have values, so for each group the nearby station or the station group is
+    selected and triangulated only once and the weights are applied to all timestamps of the group at once.
+    :param df_values: values of each station, one column per station
     :param stations_dict: station dictionary with latlon pairs
     :param valid_station_groups: list of valid station groups
     :param parameter: parameter that is interpolated
     :param utm_x: utm x of interpolated location
     :param utm_y: utm y of interpolated location
     :param nearby_stations: list of nearby stations, propagated in the caller and if existing no interpolation is done
-    :return:
+    :return: DataFrame with parameter, value, mean distance and taken station ids per timestamp
     """
-    if nearby_stations:
-        valid_values = {s: v for s, v in row.items() if s in nearby_stations and v is not None}
-        if valid_values:
-            first_station = list(valid_values.keys())[0]
-            return parameter, valid_values[first_station], stations_dict[first_station[1:]][2], [first_station[1:]]
-    vals = {s: v for s, v in row.items() if v is not None}
-    station_group_ids = get_station_group_ids(valid_station_groups, frozenset([s[1:] for s in vals.keys()]))
-    if station_group_ids:
-        station_group_ids_with_s = ["S" + s for s in station_group_ids]
-        vals = {s: v for s, v in vals.items() if s in station_group_ids_with_s}
+    station_columns = df_values.columns
+    n_rows = df_values.height
+    value = np.full(n_rows, np.nan)
+    distance_mean = np.full(n_rows, np.nan)
+    valid = np.zeros(n_rows, dtype=bool)
+    if station_columns:
+        values = df_values.cast(pl.Float64).to_numpy()
+        available = df_values.select(pl.all().is_not_null()).to_numpy()
+        patterns, inverse = np.unique(available, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
     else:
-        vals = None
-    if not vals or len(vals) < 4:
-        return parameter, None, None, []
-    xs, ys, distances = map(list, zip(*[stations_dict[station_id] for station_id in station_group_ids]))
-    distance_mean = sum(distances) / len(distances)
-    f = LinearNDInterpolator(points=(xs, ys), values=list(vals.values()))
-    value = f(utm_x, utm_y)
-    if parameter == Parameter.PRECIPITATION_HEIGHT.name.lower():
-        f_index = LinearNDInterpolator(points=(xs, ys), values=[float(v > 0) for v in list(vals.values())])
-        value_index = f_index(utm_x, utm_y)
-        value = value if value_index >= 0.5 else 0
-    return parameter, value, distance_mean, station_group_ids
+        values = np.empty((n_rows, 0))
+        patterns, inverse = np.zeros((1, 0), dtype=bool), np.zeros(n_rows, dtype=int)
+    taken_station_ids = []
+    for pattern_index, pattern in enumerate(patterns):
+        rows = inverse == pattern_index
+        available_columns = [column for column, is_available in zip(station_columns, pattern) if is_available]
+        nearby_columns = [column for column in available_columns if column in nearby_stations]
+        if nearby_columns:
+            first_station = nearby_columns[0]
+            value[rows] = values[rows, station_columns.index(first_station)]
+            distance_mean[rows] = stations_dict[first_station[1:]][2]
+            valid[rows] = True
+            taken_station_ids.append([first_station[1:]])
+            continue
+        station_group_ids = get_station_group_ids(
+            valid_station_groups, frozenset([column[1:] for column in available_columns])
+        )
+        if not station_group_ids:
+            taken_station_ids.append([])
+            continue
+        # values are ordered by columns while coordinates are ordered by the station group
+        group_columns = [column for column in available_columns if column[1:] in station_group_ids]
+        group_values = values[np.ix_(rows, [station_columns.index(column) for column in group_columns])]
+        xs, ys, distances = map(list, zip(*[stations_dict[station_id] for station_id in station_group_ids]))
+        vertices, weights = get_barycentric_weights(xs, ys, utm_x, utm_y)
+        group_value = apply_barycentric_weights(group_values, vertices, weights)
+        if parameter == Parameter.PRECIPITATION_HEIGHT.name.lower():
+            value_index = apply_barycentric_weights((group_values > 0).astype(float), vertices, weights)
+            group_value = np.where(value_index >= 0.5, group_value, 0.0)
+        value[rows] = group_value
+        distance_mean[rows] = sum(distances) / len(distances)
+        valid[rows] = True
+        taken_station_ids.append(station_group_ids)
+    return pl.DataFrame(
+        {
+            Columns.VALUE.value: value,
+            Columns.DISTANCE_MEAN.value: distance_mean,
+            "valid": valid,
+        },
+    ).select(
+        pl.lit(parameter, dtype=pl.String).alias(Columns.PARAMETER.value),
+        pl.when(pl.col("valid")).then(pl.col(Columns.VALUE.value)).alias(Columns.VALUE.value),
+        pl.when(pl.col("valid")).then(pl.col(Columns.DISTANCE_MEAN.value)).alias(Columns.DISTANCE_MEAN.value),
+        pl.Series(
+            Columns.TAKEN_STATION_IDS.value,
+            taken_station_ids,
+            dtype=pl.List(inner=pl.String),
+        ).gather(inverse),
+    )
 
 
 if __name__ == "__main__":
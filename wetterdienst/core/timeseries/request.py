@@ -44,6 +44,7 @@ if TYPE_CHECKING:
     from wetterdienst.metadata.datarange import DataRange
     from wetterdienst.metadata.kind import Kind
     from wetterdienst.metadata.provider import Provider
+    from wetterdienst.util.geo import SpatialIndex
 
 try:
     from backports.datetime_fromisoformat import MonkeyPatch
@@ -372,6 +373,10 @@ class TimeseriesRequest(Core):
 
         super().__init__()
 
+        # station catalog and its spatial index, filled on first access and shared by all filter methods
+        self._stations_df: pl.DataFrame | None = None
+        self._stations_index: SpatialIndex | None = None
+
         self.resolution = parse_enumeration_from_template(resolution, self._resolution_base, Resolution)
         self.period = self._parse_period(period)
 
@@ -620,12 +625,16 @@ class TimeseriesRequest(Core):
         """
         pass
 
-    def all(self) -> StationsResult:  # noqa: A003
+    def _get_stations_df(self) -> pl.DataFrame:
         """
-        Wraps the _all method and applies date filters.
+        Get the station catalog of the request. The catalog is built from the _all method once and then kept on the
+        request, so subsequent filters don't download and parse the metadata again.
 
-        :return: pandas.DataFrame with the information of different available stations_result
+        :return: DataFrame with the information of all available stations
         """
+        if self._stations_df is not None:
+            return self._stations_df
+
         df = self._all()
 
         df = df.collect()
@@ -635,7 +644,46 @@ class TimeseriesRequest(Core):
         else:
             df = pl.DataFrame(schema={col: pl.String for col in self._base_columns})
 
-        df = self._coerce_meta_fields(df)
+        self._stations_df = self._coerce_meta_fields(df)
+
+        return self._stations_df
+
+    def _get_stations_index(self) -> SpatialIndex:
+        """
+        Get the spatial index over the coordinates of the station catalog. The index is built once per catalog and
+        kept on the request next to it.
+
+        :return: spatial index with the same order as the station catalog
+        """
+        from wetterdienst.util.geo import SpatialIndex
+
+        if self._stations_index is not None:
+            return self._stations_index
+
+        df = self._get_stations_df()
+
+        self._stations_index = SpatialIndex(
+            latitudes=df.get_column(Columns.LATITUDE.value),
+            longitudes=df.get_column(Columns.LONGITUDE.value),
+        )
+
+        return self._stations_index
+
+    def clear_cache(self) -> None:
+        """
+        Drop the cached station catalog and spatial index of the request, the next call of .all() or any of the filter
+        methods will build them again from the provider.
+        """
+        self._stations_df = None
+        self._stations_index = None
+
+    def all(self) -> StationsResult:  # noqa: A003
+        """
+        Wraps the _all method and applies date filters.
+
+        :return: pandas.DataFrame with the information of different available stations_result
+        """
+        df = self._get_stations_df()
 
         return StationsResult(
             stations=self,
@@ -651,7 +699,7 @@ class TimeseriesRequest(Core):
         :param station_id: list of stations_result that are requested
         :return: df with filtered stations_result
         """
-        df = self.all().df
+        df = self._get_stations_df()
 
         station_id = self._parse_station_id(pl.Series(name=Columns.STATION_ID.value, values=to_list(station_id)))
 
@@ -683,20 +731,20 @@ class TimeseriesRequest(Core):
         if threshold < 0 or threshold > 1:
             raise ValueError("threshold must be between 0.0 and 1.0")
 
-        df = self.all().df
+        df_all = self._get_stations_df()
 
         station_match = process.extract(
             query=name,
-            choices=df[Columns.NAME.value],
+            choices=df_all[Columns.NAME.value],
             scorer=fuzz.token_set_ratio,
             score_cutoff=threshold * 100,
         )
 
         if station_match:
             station_name = [station[0] for station in station_match]
-            df = df.filter(pl.col(Columns.NAME.value).is_in(station_name))
+            df = df_all.filter(pl.col(Columns.NAME.value).is_in(station_name))
         else:
-            df = pl.DataFrame(schema=df.schema)
+            df = pl.DataFrame(schema=df_all.schema)
 
         if df.is_empty():
             log.info(f"No weather stations were found for name {name}")
@@ -704,7 +752,7 @@ class TimeseriesRequest(Core):
         return StationsResult(
             stations=self,
             df=df,
-            df_all=self.all().df,
+            df_all=df_all,
             stations_filter=StationsFilter.BY_NAME,
             rank=rank,
         )
@@ -722,7 +770,7 @@ class TimeseriesRequest(Core):
         :param rank: number of stations_result to be returned, greater 0
         :return: pandas.DataFrame with station information for the selected stations_result
         """
-        from wetterdienst.util.geo import Coordinates, derive_nearest_neighbours
+        from wetterdienst.util.geo import Coordinates
 
         rank = int(rank)
 
@@ -733,23 +781,19 @@ class TimeseriesRequest(Core):
 
         coords = Coordinates(np.array(lat), np.array(lon))
 
-        df = self.all().df
+        df_all = self._get_stations_df()
 
-        distances, indices_nearest_neighbours = derive_nearest_neighbours(
-            latitudes=df.get_column(Columns.LATITUDE.value),
-            longitudes=df.get_column(Columns.LONGITUDE.value),
-            coordinates=coords,
-            number_nearby=df.shape[0],
-        )
+        # all stations are ranked, as stations may be skipped when values are queried
+        distances, indices_nearest_neighbours = self._get_stations_index().query(coords, k=df_all.shape[0])
         distances = distances.flatten() * EARTH_RADIUS_KM
 
-        df = df[indices_nearest_neighbours.flatten(), :]
+        df = df_all[indices_nearest_neighbours.flatten(), :]
         df = df.with_columns(pl.lit(distances).alias(Columns.DISTANCE.value))
 
         return StationsResult(
             stations=self,
             df=df,
-            df_all=self.all().df,
+            df_all=df_all,
             stations_filter=StationsFilter.BY_RANK,
             rank=rank,
         )
@@ -764,6 +808,8 @@ class TimeseriesRequest(Core):
         :param unit: unit string for conversion
         :return: pandas.DataFrame with station information for the selected stations_result
         """
+        from wetterdienst.util.geo import Coordinates
+
         distance = float(distance)
 
         # Theoretically a distance of 0 km is possible
@@ -774,12 +820,24 @@ class TimeseriesRequest(Core):
 
         distance_in_km = guess(distance, unit, [Distance]).km
 
-        all_nearby_stations = self.filter_by_rank(latlon, self.all().df.shape[0]).df
+        lat, lon = latlon
 
-        df = all_nearby_stations.filter(pl.col(Columns.DISTANCE.value).le(distance_in_km))
+        coords = Coordinates(np.array(lat), np.array(lon))
+
+        df_all = self._get_stations_df()
+
+        # slightly widen the radius to not lose stations at the border due to float precision, the exact distance
+        # filter is applied below
+        distances, indices_nearby = self._get_stations_index().query_radius(
+            coords, radius=distance_in_km / EARTH_RADIUS_KM * (1 + 1e-9)
+        )
+        distances = distances[0] * EARTH_RADIUS_KM
+
+        df = df_all[indices_nearby[0], :]
+        df = df.with_columns(pl.Series(Columns.DISTANCE.value, distances, dtype=pl.Float64))
+        df = df.filter(pl.col(Columns.DISTANCE.value).le(distance_in_km))
 
         if df.is_empty():
-            lat, lon = latlon
             log.info(
                 f"No weather stations were found for coordinates {lat}/{lon} (lat/lon) "
                 f"and distance {distance_in_km}km",
@@ -788,7 +846,7 @@ class TimeseriesRequest(Core):
         return StationsResult(
             stations=self,
             df=df,
-            df_all=self.all().df,
+            df_all=df_all,
             stations_filter=StationsFilter.BY_DISTANCE,
         )
 
@@ -810,9 +868,9 @@ class TimeseriesRequest(Core):
         if bottom >= top:
             raise ValueError("bbox bottom border should be smaller then top")
 
-        df = self.all().df
+        df_all = self._get_stations_df()
 
-        df = df.filter(
+        df = df_all.filter(
             pl.col(Columns.LATITUDE.value).is_between(bottom, top, closed="both")
             & pl.col(Columns.LONGITUDE.value).is_between(left, right, closed="both"),
         )
@@ -820,7 +878,7 @@ class TimeseriesRequest(Core):
         if df.is_empty():
             log.info(f"No weather stations were found for bbox {left}/{bottom}/{top}/{right}")
 
-        return StationsResult(stations=self, df=df, df_all=self.all().df, stations_filter=StationsFilter.BY_BBOX)
+        return StationsResult(stations=self, df=df, df_all=df_all, stations_filter=StationsFilter.BY_BBOX)
 
     def filter_by_sql(self, sql: str) -> StationsResult:
         """
@@ -830,8 +888,8 @@ class TimeseriesRequest(Core):
         """
         import duckdb
 
-        df = self.all().df
-        df = df.with_columns(
+        df_all = self._get_stations_df()
+        df = df_all.with_columns(
             pl.col(Columns.START_DATE.value).dt.replace_time_zone(None),
             pl.col(Columns.END_DATE.value).dt.replace_time_zone(None),
         )
@@ -843,7 +901,7 @@ class TimeseriesRequest(Core):
         )
         if df.is_empty():
             log.info(f"No stations were found for sql {sql}")
-        return StationsResult(stations=self, df=df, df_all=self.all().df, stations_filter=StationsFilter.BY_SQL)
+        return StationsResult(stations=self, df=df, df_all=df_all, stations_filter=StationsFilter.BY_SQL)
 
     def interpolate(self, latlon: tuple[float, float]) -> InterpolatedValuesResult:
         """
@@ -852,9 +910,28 @@ class TimeseriesRequest(Core):
         :param latlon: tuple of latitude and longitude for queried point
         :return: interpolated values
         """
+        self._check_interpolation_request()
+        lat, lon = latlon
+        df_interpolated = self._interpolate_point(float(lat), float(lon))
+        return self._create_interpolated_values_result(df_interpolated, latlon=latlon)
 
-        from wetterdienst.core.timeseries.interpolate import get_interpolated_df
+    def interpolate_many(self, points: list[tuple[float, float]]) -> InterpolatedValuesResult:
+        """
+        Method to interpolate values for multiple points at once. The values of each station are only collected once
+        and shared across all points. The points are identified by the station_id column of the returned values.
+
+        :param points: list of tuples of latitude and longitude for queried points
+        :return: interpolated values of all points
+        """
+        self._check_interpolation_request()
+        points = [(float(lat), float(lon)) for lat, lon in points]
+        station_values = {}
+        df_interpolated = pl.concat(
+            [self._interpolate_point(lat, lon, station_values) for lat, lon in points],
+        )
+        return self._create_interpolated_values_result(df_interpolated, latlon=points)
 
+    def _check_interpolation_request(self) -> None:
         if not self.start_date:
             raise ValueError("start_date and end_date are required for interpolation")
 
@@ -865,11 +942,17 @@ class TimeseriesRequest(Core):
         ):
             log.warning("Interpolation might be slow for high resolutions due to mass of data")
 
-        lat, lon = latlon
-        lat, lon = float(lat), float(lon)
-        df_interpolated = get_interpolated_df(self, lat, lon)
+    def _interpolate_point(
+        self,
+        lat: float,
+        lon: float,
+        station_values: dict[str, pl.DataFrame] | None = None,
+    ) -> pl.DataFrame:
+        from wetterdienst.core.timeseries.interpolate import get_interpolated_df
+
+        df_interpolated = get_interpolated_df(self, lat, lon, station_values)
         station_id = self._create_station_id_from_string(f"interpolation({lat:.4f},{lon:.4f})")
-        df_interpolated = df_interpolated.select(
+        return df_interpolated.select(
             pl.lit(station_id).alias(Columns.STATION_ID.value),
             pl.col(Columns.PARAMETER.value),
             pl.col(Columns.DATE.value),
@@ -877,7 +960,13 @@ class TimeseriesRequest(Core):
             pl.col(Columns.DISTANCE_MEAN.value),
             pl.col(Columns.TAKEN_STATION_IDS.value),
         )
-        df_stations_all = self.all().df
+
+    def _create_interpolated_values_result(
+        self,
+        df_interpolated: pl.DataFrame,
+        latlon: tuple[float, float] | list[tuple[float, float]],
+    ) -> InterpolatedValuesResult:
+        df_stations_all = self._get_stations_df()
         df_stations = df_stations_all.join(
             other=df_interpolated.select(pl.col(Columns.TAKEN_STATION_IDS.value).alias(Columns.STATION_ID.value))
             .explode(pl.col(Columns.STATION_ID.value))
@@ -887,7 +976,7 @@ class TimeseriesRequest(Core):
         stations_result = StationsResult(
             stations=self,
             df=df_stations,
-            df_all=self.all().df,
+            df_all=df_stations_all,
             stations_filter=StationsFilter.BY_STATION_ID,
         )
         return InterpolatedValuesResult(df=df_interpolated, stations=stations_result, latlon=latlon)
@@ -908,8 +997,28 @@ class TimeseriesRequest(Core):
         :param latlon: tuple of latitude and longitude for queried point
         :return:
         """
-        from wetterdienst.core.timeseries.summarize import get_summarized_df
+        self._check_summary_request()
+        lat, lon = latlon
+        summarized_values = self._summarize_point(float(lat), float(lon))
+        return self._create_summarized_values_result(summarized_values, latlon=latlon)
 
+    def summarize_many(self, points: list[tuple[float, float]]) -> SummarizedValuesResult:
+        """
+        Method to summarize values for multiple points at once. The values of each station are only collected once
+        and shared across all points. The points are identified by the station_id column of the returned values.
+
+        :param points: list of tuples of latitude and longitude for queried points
+        :return: summarized values of all points
+        """
+        self._check_summary_request()
+        points = [(float(lat), float(lon)) for lat, lon in points]
+        station_values = {}
+        summarized_values = pl.concat(
+            [self._summarize_point(lat, lon, station_values) for lat, lon in points],
+        )
+        return self._create_summarized_values_result(summarized_values, latlon=points)
+
+    def _check_summary_request(self) -> None:
         if not self.start_date:
             raise ValueError("start_date and end_date are required for summarization")
 
@@ -920,11 +1029,17 @@ class TimeseriesRequest(Core):
         ):
             log.warning("Summary might be slow for high resolutions due to mass of data")
 
-        lat, lon = latlon
-        lat, lon = float(lat), float(lon)
-        summarized_values = get_summarized_df(self, lat, lon)
+    def _summarize_point(
+        self,
+        lat: float,
+        lon: float,
+        station_values: dict[str, pl.DataFrame] | None = None,
+    ) -> pl.DataFrame:
+        from wetterdienst.core.timeseries.summarize import get_summarized_df
+
+        summarized_values = get_summarized_df(self, lat, lon, station_values)
         station_id = self._create_station_id_from_string(f"summary({lat:.4f},{lon:.4f})")
-        summarized_values = summarized_values.select(
+        return summarized_values.select(
             pl.lit(station_id).alias(Columns.STATION_ID.value),
             pl.col(Columns.PARAMETER.value),
             pl.col(Columns.DATE.value),
@@ -932,7 +1047,13 @@ class TimeseriesRequest(Core):
             pl.col(Columns.DISTANCE.value),
             pl.col(Columns.TAKEN_STATION_ID.value),
         )
-        df_stations_all = self.all().df
+
+    def _create_summarized_values_result(
+        self,
+        summarized_values: pl.DataFrame,
+        latlon: tuple[float, float] | list[tuple[float, float]],
+    ) -> SummarizedValuesResult:
+        df_stations_all = self._get_stations_df()
         df_stations = df_stations_all.join(
             other=summarized_values.select(pl.col(Columns.TAKEN_STATION_ID.value)).unique(),
             left_on=Columns.STATION_ID.value,
@@ -941,7 +1062,7 @@ class TimeseriesRequest(Core):
         stations_result = StationsResult(
             stations=self,
             df=df_stations,
-            df_all=self.all().df,
+            df_all=df_stations_all,
             stations_filter=StationsFilter.BY_STATION_ID,
         )
         return SummarizedValuesResult(df=summarized_values, stations=stations_result, latlon=latlon)
@@ -963,7 +1084,7 @@ class TimeseriesRequest(Core):
         :return: tuple of latlon
         """
         station_id = self._parse_station_id(pl.Series(values=to_list(station_id)))[0]
-        stations = self.all().df
+        stations = self._get_stations_df()
         try:
             lat, lon = (
                 stations.filter(pl.col(Columns.STATION_ID.value).eq(station_id))
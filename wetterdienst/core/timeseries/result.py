@@ -470,6 +470,41 @@ class ValuesResult(_ValuesResult):
         return data
 
 
+def _split_by_point(
+    result: InterpolatedValuesResult | SummarizedValuesResult,
+    name: str,
+    taken_station_ids: pl.Expr,
+) -> list[tuple[float, float, str, pl.DataFrame, StationsResult]]:
+    """
+    Split interpolated or summarized values into the queried points. Results of ``interpolate_many()`` and
+    ``summarize_many()`` hold a list of points, which are identified by the station id created from their name.
+    :param result: interpolated or summarized values
+    :param name: name of the computation e.g. interpolation or summary
+    :param taken_station_ids: expression selecting the ids of the stations taken for a point
+    :return: list of tuples of latitude, longitude, id, values and stations of each point
+    """
+    if not isinstance(result.latlon, list):
+        latitude, longitude = result.latlon
+        station_id = result.df.get_column(Columns.STATION_ID.value).gather(0).item()
+        return [(latitude, longitude, station_id, result.df, result.stations)]
+    points = []
+    for latitude, longitude in result.latlon:
+        station_id = result.stations.stations._create_station_id_from_string(
+            f"{name}({latitude:.4f},{longitude:.4f})",
+        )
+        df = result.df.filter(pl.col(Columns.STATION_ID.value).eq(station_id))
+        stations = StationsResult(
+            stations=result.stations.stations,
+            df=result.stations.df.filter(
+                pl.col(Columns.STATION_ID.value).is_in(df.select(taken_station_ids).to_series().to_list()),
+            ),
+            df_all=result.stations.df_all,
+            stations_filter=result.stations.stations_filter,
+        )
+        points.append((latitude, longitude, station_id, df, stations))
+    return points
+
+
 class _InterpolatedOrSummarizedOgcFeatureProperties(TypedDict):
     id: str
     name: str
@@ -512,7 +547,7 @@ class _InterpolatedValuesOgcFeatureCollection(TypedDict):
 class InterpolatedValuesResult(_ValuesResult):
     stations: StationsResult
     df: pl.DataFrame
-    latlon: tuple[float, float] | None
+    latlon: tuple[float, float] | list[tuple[float, float]] | None
 
     if typing.TYPE_CHECKING:
         # We need to override the signature of the method to_dict() from ValuesResult here
@@ -532,31 +567,34 @@ class InterpolatedValuesResult(_ValuesResult):
         data = {}
         if with_metadata:
             data["metadata"] = self.stations.get_metadata()
-        latitude, longitude = self.latlon
-        name = f"interpolation({latitude:.4f},{longitude:.4f})"
-        feature = {
-            "type": "Feature",
-            "properties": {
-                "id": self.df.get_column(Columns.STATION_ID.value).gather(0).item(),
-                "name": name,
-            },
-            "geometry": {
-                # WGS84 is implied and coordinates represent decimal degrees
-                # ordered as "longitude, latitude [,elevation]" with z expressed
-                # as metres above mean sea level per WGS84.
-                # -- http://wiki.geojson.org/RFC-001
-                "type": "Point",
-                "coordinates": [
-                    longitude,
-                    latitude,
-                ],
-            },
-            "stations": self.stations.to_dict(with_metadata=False)["stations"],
-            "values": self.to_dict(with_metadata=False, with_stations=False)["values"],
-        }
+        points = _split_by_point(self, "interpolation", pl.col(Columns.TAKEN_STATION_IDS.value).explode())
+        features = []
+        for latitude, longitude, station_id, df, stations in points:
+            name = f"interpolation({latitude:.4f},{longitude:.4f})"
+            feature = {
+                "type": "Feature",
+                "properties": {
+                    "id": station_id,
+                    "name": name,
+                },
+                "geometry": {
+                    # WGS84 is implied and coordinates represent decimal degrees
+                    # ordered as "longitude, latitude [,elevation]" with z expressed
+                    # as metres above mean sea level per WGS84.
+                    # -- http://wiki.geojson.org/RFC-001
+                    "type": "Point",
+                    "coordinates": [
+                        longitude,
+                        latitude,
+                    ],
+                },
+                "stations": stations.to_dict(with_metadata=False)["stations"],
+                "values": self._to_dict(df),
+            }
+            features.append(feature)
         data["data"] = {
             "type": "FeatureCollection",
-            "features": [feature],
+            "features": features,
         }
         return data
 
@@ -598,7 +636,7 @@ class _SummarizedValuesOgcFeatureCollection(TypedDict):
 class SummarizedValuesResult(_ValuesResult):
     stations: StationsResult
     df: pl.DataFrame
-    latlon: tuple[float, float]
+    latlon: tuple[float, float] | list[tuple[float, float]]
 
     if typing.TYPE_CHECKING:
         # We need to override the signature of the method to_dict() from ValuesResult here
@@ -618,30 +656,33 @@ class SummarizedValuesResult(_ValuesResult):
         data = {}
         if with_metadata:
             data["metadata"] = self.stations.get_metadata()
-        latitude, longitude = self.latlon
-        name = f"summary({latitude:.4f},{longitude:.4f})"
-        feature = {
-            "type": "Feature",
-            "properties": {
-                "id": self.df.get_column(Columns.STATION_ID.value).gather(0).item(),
-                "name": name,
-            },
-            "geometry": {
-                # WGS84 is implied and coordinates represent decimal degrees
-                # ordered as "longitude, latitude [,elevation]" with z expressed
-                # as metres above mean sea level per WGS84.
-                # -- http://wiki.geojson.org/RFC-001
-                "type": "Point",
-                "coordinates": [
-                    longitude,
-                    latitude,
-                ],
-            },
-            "stations": self.stations.to_dict(with_metadata=False)["stations"],
-            "values": self.to_dict(with_metadata=False, with_stations=False)["values"],
-        }
+        points = _split_by_point(self, "summary", pl.col(Columns.TAKEN_STATION_ID.value))
+        features = []
+        for latitude, longitude, station_id, df, stations in points:
+            name = f"summary({latitude:.4f},{longitude:.4f})"
+            feature = {
+                "type": "Feature",
+                "properties": {
+                    "id": station_id,
+                    "name": name,
+                },
+                "geometry": {
+                    # WGS84 is implied and coordinates represent decimal degrees
+                    # ordered as "longitude, latitude [,elevation]" with z expressed
+                    # as metres above mean sea level per WGS84.
+                    # -- http://wiki.geojson.org/RFC-001
+                    "type": "Point",
+                    "coordinates": [
+                        longitude,
+                        latitude,
+                    ],
+                },
+                "stations": stations.to_dict(with_metadata=False)["stations"],
+                "values": self._to_dict(df),
+            }
+            features.append(feature)
         data["data"] = {
             "type": "FeatureCollection",
-            "features": [feature],
+            "features": features,
         }
         return data
@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING
 import polars as pl
 from tqdm import tqdm
 
-from wetterdienst.core.timeseries.tools import _ParameterData, extract_station_values
+from wetterdienst.core.timeseries.tools import _ParameterData, extract_station_values, iter_station_values
 from wetterdienst.metadata.columns import Columns
 from wetterdienst.util.logging import TqdmToLogger
 
@@ -20,20 +20,30 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 
-def get_summarized_df(request: TimeseriesRequest, latitude: float, longitude: float) -> pl.DataFrame:
-    stations_dict, param_dict = request_stations(request, latitude, longitude)
+def get_summarized_df(
+    request: TimeseriesRequest,
+    latitude: float,
+    longitude: float,
+    station_values: dict[str, pl.DataFrame] | None = None,
+) -> pl.DataFrame:
+    stations_dict, param_dict = request_stations(request, latitude, longitude, station_values)
     return calculate_summary(stations_dict, param_dict)
 
 
-def request_stations(request: TimeseriesRequest, latitude: float, longitude: float) -> tuple[dict, dict]:
+def request_stations(
+    request: TimeseriesRequest,
+    latitude: float,
+    longitude: float,
+    station_values: dict[str, pl.DataFrame] | None = None,
+) -> tuple[dict, dict]:
     param_dict = {}
     stations_dict = {}
     distance = max(request.settings.ts_interpolation_station_distance.values())
     stations_ranked = request.filter_by_distance(latlon=(latitude, longitude), distance=distance)
     df_stations_ranked = stations_ranked.df
     tqdm_out = TqdmToLogger(log, level=logging.INFO)
-    for station, result in tqdm(
-        zip(df_stations_ranked.iter_rows(named=True), stations_ranked.values.query()),
+    for station, result_df in tqdm(
+        zip(df_stations_ranked.iter_rows(named=True), iter_station_values(stations_ranked, station_values)),
         total=len(df_stations_ranked),
         desc="querying stations for summary",
         unit="station",
@@ -42,10 +52,10 @@ def request_stations(request: TimeseriesRequest, latitude: float, longitude: flo
         # check if all parameters found enough stations and the stations build a valid station group
         if len(param_dict) > 0 and all(param.finished for param in param_dict.values()):
             break
-        if result.df.drop_nulls("value").is_empty():
+        if result_df.drop_nulls("value").is_empty():
             continue
         stations_dict[station["station_id"]] = (station["longitude"], station["latitude"], station["distance"])
-        apply_station_values_per_parameter(result.df, stations_ranked, param_dict, station)
+        apply_station_values_per_parameter(result_df, stations_ranked, param_dict, station)
     return stations_dict, param_dict
 
 
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import polars as pl
 
+from wetterdienst.core.timeseries.result import StationsResult
+from wetterdienst.metadata.columns import Columns
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 
 class _ParameterData:
     def __init__(self, values: pl.DataFrame, station_ids: list[str] | None = None, extra_station_counter: int = 0):
@@ -53,3 +61,51 @@ def gain_of_value_pairs(old_values: pl.DataFrame, new_values: pl.Series) -> floa
             return 0.0
         return 1.0
     return new_score / old_score - 1.0
+
+
+def iter_station_values(
+    stations_ranked: StationsResult,
+    station_values: dict[str, pl.DataFrame] | None = None,
+) -> Iterator[pl.DataFrame]:
+    """
+    Iterate over the values of the ranked stations in order, one DataFrame per station. Stations which are skipped
+    by the query or have no values get an empty DataFrame. If a dictionary of station values is given, values of
+    stations that were already collected are taken from it and newly collected values are added to it, so that
+    multiple points can share the values of the same stations.
+
+    :param stations_ranked: stations result with the ranked stations
+    :param station_values: optional dictionary of station id to values, shared across calls
+    :return: iterator of values DataFrames in order of the ranked stations
+    """
+    station_ids = stations_ranked.df.get_column(Columns.STATION_ID.value).to_list()
+    if station_values is None:
+        station_values = {}
+        stations_missing = stations_ranked
+    else:
+        stations_missing = StationsResult(
+            stations=stations_ranked.stations,
+            df=stations_ranked.df.filter(~pl.col(Columns.STATION_ID.value).is_in(list(station_values.keys()))),
+            df_all=stations_ranked.df_all,
+            stations_filter=stations_ranked.stations_filter,
+        )
+    positions = {station_id: position for position, station_id in enumerate(station_ids)}
+    df_empty = pl.DataFrame(schema={Columns.STATION_ID.value: pl.String, Columns.VALUE.value: pl.Float64})
+    # stations are queried lazily in rank order, so the query only runs as far as the consumer gets
+    results_missing = stations_missing.values.query()
+    last_position = -1
+    try:
+        for position, station_id in enumerate(station_ids):
+            # results are keyed by their station id, as the query does not yield skipped or empty stations
+            while station_id not in station_values and last_position < position:
+                result = next(results_missing, None)
+                if result is None:
+                    last_position = len(station_ids)
+                    break
+                if result.df.is_empty():
+                    continue
+                result_station_id = result.df.get_column(Columns.STATION_ID.value).item(0)
+                station_values[result_station_id] = result.df
+                last_position = positions.get(result_station_id, last_position)
+            yield station_values.get(station_id, df_empty)
+    finally:
+        results_missing.close()
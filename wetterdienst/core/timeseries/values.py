@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import logging
-import operator
 from abc import ABCMeta, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
@@ -95,6 +98,10 @@ class TimeseriesValues(metaclass=ABCMeta):
                 Columns.QUALITY.value: pl.Float64,
             }
 
+    # Services that always collect all parameters of a dataset and ignore the parameter
+    # in _collect_station_parameter set this to collect each dataset only once per station
+    _collect_by_dataset = False
+
     # Fields for date coercion
     _date_fields = [Columns.DATE.value, Columns.START_DATE.value, Columns.END_DATE.value]
 
@@ -222,71 +229,85 @@ class TimeseriesValues(metaclass=ABCMeta):
         """
         return pl.DataFrame({Columns.DATE.value: self._get_complete_dates(start_date, end_date)})
 
-    def _convert_values_to_si(self, df: pl.DataFrame, dataset) -> pl.DataFrame:
+    @staticmethod
+    def _convert_values_to_si(df: pl.DataFrame, conversion_factors: pl.DataFrame) -> pl.DataFrame:
         """
         Function to convert values to metric units with help of conversion factors
 
-        :param df: pandas DataFrame that should be converted to SI units
-        :param dataset: dataset for which the conversion factors are created
-        :return: pandas DataFrame with converted (SI) values
+        :param df: DataFrame that should be converted to SI units
+        :param conversion_factors: DataFrame with multiplier and offset per dataset and parameter
+        :return: DataFrame with converted (SI) values
         """
         if df.is_empty():
             return df
 
-        conversion_factors = self._create_conversion_factors(dataset)
-
-        data = []
-        for (dataset, parameter), group in df.group_by(
-            [Columns.DATASET.value, Columns.PARAMETER.value],
-            maintain_order=True,
-        ):
-            op, factor = conversion_factors.get(dataset).get(parameter, (None, None))
-            if op:
-                group = group.with_columns(pl.col(Columns.VALUE.value).map_batches(lambda s, o=op, f=factor: o(s, f)))
-            data.append(group)
-
-        return pl.concat(data)
+        # the row index restores the original order which a left join does not keep on all polars versions
+        df = (
+            df.with_row_index("row_index")
+            .join(
+                conversion_factors,
+                on=[Columns.DATASET.value, Columns.PARAMETER.value],
+                how="left",
+            )
+            .sort("row_index")
+        )
+        return df.with_columns(
+            pl.when(pl.col("multiplier").is_not_null())
+            .then(pl.col(Columns.VALUE.value) * pl.col("multiplier") + pl.col("offset"))
+            .otherwise(pl.col(Columns.VALUE.value))
+            .alias(Columns.VALUE.value),
+        ).drop("row_index", "multiplier", "offset")
 
-    def _create_conversion_factors(
-        self,
-        datasets: list[str],
-    ) -> dict[str, dict[str, tuple[operator.add | operator.mul, float]]]:
+    def _create_conversion_factors(self, datasets: list[str]) -> pl.DataFrame:
         """
-        Function to create conversion factors based on a given dataset
+        Function to create conversion factors based on given datasets, parameters with dimensionless units are left
+        out as they don't need to be converted
 
-        :param dataset: dataset for which conversion factors are created
-        :return: dictionary with conversion factors for given parameter name
+        :param datasets: datasets for which conversion factors are created
+        :return: DataFrame with multiplier and offset per dataset and parameter name
         """
         dataset_accessor = self.sr._dataset_accessor
-        conversion_factors = {}
-        for dataset in datasets:
-            conversion_factors[dataset] = {}
+        conversion_factors = []
+        for dataset in dict.fromkeys(datasets):
             units = self.sr._unit_base[dataset_accessor][dataset.upper()]
             for parameter in units:
                 parameter_name = self.sr._parameter_base[dataset_accessor][dataset.upper()][
                     parameter.name
                 ].value.lower()
-                conversion_factors[dataset][parameter_name] = self._get_conversion_factor(*parameter.value)
-        return conversion_factors
+                conversion_factor = self._get_conversion_factor(*parameter.value)
+                if conversion_factor:
+                    conversion_factors.append((dataset, parameter_name, *conversion_factor))
+        return pl.DataFrame(
+            conversion_factors,
+            schema={
+                Columns.DATASET.value: pl.String,
+                Columns.PARAMETER.value: pl.String,
+                "multiplier": pl.Float64,
+                "offset": pl.Float64,
+            },
+            orient="row",
+        )
 
     @staticmethod
+    @lru_cache
     def _get_conversion_factor(
         origin_unit: Enum,
         si_unit: Enum,
-    ) -> tuple[operator.mul | operator.add | None, float | None]:
+    ) -> tuple[float, float] | None:
         """
-        Method to get the conversion factor (flaot) for a specific parameter
+        Method to get the conversion factor for a specific parameter, cached as the pint lookups are costly compared
+        to applying the factors
         :param origin_unit: origin unit enumeration of parameter
         :param si_unit: si unit enumeration of parameter
-        :return: conversion factor as float
+        :return: tuple of multiplier and offset or None if no conversion is needed
         """
         if si_unit == SIUnit.KILOGRAM_PER_SQUARE_METER.value:
             # Fixed conversion factors to kg / m², as it only applies
             # for water with density 1 g / cm³
             if origin_unit == OriginUnit.MILLIMETER.value:
-                return operator.mul, 1
+                return 1.0, 0.0
             elif origin_unit == si_unit:
-                return operator.mul, 1
+                return 1.0, 0.0
             else:
                 raise ValueError("manually set conversion factor for precipitation unit")
         elif si_unit == SIUnit.DEGREE_KELVIN.value:
@@ -294,16 +315,16 @@ class TimeseriesValues(metaclass=ABCMeta):
             # Take 0 as this is appropriate for adding on other numbers
             # (just the difference)
             degree_offset = Quantity(0, origin_unit).to(si_unit).magnitude
-            return operator.add, degree_offset
+            return 1.0, degree_offset
         elif si_unit == SIUnit.PERCENT.value:
             factor = REGISTRY(str(origin_unit)).to(str(si_unit)).magnitude
             try:
                 factor = factor.item()
             except AttributeError:
                 pass
-            return operator.mul, factor
+            return factor, 0.0
         elif si_unit == SIUnit.DIMENSIONLESS.value:
-            return None, None
+            return None
         else:
             # For multiplicative units we need to use 1 as quantity to apply the
             # appropriate factor
@@ -312,7 +333,7 @@ class TimeseriesValues(metaclass=ABCMeta):
                 factor = factor.item()
             except AttributeError:
                 pass
-            return operator.mul, factor
+            return factor, 0.0
 
     def _create_empty_station_parameter_df(self, station_id: str, dataset: Enum) -> pl.DataFrame:
         """
@@ -401,32 +422,56 @@ class TimeseriesValues(metaclass=ABCMeta):
         )
         return df.select(pl.col(col) if col in df.columns else pl.lit(None).alias(col) for col in columns)
 
-    def query(self) -> Iterator[ValuesResult]:
+    def _collect_station_dataset(self, station_id: str, dataset: Enum) -> tuple[pl.DataFrame, dict[str, pl.DataFrame]]:
         """
-        Core method for data collection, iterating of station ids and yielding a
-        DataFrame for each station with all found parameters. Takes care of type
-        coercion of data, date filtering and humanizing of parameters.
+        Collect the data of a whole dataset for one station and split it by parameter. Used
+        by services which set ``_collect_by_dataset`` so that a dataset is only downloaded
+        and parsed once no matter how many of its parameters are requested.
 
-        :return:
+        :param station_id: station id for which the data is being collected
+        :param dataset: dataset for which the data is collected
+        :return: tuple of the DataFrame of the dataset and a mapping of parameter to its DataFrame
         """
-        # reset station stations_counter
-        self.stations_counter = 0
-        self.stations_collected = []
+        dataset_df = self._collect_station_parameter(station_id=station_id, parameter=dataset, dataset=dataset)
 
-        # mapping of original to humanized parameter names is always the same
-        if self.sr.humanize:
-            hpm = self._create_humanized_parameters_mapping()
-        datasets = [dataset.name.lower() for _, dataset in self.sr.parameter]
+        if dataset_df.is_empty():
+            dataset_df = self._create_empty_station_parameter_df(station_id=station_id, dataset=dataset)
 
-        for station_id in self.sr.station_id:
-            if self.stations_counter == self.sr.rank:
-                break
+        if Columns.PARAMETER.value not in dataset_df.columns:
+            return dataset_df, {}
 
-            # TODO: add method to return empty result with correct response string e.g.
-            #  station id not available
-            station_data = []
+        parameter_dfs = {
+            parameter: parameter_df
+            for (parameter,), parameter_df in dataset_df.partition_by(
+                Columns.PARAMETER.value, as_dict=True, maintain_order=True
+            ).items()
+        }
+        return dataset_df, parameter_dfs
 
-            for parameter, dataset in self.sr.parameter:
+    def _collect_station_data(self, station_id: str) -> pl.DataFrame:
+        """
+        Collect, complete and organize the data of all requested parameters for one
+        station. This is the I/O bound part of the query and is safe to run in worker
+        threads as it does not touch any shared state apart from the dynamic frequency
+        of services with a dynamic resolution.
+
+        :param station_id: station id for which the data is being collected
+        :return: DataFrame with the data of all requested parameters of the station
+        """
+        station_data = []
+        # data of whole datasets split by parameter, filled once per dataset
+        dataset_data = {}
+
+        for parameter, dataset in self.sr.parameter:
+            if self._collect_by_dataset:
+                if dataset not in dataset_data:
+                    dataset_data[dataset] = self._collect_station_dataset(station_id=station_id, dataset=dataset)
+                dataset_df, parameter_dfs = dataset_data[dataset]
+                if parameter == dataset:
+                    parameter_df = dataset_df
+                else:
+                    parameter_df = parameter_dfs.get(parameter.value.lower(), dataset_df.clear())
+            else:
                 parameter_df = self._collect_station_parameter(
                     station_id=station_id,
                     parameter=parameter,
@@ -439,67 +484,135 @@ class TimeseriesValues(metaclass=ABCMeta):
                 if parameter != dataset:
                     parameter_df = parameter_df.filter(pl.col(Columns.PARAMETER.value).eq(parameter.value.lower()))
 
-                parameter_df = parameter_df.unique(
-                    subset=[Columns.DATE.value, Columns.PARAMETER.value], maintain_order=True
-                )
+            parameter_df = parameter_df.unique(
+                subset=[Columns.DATE.value, Columns.PARAMETER.value], maintain_order=True
+            )
 
-                # set dynamic resolution for services that have no fixed resolutions
-                if self.sr.resolution == Resolution.DYNAMIC:
-                    self.sr.stations.dynamic_frequency = self._fetch_frequency(station_id, parameter, dataset)
+            # set dynamic resolution for services that have no fixed resolutions
+            if self.sr.resolution == Resolution.DYNAMIC:
+                self.sr.stations.dynamic_frequency = self._fetch_frequency(station_id, parameter, dataset)
 
-                if self.sr.start_date:
-                    parameter_df = self._build_complete_df(parameter_df, station_id)
+            if self.sr.start_date:
+                parameter_df = self._build_complete_df(parameter_df, station_id)
 
-                parameter_df = self._organize_df_columns(parameter_df, station_id, dataset)
+            parameter_df = self._organize_df_columns(parameter_df, station_id, dataset)
 
-                station_data.append(parameter_df)
+            station_data.append(parameter_df)
 
-            try:
-                station_df = pl.concat(station_data)
-            except ValueError:
-                station_df = pl.DataFrame()
+        try:
+            station_df = pl.concat(station_data)
+        except ValueError:
+            station_df = pl.DataFrame()
+
+        if self.sr.start_date:
+            station_df = station_df.filter(
+                pl.col(Columns.DATE.value).is_between(
+                    self.sr.start_date,
+                    self.sr.end_date,
+                    closed="both",
+                ),
+            )
 
-            if self.sr.start_date:
-                station_df = station_df.filter(
-                    pl.col(Columns.DATE.value).is_between(
-                        self.sr.start_date,
-                        self.sr.end_date,
-                        closed="both",
-                    ),
-                )
+        return station_df
 
-            if self.sr.skip_empty:
-                percentage = self._get_actual_percentage(df=station_df)
-                if percentage < self.sr.skip_threshold:
-                    log.info(
-                        f"station {station_id} is skipped as percentage of actual values ({percentage}) "
-                        f"is below threshold ({self.sr.skip_threshold}).",
-                    )
-                    continue
+    def _iter_station_data(self) -> Iterator[tuple[str, pl.DataFrame]]:
+        """
+        Iterate over the requested station ids and yield the collected data in station
+        order. With ``ts_max_workers`` greater than one, up to that many stations are
+        prefetched concurrently in a thread pool. Services with a dynamic resolution are
+        always collected sequentially as the frequency is stored on the request.
 
-            if self.sr.dropna:
-                station_df = station_df.drop_nulls(subset="value")
+        :return: iterator of tuples of station id and collected DataFrame
+        """
+        max_workers = self.sr.settings.ts_max_workers or 1
 
-            if not station_df.is_empty():
-                if self.sr.si_units:
-                    station_df = self._convert_values_to_si(station_df, datasets)
+        if max_workers <= 1 or self.sr.resolution == Resolution.DYNAMIC:
+            for station_id in self.sr.station_id:
+                yield station_id, self._collect_station_data(station_id)
+            return
 
-                if self.sr.humanize:
-                    station_df = self._humanize(df=station_df, humanized_parameters_mapping=hpm)
+        station_ids = iter(self.sr.station_id)
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wetterdienst-values")
+        try:
+            for station_id in islice(station_ids, max_workers):
+                pending.append((station_id, executor.submit(self._collect_station_data, station_id)))
+            while pending:
+                station_id, future = pending.popleft()
+                # keep the pool busy while the consumer processes the current station
+                for next_station_id in islice(station_ids, 1):
+                    pending.append((next_station_id, executor.submit(self._collect_station_data, next_station_id)))
+                yield station_id, future.result()
+        finally:
+            # consumer may stop early e.g. when rank is reached, so drop prefetched work
+            executor.shutdown(wait=False, cancel_futures=True)
 
-                if not self.sr.tidy:
-                    station_df = self._widen_df(df=station_df)
+    def query(self) -> Iterator[ValuesResult]:
+        """
+        Core method for data collection, iterating of station ids and yielding a
+        DataFrame for each station with all found parameters. Takes care of type
+        coercion of data, date filtering and humanizing of parameters.
 
-                if self.sr.tidy:
-                    sort_columns = [Columns.DATASET.value, Columns.PARAMETER.value, Columns.DATE.value]
-                else:
-                    sort_columns = [Columns.DATASET.value, Columns.DATE.value]
-                station_df = station_df.sort(sort_columns)
+        :return:
+        """
+        # reset station stations_counter
+        self.stations_counter = 0
+        self.stations_collected = []
+
+        # mapping of original to humanized parameter names is always the same
+        if self.sr.humanize:
+            hpm = self._create_humanized_parameters_mapping()
+        # conversion factors are the same for all stations
+        if self.sr.si_units:
+            conversion_factors = self._create_conversion_factors(
+                [dataset.name.lower() for _, dataset in self.sr.parameter],
+            )
+
+        station_data = self._iter_station_data()
+
+        try:
+            for station_id, station_df in station_data:
+                # TODO: add method to return empty result with correct response string e.g.
+                #  station id not available
+
+                if self.sr.skip_empty:
+                    percentage = self._get_actual_percentage(df=station_df)
+                    if percentage < self.sr.skip_threshold:
+                        log.info(
+                            f"station {station_id} is skipped as percentage of actual values ({percentage}) "
+                            f"is below threshold ({self.sr.skip_threshold}).",
+                        )
+                        continue
+
+                if self.sr.dropna:
+                    station_df = station_df.drop_nulls(subset="value")
+
+                if not station_df.is_empty():
+                    if self.sr.si_units:
+                        station_df = self._convert_values_to_si(station_df, conversion_factors)
+
+                    if self.sr.humanize:
+                        station_df = self._humanize(df=station_df, humanized_parameters_mapping=hpm)
+
+                    if not self.sr.tidy:
+                        station_df = self._widen_df(df=station_df, prefix_dataset=self._has_multiple_datasets)
 
-            self.stations_counter += 1
-            self.stations_collected.append(station_id)
+                    if self.sr.tidy:
+                        sort_columns = [Columns.DATASET.value, Columns.PARAMETER.value, Columns.DATE.value]
+                    else:
+                        sort_columns = [Columns.DATASET.value, Columns.DATE.value]
+                    station_df = station_df.sort(sort_columns)
 
-            yield ValuesResult(stations=self.sr, values=self, df=station_df)
+                self.stations_counter += 1
+                self.stations_collected.append(station_id)
+
+                yield ValuesResult(stations=self.sr, values=self, df=station_df)
+
+                # stop before collecting the next station
+                if self.stations_counter == self.sr.rank:
+                    break
+        finally:
+            station_data.close()
 
     @abstractmethod
     def _collect_station_parameter(self, station_id: str, parameter: Enum, dataset: Enum) -> pl.DataFrame:
@@ -516,8 +629,51 @@ class TimeseriesValues(metaclass=ABCMeta):
         """
         pass
 
+    @property
+    def _has_multiple_datasets(self) -> bool:
+        """Whether parameters of more than one dataset are requested"""
+        return len({dataset for _, dataset in self.sr.parameter}) > 1
+
+    def _get_parameter_names(self) -> list[tuple[str, str]]:
+        """
+        Dataset and parameter names of the requested parameters as they appear in the values, entire datasets are
+        expanded to their parameters. Quality parameters are left out as they become the quality of the values.
+
+        :return: list of dataset and parameter names
+        """
+        dataset_accessor = self.sr._dataset_accessor
+        names = []
+        for parameter, dataset in self.sr.parameter:
+            if parameter == dataset:
+                parameters = list(self.sr._parameter_base[dataset_accessor][dataset.name])
+            else:
+                parameters = [parameter]
+            for par in parameters:
+                if par.name.startswith("QUALITY"):
+                    continue
+                name = par.name.lower() if self.sr.humanize else par.value.lower()
+                names.append((dataset.name.lower(), name))
+        return list(dict.fromkeys(names))
+
+    def get_schema(self) -> pl.Schema:
+        """
+        Schema of the values DataFrames of the request, depending on the requested parameters and shape. Streamed
+        outputs use it to write all stations with the same columns and data types.
+
+        :return: schema of the values
+        """
+        schema = {name: pl.String if dtype is str else dtype for name, dtype in self._meta_fields.items()}
+        if self.sr.tidy:
+            return pl.Schema(schema)
+        for dataset, parameter in self._get_parameter_names():
+            if self._has_multiple_datasets:
+                parameter = f"{dataset}_{parameter}"
+            schema[parameter] = pl.Float64
+            schema[f"{Columns.QUALITY_PREFIX.value}_{parameter}"] = pl.Float64
+        return pl.Schema(schema)
+
     @staticmethod
-    def _widen_df(df: pl.DataFrame) -> pl.DataFrame:
+    def _widen_df(df: pl.DataFrame, prefix_dataset: bool | None = None) -> pl.DataFrame:
         """
         Method to widen a dataframe with each row having one timestamp and
         all parameter values and corresponding quality levels.
@@ -536,12 +692,16 @@ class TimeseriesValues(metaclass=ABCMeta):
             10                          ...
 
         :param df: DataFrame with ts_shape data
+        :param prefix_dataset: whether to prefix parameter names with dataset names, by default if the DataFrame
+            holds more than one dataset
         :returns DataFrame with widened data e.g. pairwise columns of values
         and quality flags
         """
         # if there is more than one dataset, we need to prefix parameter names with dataset names to avoid
         # column name conflicts
-        if df.get_column(Columns.DATASET.value).unique().len() > 1:
+        if prefix_dataset is None:
+            prefix_dataset = df.get_column(Columns.DATASET.value).unique().len() > 1
+        if prefix_dataset:
             df = df.with_columns(
                 pl.struct([pl.col(Columns.DATASET.value), pl.col(Columns.PARAMETER.value)])
                 .map_elements(lambda x: f"""{x["dataset"]}_{x["parameter"]}""", return_dtype=pl.String)
@@ -1050,6 +1050,7 @@ class DwdDmoValues(TimeseriesValues):
 
     _tz = Timezone.GERMANY
     _data_tz = Timezone.UTC
+    _collect_by_dataset = True
 
     def _create_humanized_parameters_mapping(self) -> dict[str, str]:
         """
@@ -1072,9 +1073,15 @@ class DwdDmoValues(TimeseriesValues):
         """
         super().__init__(stations_result=stations_result)
 
+        # whole datasets require all parameters of the forecasts
+        parameters = None
+        if all(parameter != dataset for parameter, dataset in self.sr.parameter):
+            parameters = [parameter.value.lower() for parameter, _ in self.sr.parameter]
+
         self.kml = KMLReader(
             station_ids=self.sr.station_id.to_list(),
             settings=self.sr.stations.settings,
+            parameters=parameters,
         )
 
     def get_dwd_dmo_path(self, dataset: Enum, station_id: str | None = None) -> str:
@@ -1119,8 +1126,8 @@ class DwdDmoValues(TimeseriesValues):
         dmo_path = self.get_dwd_dmo_path(DwdDmoDataset.ICON_EU)
         url = urljoin("https://opendata.dwd.de", dmo_path)
         file_url = self.get_url_for_date(url, date)
-        self.kml.read(file_url)
-        return self.kml.get_station_forecast(station_id)
+        forecasts = self.kml.read(file_url)
+        return self.kml.get_station_forecast(station_id, forecasts)
 
     def read_icon(self, station_id: str, date: DwdForecastDate | dt.datetime) -> pl.DataFrame:
         """Reads either large icon file with all stations or small single station file."""
@@ -1130,8 +1137,8 @@ class DwdDmoValues(TimeseriesValues):
             dmo_path = self.get_dwd_dmo_path(DwdDmoDataset.ICON, station_id=station_id)
         url = urljoin("https://opendata.dwd.de", dmo_path)
         file_url = self.get_url_for_date(url, date)
-        self.kml.read(file_url)
-        return self.kml.get_station_forecast(station_id)
+        forecasts = self.kml.read(file_url)
+        return self.kml.get_station_forecast(station_id, forecasts)
 
     def get_url_for_date(self, url: str, date: dt.datetime | DwdForecastDate) -> str:
         """
@@ -5,21 +5,24 @@
 from __future__ import annotations
 
 import datetime as dt
+import json
 import logging
+import os
+import tempfile
+import threading
 from io import BytesIO
 from pathlib import Path
 from typing import TYPE_CHECKING
+from urllib.parse import urlparse
 
 import polars as pl
+import pyarrow.parquet as pq
 from fsspec.implementations.zip import ZipFileSystem
 from lxml.etree import iterparse  # noqa: S410
-from tqdm import tqdm
 
 from wetterdienst.metadata.columns import Columns
-from wetterdienst.util.cache import CacheExpiry
-from wetterdienst.util.io import read_in_chunks
-from wetterdienst.util.logging import TqdmToLogger
-from wetterdienst.util.network import NetworkFilesystemManager
+from wetterdienst.util.cache import CacheExpiry, record_cache_entry, touch_cache_entry
+from wetterdienst.util.network import download_file
 
 if TYPE_CHECKING:
     from wetterdienst.settings import Settings
@@ -33,51 +36,61 @@ else:
 
 log = logging.getLogger(__name__)
 
+# number of stations written to a snapshot at once
+SNAPSHOT_BATCH_SIZE = 100
+SNAPSHOT_METADATA_KEY = "wetterdienst"
+
+
+def decode_forecast_values(
+    element_names: list[str],
+    element_values: list[str],
+    timesteps: list[dt.datetime],
+) -> pl.DataFrame:
+    """
+    Decode the whitespace separated value strings of the forecast elements of one station
+    into one typed column per element, missing values given as "-" become null.
+
+    :param element_names: names of the forecast elements
+    :param element_values: value strings of the forecast elements, one value per timestep
+    :param timesteps: timesteps of the forecast
+    :return: DataFrame with date column and one Float64 column per element
+    """
+    values = pl.Series(element_values, dtype=pl.String).str.extract_all(r"\S+")
+    if not values.list.len().eq(len(timesteps)).all():
+        raise ValueError("number of forecast values does not match number of timesteps")
+    # "-" can't be cast and becomes null
+    values = values.explode().cast(pl.Float64, strict=False)
+    data = {Columns.DATE.value: timesteps}
+    for i, element_name in enumerate(element_names):
+        data[element_name.lower()] = values.slice(i * len(timesteps), len(timesteps))
+    return pl.DataFrame(data)
+
 
 class KMLReader:
     """Read DWD XML Weather Forecast File of Type KML."""
 
-    def __init__(self, station_ids: list[str], settings: Settings) -> None:
+    def __init__(self, station_ids: list[str], settings: Settings, parameters: list[str] | None = None) -> None:
         self.station_ids = station_ids
+        # parameters read from snapshots, all if None
+        self.parameters = parameters
+        self.settings = settings
         self.metadata = {}
         self.timesteps = []
         self.nsmap = None
         self.iter_elems = None
-
-        self.dwdfs = NetworkFilesystemManager.get(settings=settings, ttl=CacheExpiry.FIVE_MINUTES)
+        # forecasts of the requested stations from the last read file
+        self.url = None
+        self.forecasts = {}
+        self._lock = threading.Lock()
 
     def download(self, url: str) -> BytesIO:
         """Download kml file as bytes.
-        https://stackoverflow.com/questions/37573483/progress-bar-while-download-file-over-http-with-requests
-
-        block_size: int or None
-                    Bytes to download in one request; use instance value if None. If
-                    zero, will return a streaming Requests file-like instance.
 
         :param url: url string to kml file
         :return: content as bytes
         """
-
-        response = self.dwdfs.open(url, block_size=0)
-        total = self.dwdfs.size(url)
-
-        buffer = BytesIO()
-
-        tqdm_out = TqdmToLogger(log, level=logging.INFO)
-
-        with tqdm(
-            desc=url,
-            total=total,
-            unit="iB",
-            unit_scale=True,
-            unit_divisor=1024,
-            file=tqdm_out,
-        ) as bar:
-            for data in read_in_chunks(response, chunk_size=1024):
-                size = buffer.write(data)
-                bar.update(size)
-
-        return buffer
+        log.info(f"Downloading file {url}")
+        return download_file(url=url, settings=self.settings, ttl=CacheExpiry.FIVE_MINUTES)
 
     def fetch(self, url) -> bytes:
         """
@@ -87,9 +100,144 @@ class KMLReader:
         zfs = ZipFileSystem(buffer, "r")
         return zfs.open(zfs.glob("*")[0]).read()
 
-    def read(self, url: str):
+    def read(self, url: str) -> dict[str, pl.DataFrame]:
+        """
+        Download and read DWD XML Weather Forecast File of Type KML. The file is parsed
+        once in a single pass which keeps the forecasts of the requested stations, reading
+        the same file again for another station is served from those forecasts.
+
+        :param url: url of the kmz file
+        :return: forecasts of the requested stations of the file by station id, the mapping is
+            not changed by later reads of other files
+        """
+        with self._lock:
+            if url == self.url:
+                return self.forecasts
+
+            snapshot_path = self._get_snapshot_path(url)
+            if snapshot_path and snapshot_path.exists():
+                log.info(f"Reading snapshot {snapshot_path}")
+                touch_cache_entry(self.settings, snapshot_path)
+                forecasts = self._read_snapshot(snapshot_path)
+            else:
+                self._read(url)
+                if snapshot_path:
+                    forecasts = self._write_snapshot(snapshot_path)
+                    record_cache_entry(self.settings, snapshot_path)
+                else:
+                    forecasts = self._read_station_forecasts()
+                self.iter_elems = None
+            self.url = url
+            self.forecasts = forecasts
+            return forecasts
+
+    def _get_snapshot_path(self, url: str) -> Path | None:
+        """
+        Get the path of the Parquet snapshot of a file which holds the forecasts of all stations. The
+        path follows the one of the file on the server and as such is keyed by product and issue time.
+        Files of the LATEST issue are not snapshotted as they are replaced with every issue.
+
+        :param url: url of the kmz file
+        :return: path of the snapshot or None if no snapshot should be used
+        """
+        if self.settings.cache_disable or "LATEST" in Path(url).name.upper():
+            return None
+        return Path(self.settings.cache_dir) / "snapshot" / Path(urlparse(url).path.lstrip("/")).with_suffix(".parquet")
+
+    def _read_snapshot(self, path: Path) -> dict[str, pl.DataFrame]:
+        """Read forecasts of the requested stations and parameters from a snapshot."""
+        lf = pl.scan_parquet(path)
+        if self.station_ids:
+            lf = lf.filter(pl.col(Columns.STATION_ID.value).is_in(self.station_ids))
+        if self.parameters:
+            columns = lf.collect_schema().names()
+            lf = lf.select(
+                Columns.STATION_ID.value,
+                Columns.DATE.value,
+                *[parameter for parameter in self.parameters if parameter in columns],
+            )
+        df = lf.collect()
+        metadata = json.loads(pq.read_schema(path).metadata[SNAPSHOT_METADATA_KEY.encode()])
+        metadata["issue_time"] = dt.datetime.fromisoformat(metadata["issue_time"])
+        self.metadata = metadata
+        return {
+            station_id: station_df.drop(Columns.STATION_ID.value)
+            for (station_id,), station_df in df.partition_by(
+                Columns.STATION_ID.value, as_dict=True, maintain_order=True
+            ).items()
+        }
+
+    def _write_snapshot(self, path: Path) -> dict[str, pl.DataFrame]:
         """
-        Download and read DWD XML Weather Forecast File of Type KML.
+        Read forecasts of all stations in one pass and write them to a snapshot in batches of
+        stations, forecasts of the requested stations are kept and returned.
+        """
+        station_ids = set(self.station_ids) if self.station_ids else None
+        forecasts = {}
+        metadata = {**self.metadata, "issue_time": self.metadata["issue_time"].isoformat()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, path_tmp = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+        os.close(fd)
+        schema = None
+        writer = None
+        batch = []
+        try:
+            for station_forecast in self.iter_items():
+                station_id = station_forecast.find("kml:name", self.nsmap).text
+                df = self._parse_station_forecast(station_forecast)
+                station_forecast.clear()
+                if station_ids is None or station_id in station_ids:
+                    forecasts[station_id] = df
+                batch.append(df.select(pl.lit(station_id, dtype=pl.String).alias(Columns.STATION_ID.value), pl.all()))
+                if len(batch) == SNAPSHOT_BATCH_SIZE:
+                    schema, writer = self._write_snapshot_batch(batch, schema, writer, path_tmp, metadata)
+                    batch = []
+            if batch or not writer:
+                schema, writer = self._write_snapshot_batch(batch, schema, writer, path_tmp, metadata)
+        except Exception:
+            if writer:
+                writer.close()
+            Path(path_tmp).unlink(missing_ok=True)
+            raise
+        writer.close()
+        Path(path_tmp).replace(path)
+        return forecasts
+
+    @staticmethod
+    def _write_snapshot_batch(
+        batch: list[pl.DataFrame],
+        schema: pl.Schema | None,
+        writer: pq.ParquetWriter | None,
+        path: str,
+        metadata: dict,
+    ) -> tuple[pl.Schema, pq.ParquetWriter]:
+        """Write a batch of station forecasts to the snapshot, the first batch defines the schema."""
+        if batch:
+            df = pl.concat(batch, how="diagonal_relaxed")
+        else:
+            df = pl.DataFrame(
+                schema={Columns.STATION_ID.value: pl.String, Columns.DATE.value: pl.Datetime("us", "UTC")},
+            )
+        if schema is None:
+            schema = df.schema
+            table = df.to_arrow()
+            table = table.replace_schema_metadata({SNAPSHOT_METADATA_KEY: json.dumps(metadata)})
+            writer = pq.ParquetWriter(path, table.schema)
+        else:
+            extra = set(df.columns).difference(schema.names())
+            if extra:
+                log.warning(f"Elements {sorted(extra)} are not part of the snapshot")
+            df = df.select(
+                pl.col(name).cast(dtype) if name in df.columns else pl.lit(None, dtype=dtype).alias(name)
+                for name, dtype in schema.items()
+            )
+            table = df.to_arrow().cast(writer.schema)
+        writer.write_table(table)
+        return schema, writer
+
+    def _read(self, url: str):
+        """
+        Download DWD XML Weather Forecast File of Type KML and read its metadata.
         """
 
         log.info(f"Downloading KMZ file {Path(url).name}")
@@ -154,20 +302,43 @@ class KMLReader:
         """Get metadata as DataFrame."""
         return pl.DataFrame([self.metadata])
 
-    def get_station_forecast(self, station_id: str) -> pl.DataFrame:
-        """Get forecasts as DataFrame."""
+    def _read_station_forecasts(self) -> dict[str, pl.DataFrame]:
+        """Read forecasts of all requested stations (all stations if none requested) in one pass."""
+        station_ids = set(self.station_ids) if self.station_ids else None
+        forecasts = {}
         for station_forecast in self.iter_items():
-            if station_forecast.find("kml:name", self.nsmap).text != station_id:
-                continue
-            measurement_list = station_forecast.findall("kml:ExtendedData/dwd:Forecast", self.nsmap)
-            data_dict = {Columns.DATE.value: self.timesteps}
-            for measurement_item in measurement_list:
-                measurement_parameter = measurement_item.get(f"{{{self.nsmap['dwd']}}}elementName")
-                measurement_string = measurement_item.getchildren()[0].text
-                measurement_values = " ".join(measurement_string.split()).split(" ")
-                measurement_values = [None if i == "-" else float(i) for i in measurement_values]
-                data_dict[measurement_parameter.lower()] = measurement_values
+            station_id = station_forecast.find("kml:name", self.nsmap).text
+            if station_ids is None or station_id in station_ids:
+                forecasts[station_id] = self._parse_station_forecast(station_forecast)
             station_forecast.clear()
-            return pl.DataFrame(data_dict)
-        else:
-            raise IndexError(f"Station {station_id} not found in KML file")
+            # stop parsing as soon as all requested stations are found
+            if station_ids is not None and len(forecasts) == len(station_ids):
+                break
+        return forecasts
+
+    def _parse_station_forecast(self, station_forecast) -> pl.DataFrame:
+        """Parse forecasts of one placemark as DataFrame."""
+        measurement_list = station_forecast.findall("kml:ExtendedData/dwd:Forecast", self.nsmap)
+        element_name_tag = f"{{{self.nsmap['dwd']}}}elementName"
+        return decode_forecast_values(
+            [measurement_item.get(element_name_tag) for measurement_item in measurement_list],
+            [measurement_item.getchildren()[0].text for measurement_item in measurement_list],
+            self.timesteps,
+        )
+
+    def get_station_forecast(self, station_id: str, forecasts: dict[str, pl.DataFrame] | None = None) -> pl.DataFrame:
+        """
+        Get forecasts as DataFrame.
+
+        :param station_id: station id of the forecasts
+        :param forecasts: forecasts returned by ``read``, the ones of the last read file if None. Concurrent
+            readers of different files pass the forecasts of their file, as the last read file may be another one.
+        :return: DataFrame with forecasts of the station
+        """
+        if forecasts is None:
+            with self._lock:
+                forecasts = self.forecasts
+        try:
+            return forecasts[station_id]
+        except KeyError as e:
+            raise IndexError(f"Station {station_id} not found in KML file") from e
@@ -1002,6 +1002,7 @@ class DwdMosmixValues(TimeseriesValues):
 
     _tz = Timezone.GERMANY
     _data_tz = Timezone.UTC
+    _collect_by_dataset = True
 
     def _create_humanized_parameters_mapping(self) -> dict[str, str]:
         """
@@ -1024,9 +1025,15 @@ class DwdMosmixValues(TimeseriesValues):
         """
         super().__init__(stations_result=stations_result)
 
+        # whole datasets require all parameters of the forecasts
+        parameters = None
+        if all(parameter != dataset for parameter, dataset in self.sr.parameter):
+            parameters = [parameter.value.lower() for parameter, _ in self.sr.parameter]
+
         self.kml = KMLReader(
             station_ids=self.sr.station_id.to_list(),
             settings=self.sr.stations.settings,
+            parameters=parameters,
         )
 
     @property
@@ -1077,8 +1084,8 @@ class DwdMosmixValues(TimeseriesValues):
         """Reads single MOSMIX-S file for all stations."""
         url = urljoin("https://opendata.dwd.de", DWD_MOSMIX_S_PATH)
         file_url = self.get_url_for_date(url, date)
-        self.kml.read(file_url)
-        return self.kml.get_station_forecast(station_id)
+        forecasts = self.kml.read(file_url)
+        return self.kml.get_station_forecast(station_id, forecasts)
 
     def read_mosmix_large(
         self,
@@ -1091,8 +1098,8 @@ class DwdMosmixValues(TimeseriesValues):
         else:
             url = urljoin("https://opendata.dwd.de", DWD_MOSMIX_L_SINGLE_PATH).format(station_id=station_id)
         file_url = self.get_url_for_date(url, date)
-        self.kml.read(file_url)
-        return self.kml.get_station_forecast(station_id)
+        forecasts = self.kml.read(file_url)
+        return self.kml.get_station_forecast(station_id, forecasts)
 
     def get_url_for_date(self, url: str, date: dt.datetime | DwdForecastDate) -> str:
         """
@@ -1105,18 +1112,10 @@ class DwdMosmixValues(TimeseriesValues):
         """
         urls = list_remote_files_fsspec(url, self.sr.stations.settings, CacheExpiry.NO_CACHE)
 
-        if date == DwdForecastDate.LATEST:
-            try:
-                return list(filter(lambda url_: "LATEST" in url_.upper(), urls))[0]
-            except IndexError as e:
-                raise IndexError(f"Unable to find LATEST file within {url}") from e
-
-        date = date.astimezone(dt.timezone.utc).replace(tzinfo=None)
-
-        df = pl.DataFrame({"url": urls})
+        df = pl.DataFrame({"url": urls}, schema={"url": pl.String})
 
         df = df.with_columns(
-            pl.col("url").str.split("/").list.last().str.split("_").list.gather(2).flatten().alias("date"),
+            pl.col("url").str.split("/").list.last().str.split("_").list.get(2, null_on_oob=True).alias("date"),
         )
 
         df = df.filter(pl.col("date").ne("LATEST"))
@@ -1127,6 +1126,17 @@ class DwdMosmixValues(TimeseriesValues):
             .str.to_datetime(DatetimeFormat.YMDHM.value),
         )
 
+        if date == DwdForecastDate.LATEST:
+            # resolve to the file of the latest issue, which unlike the LATEST file can be snapshotted
+            if not df.is_empty():
+                return df.sort("date").get_column("url").last()
+            try:
+                return list(filter(lambda url_: "LATEST" in url_.upper(), urls))[0]
+            except IndexError as e:
+                raise IndexError(f"Unable to find LATEST file within {url}") from e
+
+        date = date.astimezone(dt.timezone.utc).replace(tzinfo=None)
+
         df = df.filter(pl.col("date").eq(date))
 
         if df.is_empty():
@@ -28,6 +28,7 @@ from wetterdienst.provider.dwd.observation.fileindex import (
     _create_file_index_for_dwd_server,
     create_file_index_for_climate_observations,
     create_file_list_for_climate_observations,
+    get_file_index_for_station,
 )
 from wetterdienst.provider.dwd.observation.metadata.dataset import (
     DwdObservationDataset,
@@ -46,6 +47,7 @@ from wetterdienst.provider.dwd.observation.metaindex import (
     create_meta_index_for_climate_observations,
 )
 from wetterdienst.provider.dwd.observation.parser import parse_climate_observations_data
+from wetterdienst.provider.dwd.observation.store import collect_climate_observations_data_from_store
 from wetterdienst.provider.dwd.observation.util.parameter import (
     check_dwd_observations_dataset,
 )
@@ -67,6 +69,7 @@ class DwdObservationValues(TimeseriesValues):
 
     _tz = Timezone.GERMANY
     _data_tz = Timezone.UTC
+    _collect_by_dataset = True
     _resolution_type = ResolutionType.MULTI
     _resolution_base = DwdObservationResolution
     _period_type = PeriodType.MULTI
@@ -156,9 +159,21 @@ class DwdObservationValues(TimeseriesValues):
                 log.info(f"No files found for {dataset_identifier}. Station will be skipped.")
                 continue
 
-            filenames_and_files = download_climate_observations_data_parallel(remote_files, self.sr.stations.settings)
-
-            period_df = parse_climate_observations_data(filenames_and_files, dataset, self.sr.resolution, period)
+            if self.sr.stations.settings.ts_store:
+                period_df = collect_climate_observations_data_from_store(
+                    remote_files,
+                    station_id,
+                    dataset,
+                    self.sr.resolution,
+                    period,
+                    self.sr.stations.settings,
+                    *self._get_store_date_bounds(),
+                )
+            else:
+                filenames_and_files = download_climate_observations_data_parallel(
+                    remote_files, self.sr.stations.settings
+                )
+                period_df = parse_climate_observations_data(filenames_and_files, dataset, self.sr.resolution, period)
 
             parameter_data.append(period_df)
 
@@ -184,6 +199,17 @@ class DwdObservationValues(TimeseriesValues):
             pl.col(Columns.QUALITY.value).cast(pl.Float64),
         )
 
+    def _get_store_date_bounds(self) -> tuple[dt.datetime | None, dt.datetime | None]:
+        """
+        Get the date bounds used to read data from the local store. The bounds are widened by one day as
+        timestamps of high resolution data are still shifted afterwards, the exact filtering happens later on.
+
+        :return: tuple of start and end date, both None if no dates were requested
+        """
+        if not self.sr.start_date:
+            return None, None
+        return self.sr.start_date - dt.timedelta(days=1), self.sr.end_date + dt.timedelta(days=1)
+
     @staticmethod
     def _fix_timestamps(df: pl.DataFrame) -> pl.DataFrame:
         """
@@ -326,15 +352,14 @@ class DwdObservationValues(TimeseriesValues):
         :param dataset:
         :return:
         """
-        file_index = create_file_index_for_climate_observations(
+        file_index = get_file_index_for_station(
+            station_id,
             dataset,
             self.sr.resolution,
             Period.HISTORICAL,
             settings,
         )
 
-        file_index = file_index.filter(pl.col(Columns.STATION_ID.value).eq(station_id))
-
         # The request interval may be None, if no start and end date
         # is given but rather the entire available data is queried.
         # In this case the interval should overlap with all files
@@ -342,12 +367,11 @@ class DwdObservationValues(TimeseriesValues):
         start_date_min, end_date_max = interval and (interval.lower, interval.upper) or (None, None)
         if start_date_min:
             file_index = file_index.filter(
-                pl.col(Columns.STATION_ID.value).eq(station_id)
-                & pl.col(Columns.START_DATE.value).ge(end_date_max).not_()
+                pl.col(Columns.START_DATE.value).ge(end_date_max).not_()
                 & pl.col(Columns.END_DATE.value).le(start_date_min).not_(),
             )
 
-        return file_index.collect().get_column(Columns.DATE_RANGE.value).to_list()
+        return file_index.get_column(Columns.DATE_RANGE.value).to_list()
 
 
 class DwdObservationRequest(TimeseriesRequest):
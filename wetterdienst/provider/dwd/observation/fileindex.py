@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import datetime as dt
+import os
+import threading
+import time
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import polars as pl
@@ -17,7 +21,7 @@ from wetterdienst.provider.dwd.observation.metadata.dataset import (
     DwdObservationDataset,
 )
 from wetterdienst.provider.dwd.observation.metadata.resolution import HIGH_RESOLUTIONS
-from wetterdienst.util.cache import CacheExpiry
+from wetterdienst.util.cache import CacheExpiry, record_cache_entry, touch_cache_entry
 from wetterdienst.util.network import list_remote_files_fsspec
 
 if TYPE_CHECKING:
@@ -26,6 +30,14 @@ if TYPE_CHECKING:
 STATION_ID_REGEX = r"_(\d{3,5})_"
 DATE_RANGE_REGEX = r"_(\d{8}_\d{8})_"
 
+# the parsed file index is cached as long as the listing of the server
+FILE_INDEX_EXPIRY = CacheExpiry.TWELVE_HOURS
+
+_file_index_cache: dict[tuple, tuple[float, pl.DataFrame, dict[str, pl.DataFrame]]] = {}
+# guards the cache and the locks per key, the file index of each key is created under the lock of its key
+_file_index_lock = threading.Lock()
+_file_index_key_locks: dict[tuple, threading.Lock] = {}
+
 
 def create_file_list_for_climate_observations(
     station_id: str,
@@ -49,11 +61,7 @@ def create_file_list_for_climate_observations(
     Returns:
         List of path's to file
     """
-    file_index = create_file_index_for_climate_observations(dataset, resolution, period, settings)
-
-    file_index = file_index.collect()
-
-    file_index = file_index.filter(pl.col("station_id").eq(station_id))
+    file_index = get_file_index_for_station(station_id, dataset, resolution, period, settings)
 
     if date_range:
         file_index = file_index.filter(pl.col("date_range").eq(date_range))
@@ -61,6 +69,29 @@ def create_file_list_for_climate_observations(
     return file_index.get_column("filename")
 
 
+def get_file_index_for_station(
+    station_id: str,
+    dataset: DwdObservationDataset,
+    resolution: Resolution,
+    period: Period,
+    settings: Settings,
+) -> pl.DataFrame:
+    """
+    Function to get the part of the (cached) file index that belongs to one station. The
+    lookup is done in a mapping of station id to file index instead of filtering the whole
+    file index.
+    Args:
+        station_id: station id for the weather station to ask for data
+        dataset: observation measure
+        resolution: frequency/granularity of measurement interval
+        period: recent or historical files
+    Returns:
+        file index of the station, empty if the station has no files
+    """
+    file_index, file_index_by_station = _get_cached_file_index(dataset, resolution, period, settings)
+    return file_index_by_station.get(station_id, file_index.clear())
+
+
 def create_file_index_for_climate_observations(
     dataset: DwdObservationDataset,
     resolution: Resolution,
@@ -69,7 +100,106 @@ def create_file_index_for_climate_observations(
 ) -> pl.LazyFrame:
     """
     Function (cached) to create a file index of the DWD station data. The file index
-    is created for an individual set of parameters.
+    is created for an individual set of parameters. The parsed file index is kept in
+    memory and as Parquet file in the cache directory for as long as the listing of
+    the server is cached.
+    Args:
+        dataset: parameter of Parameter enumeration
+        resolution: time resolution of TimeResolution enumeration
+        period: period type of PeriodType enumeration
+    Returns:
+        file index in a pandas.DataFrame with sets of parameters and station id
+    """
+    file_index, _ = _get_cached_file_index(dataset, resolution, period, settings)
+    return file_index.lazy()
+
+
+def _get_cached_file_index(
+    dataset: DwdObservationDataset,
+    resolution: Resolution,
+    period: Period,
+    settings: Settings,
+) -> tuple[pl.DataFrame, dict[str, pl.DataFrame]]:
+    """
+    Function to get the parsed file index from memory, from the Parquet file in the cache
+    directory or by creating it from the listing of the server, in this order.
+    Args:
+        dataset: parameter of Parameter enumeration
+        resolution: time resolution of TimeResolution enumeration
+        period: period type of PeriodType enumeration
+    Returns:
+        tuple of file index and mapping of station id to file index of the station
+    """
+    if settings.cache_disable:
+        file_index = _create_file_index_for_climate_observations(dataset, resolution, period, settings).collect()
+        return file_index, _split_file_index_by_station(file_index)
+
+    key = (dataset, resolution, period, str(settings.cache_dir), FILE_INDEX_EXPIRY.name)
+    with _file_index_lock:
+        cached = _get_fresh_cached_file_index(key)
+        if cached:
+            return cached
+        key_lock = _file_index_key_locks.setdefault(key, threading.Lock())
+
+    # only one thread creates the file index of a key, others wait for it while other keys are not blocked
+    with key_lock:
+        with _file_index_lock:
+            cached = _get_fresh_cached_file_index(key)
+        if cached:
+            return cached
+
+        path = (
+            Path(settings.cache_dir)
+            / "fileindex"
+            / f"ttl-{FILE_INDEX_EXPIRY.name}"
+            / f"dwd_observation_{resolution.value}_{dataset.value}_{period.value}.parquet"
+        )
+        if path.exists() and time.time() - path.stat().st_mtime < FILE_INDEX_EXPIRY.value:
+            created = path.stat().st_mtime
+            file_index = pl.read_parquet(path)
+            touch_cache_entry(settings, path)
+        else:
+            created = time.time()
+            file_index = _create_file_index_for_climate_observations(dataset, resolution, period, settings).collect()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path_tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            file_index.write_parquet(path_tmp)
+            path_tmp.replace(path)
+            record_cache_entry(settings, path)
+
+        file_index_by_station = _split_file_index_by_station(file_index)
+        with _file_index_lock:
+            _file_index_cache[key] = (created, file_index, file_index_by_station)
+
+    return file_index, file_index_by_station
+
+
+def _get_fresh_cached_file_index(key: tuple) -> tuple[pl.DataFrame, dict[str, pl.DataFrame]] | None:
+    """Get the file index of the given key from memory if it has not expired yet."""
+    created, file_index, file_index_by_station = _file_index_cache.get(key, (0, None, None))
+    if time.time() - created < FILE_INDEX_EXPIRY.value:
+        return file_index, file_index_by_station
+    return None
+
+
+def _split_file_index_by_station(file_index: pl.DataFrame) -> dict[str, pl.DataFrame]:
+    """Create a mapping of station id to the file index of the station."""
+    return {
+        station_id: station_file_index
+        for (station_id,), station_file_index in file_index.partition_by(
+            Columns.STATION_ID.value, as_dict=True, maintain_order=True
+        ).items()
+    }
+
+
+def _create_file_index_for_climate_observations(
+    dataset: DwdObservationDataset,
+    resolution: Resolution,
+    period: Period,
+    settings: Settings,
+) -> pl.LazyFrame:
+    """
+    Function to create a file index of the DWD station data from the listing of the server.
     Args:
         dataset: parameter of Parameter enumeration
         resolution: time resolution of TimeResolution enumeration
@@ -160,7 +290,7 @@ def _create_file_index_for_dwd_server(
 
     url = f"https://opendata.dwd.de/climate_environment/CDC/{cdc_base}/{parameter_path}"
 
-    files_server = list_remote_files_fsspec(url, settings=settings, ttl=CacheExpiry.TWELVE_HOURS)
+    files_server = list_remote_files_fsspec(url, settings=settings, ttl=FILE_INDEX_EXPIRY)
 
     if not files_server:
         raise FileNotFoundError(f"url {url} does not have a list of files")
@@ -0,0 +1,273 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from wetterdienst.metadata.columns import Columns
+from wetterdienst.metadata.period import Period
+from wetterdienst.provider.dwd.observation.download import download_climate_observations_data_parallel
+from wetterdienst.provider.dwd.observation.fileindex import (
+    create_file_index_for_climate_observations,
+    create_file_list_for_climate_observations,
+)
+from wetterdienst.provider.dwd.observation.parser import parse_climate_observations_data
+
+if TYPE_CHECKING:
+    import datetime as dt
+
+    from wetterdienst.metadata.resolution import Resolution
+    from wetterdienst.provider.dwd.observation.metadata.dataset import DwdObservationDataset
+    from wetterdienst.settings import Settings
+
+log = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "_manifest.json"
+# seconds after which the manifest is written while syncing
+MANIFEST_WRITE_INTERVAL = 5
+
+
+def _get_store_root(
+    dataset: DwdObservationDataset,
+    resolution: Resolution,
+    period: Period,
+    settings: Settings,
+) -> Path:
+    """Directory of the local Parquet store which holds all stations of one dataset/resolution/period."""
+    return (
+        Path(settings.cache_dir)
+        / "store"
+        / "dwd"
+        / "observation"
+        / f"resolution={resolution.value}"
+        / f"dataset={dataset.value}"
+        / f"period={period.value}"
+    )
+
+
+def get_store_partition(
+    station_id: str,
+    dataset: DwdObservationDataset,
+    resolution: Resolution,
+    period: Period,
+    settings: Settings,
+) -> Path:
+    """
+    Get the directory of the local Parquet store which holds the data of one station for one
+    dataset/resolution/period combination.
+
+    :param station_id: station id
+    :param dataset: dataset enumeration
+    :param resolution: resolution enumeration
+    :param period: period enumeration
+    :param settings: settings holding the cache directory
+    :return: directory of the partition
+    """
+    return _get_store_root(dataset, resolution, period, settings) / f"station_id={station_id}"
+
+
+def _get_store_filename(remote_files: pl.Series) -> str:
+    """Name of the Parquet file which holds the parsed content of the given remote files."""
+    return "+".join(sorted(Path(remote_file).stem for remote_file in remote_files)) + ".parquet"
+
+
+def _is_fresh(path: Path, period: Period, settings: Settings) -> bool:
+    """
+    Check if a stored file can be used without downloading its remote files again. Historical files change
+    their name with every update, so they are always fresh. Recent and now files keep their name while being
+    updated, so they are refreshed after the expiry of the store given by the settings.
+    """
+    if not path.exists():
+        return False
+    if period == Period.HISTORICAL:
+        return True
+    return time.time() - path.stat().st_mtime < settings.ts_store_expiry
+
+
+def _prune_store_partition(
+    partition: Path,
+    station_id: str,
+    dataset: DwdObservationDataset,
+    resolution: Resolution,
+    period: Period,
+    settings: Settings,
+) -> None:
+    """Remove stored files of which the remote files are no longer listed in the file index."""
+    remote_files = create_file_list_for_climate_observations(station_id, dataset, resolution, period, settings)
+    stems = {Path(remote_file).stem for remote_file in remote_files}
+    for path in partition.glob("*.parquet"):
+        if not set(path.stem.split("+")).issubset(stems):
+            log.info(f"Removing outdated file {path} from store.")
+            path.unlink(missing_ok=True)
+
+
+def _update_store_file(
+    path: Path,
+    remote_files: pl.Series,
+    dataset: DwdObservationDataset,
+    resolution: Resolution,
+    period: Period,
+    settings: Settings,
+) -> pl.DataFrame:
+    """Download and parse the given remote files and write the result to the store if it holds any data."""
+    log.info(f"Updating store file {path}.")
+    filenames_and_files = download_climate_observations_data_parallel(remote_files, settings)
+    df = parse_climate_observations_data(filenames_and_files, dataset, resolution, period).collect()
+    if Columns.DATE.value not in df.columns:
+        return df
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file first so that concurrent readers never see partial files
+    fd, path_tmp = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    df.write_parquet(path_tmp)
+    Path(path_tmp).replace(path)
+    return df
+
+
+def collect_climate_observations_data_from_store(
+    remote_files: pl.Series,
+    station_id: str,
+    dataset: DwdObservationDataset,
+    resolution: Resolution,
+    period: Period,
+    settings: Settings,
+    start_date: dt.datetime | None = None,
+    end_date: dt.datetime | None = None,
+) -> pl.LazyFrame:
+    """
+    Get the parsed data of the given remote files from the local Parquet store. Files that are
+    not yet stored or that are outdated are downloaded, parsed and written to the store before.
+    Outdated historical files of the station are removed from the store along the way.
+
+    :param remote_files: remote files of one station as listed in the file index
+    :param station_id: station id
+    :param dataset: dataset enumeration
+    :param resolution: resolution enumeration
+    :param period: period enumeration
+    :param settings: settings holding the cache directory
+    :param start_date: optional start date, data before it is not read from the store
+    :param end_date: optional end date, data after it is not read from the store
+    :return: polars.LazyFrame scanning the stored data
+    """
+    partition = get_store_partition(station_id, dataset, resolution, period, settings)
+    path = partition / _get_store_filename(remote_files)
+
+    if not _is_fresh(path, period, settings):
+        df = _update_store_file(path, remote_files, dataset, resolution, period, settings)
+        if Columns.DATE.value not in df.columns:
+            return df.lazy()
+        _prune_store_partition(partition, station_id, dataset, resolution, period, settings)
+
+    lf = pl.scan_parquet(path)
+    if start_date and end_date:
+        lf = lf.filter(pl.col(Columns.DATE.value).is_between(start_date, end_date))
+    return lf
+
+
+def sync_climate_observations_store(
+    dataset: DwdObservationDataset,
+    resolution: Resolution,
+    period: Period,
+    settings: Settings,
+    station_id: list[str] | None = None,
+    max_workers: int = 4,
+) -> dict[str, int]:
+    """
+    Mirror the data of all stations (or the given ones) of one dataset/resolution/period combination
+    into the local Parquet store. Progress is recorded in a manifest next to the station partitions
+    while syncing so an interrupted run continues where it stopped. Files that are listed in the manifest
+    under the names of their current remote files, that still have the recorded size and that are still
+    fresh are skipped. Recent and now files stay fresh for ``ts_store_expiry`` seconds after being synced.
+
+    :param dataset: dataset enumeration
+    :param resolution: resolution enumeration
+    :param period: period enumeration
+    :param settings: settings holding the cache directory
+    :param station_id: optional list of station ids to sync, defaults to all stations of the file index
+    :param max_workers: number of files that are synced concurrently
+    :return: dictionary with the number of synced, skipped and failed files
+    """
+    file_index = create_file_index_for_climate_observations(dataset, resolution, period, settings).collect()
+    if station_id:
+        file_index = file_index.filter(pl.col(Columns.STATION_ID.value).is_in(station_id))
+
+    # files are grouped the same way as they are collected when querying values
+    group_by = [Columns.STATION_ID.value]
+    if "date_range" in file_index.columns:
+        group_by.append("date_range")
+    groups = file_index.group_by(group_by, maintain_order=True).agg(pl.col("filename"))
+
+    dataset_root = _get_store_root(dataset, resolution, period, settings)
+    manifest_path = dataset_root / MANIFEST_FILENAME
+    manifest = _read_manifest(manifest_path)
+
+    # remove stored files of which the remote files were replaced, e.g. historical files with a new date range
+    stems = {Path(remote_file).stem for remote_file in file_index.get_column("filename")}
+    for key, entry in list(manifest.items()):
+        if station_id and entry["station_id"] not in station_id:
+            continue
+        if not set(Path(key).stem.split("+")).issubset(stems):
+            (dataset_root / key).unlink(missing_ok=True)
+            manifest.pop(key)
+
+    summary = {"synced": 0, "skipped": 0, "failed": 0}
+    todo = {}
+    for station, remote_files in zip(groups.get_column(Columns.STATION_ID.value), groups.get_column("filename")):
+        remote_files = pl.Series(remote_files)
+        path = get_store_partition(station, dataset, resolution, period, settings) / _get_store_filename(remote_files)
+        key = path.relative_to(dataset_root).as_posix()
+        entry = manifest.get(key)
+        if entry and _is_fresh(path, period, settings) and path.stat().st_size == entry["size"]:
+            summary["skipped"] += 1
+            continue
+        todo[key] = (station, remote_files, path)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        manifest_written = time.time()
+        futures = {
+            executor.submit(_update_store_file, path, remote_files, dataset, resolution, period, settings): key
+            for key, (_, remote_files, path) in todo.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            station, _, path = todo[key]
+            try:
+                future.result()
+            except Exception as e:
+                log.error(f"Failed syncing {key}: {e}")
+                summary["failed"] += 1
+                continue
+            if path.exists():
+                manifest[key] = {"station_id": station, "size": path.stat().st_size}
+            summary["synced"] += 1
+            if time.time() - manifest_written > MANIFEST_WRITE_INTERVAL:
+                _write_manifest(manifest_path, manifest)
+                manifest_written = time.time()
+
+    _write_manifest(manifest_path, manifest)
+    return summary
+
+
+def _read_manifest(path: Path) -> dict[str, dict]:
+    """Read the manifest of synced files, an unreadable manifest is treated as empty."""
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(path: Path, manifest: dict[str, dict]) -> None:
+    """Write the manifest of synced files atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path_tmp = path.with_suffix(".tmp")
+    path_tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    path_tmp.replace(path)
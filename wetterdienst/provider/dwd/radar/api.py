@@ -5,12 +5,20 @@ from __future__ import annotations
 import bz2
 import datetime as dt
 import gzip
+import json
 import logging
+import os
 import re
+import shutil
 import tarfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from io import BytesIO
+from pathlib import Path
 from typing import TYPE_CHECKING
+from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
 import polars as pl
@@ -20,6 +28,7 @@ from wetterdienst.metadata.extension import Extension
 from wetterdienst.metadata.period import Period
 from wetterdienst.metadata.resolution import Resolution
 from wetterdienst.provider.dwd.metadata.datetime import DatetimeFormat
+from wetterdienst.provider.dwd.radar.cube import RadolanCube, write_radolan_cube
 from wetterdienst.provider.dwd.radar.index import (
     create_fileindex_radar,
     create_fileindex_radolan_cdc,
@@ -38,13 +47,13 @@ from wetterdienst.provider.dwd.radar.sites import DwdRadarSite
 from wetterdienst.provider.dwd.radar.util import RADAR_DT_PATTERN, get_date_from_filename, verify_hdf5
 from wetterdienst.provider.eumetnet.opera.sites import OperaRadarSites
 from wetterdienst.settings import Settings
-from wetterdienst.util.cache import CacheExpiry
+from wetterdienst.util.cache import CacheExpiry, record_cache_entry, touch_cache_entry
 from wetterdienst.util.datetime import raster_minutes, round_minutes
 from wetterdienst.util.enumeration import parse_enumeration_from_template
 from wetterdienst.util.network import download_file
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
 
 try:
     from backports.datetime_fromisoformat import MonkeyPatch
@@ -55,6 +64,13 @@ else:
 
 log = logging.getLogger(__name__)
 
+# number of files which are downloaded ahead of the file that is currently yielded
+DEFAULT_LOOKAHEAD = 4
+
+# each historical RADOLAN_CDC archive is decompressed to the cache directory by one thread at a time
+_radolan_archive_locks: dict[Path, threading.Lock] = {}
+_radolan_archive_lock = threading.Lock()
+
 
 @dataclass
 class RadarResult:
@@ -111,6 +127,7 @@ class DwdRadarValues:
         resolution: str | Resolution | DwdRadarResolution | None = None,
         period: str | Period | DwdRadarPeriod | None = None,
         settings: Settings | None = None,
+        lookahead: int = DEFAULT_LOOKAHEAD,
     ) -> None:
         """
         :param parameter:       The radar moment to request
@@ -123,6 +140,8 @@ class DwdRadarValues:
         :param resolution: Time resolution for RadarParameter.RADOLAN_CDC,
                                 either daily or hourly or 5 minutes.
         :param period:     Period type for RadarParameter.RADOLAN_CDC
+        :param lookahead:       Number of files which are downloaded ahead of the file that
+                                is currently yielded, 0 disables prefetching
         """
 
         # Convert parameters to enum types.
@@ -209,6 +228,7 @@ class DwdRadarValues:
             self.adjust_datetimes()
 
         self.settings = settings or Settings.default()
+        self.lookahead = lookahead
 
     def __str__(self):
         return (
@@ -369,9 +389,11 @@ class DwdRadarValues:
                     return
 
                 # Iterate list of files and yield "RadarResult" items.
-                for row in file_index.iter_rows(named=True):
-                    url = row["filename"]
-                    yield from self._download_radolan_data(url, self.start_date, self.end_date)
+                yield from self._prefetch(
+                    urls=file_index.get_column("filename").to_list(),
+                    download=self._download_radolan_archive,
+                    extract=lambda url, data: self._filter_radolan_data(url, data, self.start_date, self.end_date),
+                )
 
             else:
                 file_index = create_fileindex_radar(
@@ -402,20 +424,69 @@ class DwdRadarValues:
                     return
 
                 # Iterate list of files and yield "RadarResult" items.
-                for row in file_index.iter_rows(named=True):
-                    date_time = row["datetime"]
-                    url = row["filename"]
+                date_times = dict(zip(file_index.get_column("filename"), file_index.get_column("datetime")))
+                for result in self._prefetch(
+                    urls=list(date_times),
+                    download=self.__download_generic_data,
+                    extract=self._extract_generic_data,
+                ):
+                    if not result.timestamp:
+                        result.timestamp = date_times[result.url]
+
+                    if self.format == DwdRadarDataFormat.HDF5:
+                        try:
+                            verify_hdf5(result.data)
+                        except Exception as e:  # pragma: no cover
+                            log.exception(f"Unable to read HDF5 file. {e}")
+                    yield result
+
+    def _prefetch(
+        self,
+        urls: list[str],
+        download: Callable[[str], BytesIO],
+        extract: Callable[[str, BytesIO], Iterator[RadarResult]],
+    ) -> Iterator[RadarResult]:
+        """
+        Download the given files ahead of yielding them. Up to ``lookahead`` files are downloaded
+        concurrently, while the files are extracted one after another when they are consumed, so
+        only the downloaded files and the result that is currently yielded are held in memory. The
+        results are yielded in the order of the given files.
+
+        :param urls:        The URLs to the files on the DWD server in the order they are yielded
+        :param download:    Function which downloads a file
+        :param extract:     Function which yields the ``RadarResult`` items of a downloaded file
+        :return:            Generator of ``RadarResult`` items
+        """
+        if self.lookahead < 1:
+            for url in urls:
+                yield from extract(url, download(url))
+            return
 
-                    for result in self._download_generic_data(url=url):
-                        if not result.timestamp:
-                            result.timestamp = date_time
+        executor = ThreadPoolExecutor(max_workers=self.lookahead)
+        in_flight = deque()
+        try:
+            for url in urls:
+                in_flight.append((url, executor.submit(download, url)))
+                if len(in_flight) > self.lookahead:
+                    url_next, download_future = in_flight.popleft()
+                    yield from extract(url_next, download_future.result())
+            while in_flight:
+                url_next, download_future = in_flight.popleft()
+                yield from extract(url_next, download_future.result())
+        finally:
+            # stop pending downloads when the consumer stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def to_cube(self, path: Path | str) -> RadolanCube:
+        """
+        Decode the requested RADOLAN binary composites into a memory-mapped (time, y, x) array
+        on disk instead of returning them as raw bytes. The composites are decoded one by one,
+        so the size of the request is not limited by memory.
 
-                        if self.format == DwdRadarDataFormat.HDF5:
-                            try:
-                                verify_hdf5(result.data)
-                            except Exception as e:  # pragma: no cover
-                                log.exception(f"Unable to read HDF5 file. {e}")
-                        yield result
+        :param path:    Directory of the cube, an existing cube is replaced
+        :return:        ``RadolanCube`` for selecting time ranges, points and bounding boxes
+        """
+        return write_radolan_cube(self.query(), path)
 
     @staticmethod
     def _should_cache_download(url: str) -> bool:  # pragma: no cover
@@ -439,13 +510,32 @@ class DwdRadarValues:
         :return:            The file in binary, either an archive of one file
                             or an archive of multiple files.
         """
+        data = self.__download_generic_data(url)
+        yield from self._extract_generic_data(url, data)
+
+    def __download_generic_data(self, url: str) -> BytesIO:
+        """
+        Function that downloads the radar file, files containing "-latest-" are not cached.
 
+        :param url:         The URL to the file on the DWD server
+        :return:            The file in binary
+        """
         ttl = CacheExpiry.FIVE_MINUTES
         if not self._should_cache_download(url):
             ttl = CacheExpiry.NO_CACHE
         log.info(f"Downloading file {url}.")
-        data = download_file(url=url, ttl=ttl, settings=self.settings)
+        return download_file(url=url, ttl=ttl, settings=self.settings)
 
+    @staticmethod
+    def _extract_generic_data(url: str, data: BytesIO) -> Iterator[RadarResult]:
+        """
+        Decompress downloaded radar data.
+
+        :param url:         The URL to the file on the DWD server
+        :param data:        The downloaded file, either an archive of one file
+                            or an archive of multiple files.
+        :return:            Generator of ``RadarResult`` items
+        """
         # RadarParameter.FX_REFLECTIVITY
         if url.endswith(Extension.TAR_BZ2.value):
             tfs = TarFileSystem(data, compression="bz2")
@@ -456,6 +546,7 @@ class DwdRadarValues:
                     file_name = file
 
                 yield RadarResult(
+                    url=url,
                     data=BytesIO(tfs.open(file).read()),
                     timestamp=get_date_from_filename(
                         file_name,
@@ -513,9 +604,81 @@ class DwdRadarValues:
         :param end_date:
         :return:            ``RadarResult`` item
         """
-        archive_in_bytes = self.__download_radolan_data(url=url, settings=self.settings)
+        archive_in_bytes = self._download_radolan_archive(url)
+        yield from self._filter_radolan_data(url, archive_in_bytes, start_date, end_date)
+
+    def _download_radolan_archive(self, url: str) -> BytesIO | None:
+        """
+        Download the RADOLAN_CDC archive. Historical archives, which hold all files of a month,
+        are kept decompressed with an index of their members in the cache directory instead, so
+        the files of a month can be read without decompressing the whole archive again.
+
+        :param url:         The URL to the archive on the DWD server
+        :return:            The archive in binary or None if its members are read from the
+                            decompressed copy in the cache directory
+        """
+        if self.settings.cache_disable or not url.endswith(Extension.TAR_GZ.value):
+            return self.__download_radolan_data(url=url, settings=self.settings)
+        path = self._get_radolan_archive_path(url)
+        with _radolan_archive_lock:
+            path_lock = _radolan_archive_locks.setdefault(path, threading.Lock())
+        with path_lock:
+            if path.with_suffix(".json").exists():
+                touch_cache_entry(self.settings, path)
+            else:
+                self._store_radolan_archive(path, self.__download_radolan_data(url=url, settings=self.settings))
+                record_cache_entry(self.settings, path, path.with_suffix(".json"))
+        return None
+
+    def _get_radolan_archive_path(self, url: str) -> Path:
+        """Path of the decompressed copy of a historical RADOLAN_CDC archive in the cache directory."""
+        path = Path(urlparse(url).path.lstrip("/")).with_suffix("")
+        return Path(self.settings.cache_dir) / "radolan" / path
+
+    @staticmethod
+    def _store_radolan_archive(path: Path, archive_in_bytes: BytesIO) -> None:
+        """
+        Decompress the archive to the given path and write the offset and size of each member to an
+        index next to it. The index is written last so that it only exists for complete copies.
 
-        for result in self._extract_radolan_data(archive_in_bytes):
+        :param path:                Path of the decompressed archive
+        :param archive_in_bytes:    The downloaded archive
+        """
+        log.info(f"Decompressing {path.name} to cache.")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path_tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with gzip.GzipFile(fileobj=archive_in_bytes, mode="rb") as gz_file, path_tmp.open("wb") as f:
+            shutil.copyfileobj(gz_file, f)
+        with tarfile.open(path_tmp) as tar:
+            index = {member.name: [member.offset_data, member.size] for member in tar.getmembers() if member.isfile()}
+        path_tmp.replace(path)
+        index_path = path.with_suffix(".json")
+        index_path_tmp = index_path.with_suffix(f".{os.getpid()}.tmp")
+        index_path_tmp.write_text(json.dumps(index))
+        index_path_tmp.replace(index_path)
+
+    def _filter_radolan_data(
+        self,
+        url: str,
+        archive_in_bytes: BytesIO | None,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+    ) -> Iterator[RadarResult]:
+        """
+        Extract the RADOLAN_CDC files between the given dates from the downloaded archive
+        or from the decompressed copy of the archive in the cache directory.
+
+        :param url:                 The URL to the downloaded archive
+        :param archive_in_bytes:    The downloaded archive, None if it is read from the cache directory
+        :param start_date:
+        :param end_date:
+        :return:                    ``RadarResult`` item
+        """
+        if archive_in_bytes is None:
+            results = self._read_radolan_archive(self._get_radolan_archive_path(url), start_date, end_date)
+        else:
+            results = self._extract_radolan_data(archive_in_bytes, start_date, end_date)
+        for result in results:
             if not result.timestamp:
                 # if result has no timestamp, take it from main url instead of files in archive
                 datetime_string = re.findall(r"\d{10}", url)[0]
@@ -543,30 +706,75 @@ class DwdRadarValues:
         return download_file(url=url, ttl=CacheExpiry.TWELVE_HOURS, settings=settings)
 
     @staticmethod
-    def _extract_radolan_data(archive_in_bytes: BytesIO) -> Iterator[RadarResult]:
+    def _get_radolan_member_date(name: str) -> dt.datetime:
+        """Get the datetime of a RADOLAN_CDC file within a historical archive from its name."""
+        datetime_string = re.findall(r"\d{10}", name)[0]
+        return dt.datetime.strptime("20" + datetime_string, "%Y%m%d%H%M")
+
+    def _read_radolan_archive(
+        self,
+        path: Path,
+        start_date: dt.datetime | None = None,
+        end_date: dt.datetime | None = None,
+    ) -> Iterator[RadarResult]:
+        """
+        Read the RADOLAN_CDC files between the given dates from the decompressed copy of a
+        historical archive, only the requested members are read from disk.
+
+        Args:
+            path: path of the decompressed archive
+            start_date: optional start date, files before it are skipped
+            end_date: optional end date, files after it are skipped
+        Returns:
+            the datetime formatted as string and the RADOLAN file for the datetime
+        """
+        index = json.loads(path.with_suffix(".json").read_text())
+        with path.open("rb") as f:
+            for name, (offset, size) in index.items():
+                date_time = self._get_radolan_member_date(name)
+                if start_date and end_date and not start_date <= date_time <= end_date:
+                    continue
+                f.seek(offset)
+                yield RadarResult(
+                    data=BytesIO(f.read(size)),
+                    timestamp=date_time,
+                    filename=name,
+                )
+
+    def _extract_radolan_data(
+        self,
+        archive_in_bytes: BytesIO,
+        start_date: dt.datetime | None = None,
+        end_date: dt.datetime | None = None,
+    ) -> Iterator[RadarResult]:
         """
         Function used to extract RADOLAN_CDC file for the requested datetime
-        from the downloaded archive.
+        from the downloaded archive. Files of historical archives which are outside
+        of the given dates are skipped without reading them.
 
         Args:
             archive_in_bytes: downloaded archive of RADOLAN file
+            start_date: optional start date, files before it are skipped
+            end_date: optional end date, files after it are skipped
         Returns:
             the datetime formatted as string and the RADOLAN file for the datetime
         """
         # First try to unpack archive from archive (case for historical data)
         try:
-            tfs = TarFileSystem(archive_in_bytes, compression="gzip")
-
-            for file in tfs.glob("*"):
-                datetime_string = re.findall(r"\d{10}", file)[0]
-                date_time = dt.datetime.strptime("20" + datetime_string, "%Y%m%d%H%M")
-                file_in_bytes = tfs.tar.extractfile(file).read()
-
-                yield RadarResult(
-                    data=BytesIO(file_in_bytes),
-                    timestamp=date_time,
-                    filename=file,
-                )
+            with tarfile.open(fileobj=archive_in_bytes, mode="r|gz") as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    date_time = self._get_radolan_member_date(member.name)
+                    if start_date and end_date and not start_date <= date_time <= end_date:
+                        continue
+                    file_in_bytes = tar.extractfile(member).read()
+
+                    yield RadarResult(
+                        data=BytesIO(file_in_bytes),
+                        timestamp=date_time,
+                        filename=member.name,
+                    )
 
         # Otherwise, if there's an error the data is from recent time period and only has to
         # be unpacked once
@@ -0,0 +1,214 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+from __future__ import annotations
+
+import datetime as dt
+import json
+import logging
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from io import BytesIO
+
+    from wetterdienst.provider.dwd.radar.api import RadarResult
+
+log = logging.getLogger(__name__)
+
+RADOLAN_HEADER_END = b"\x03"
+# the 12 lower bits of each value hold the data, the upper 4 bits are flags
+RADOLAN_VALUE_MASK = 0x0FFF
+RADOLAN_NODATA_FLAG = 0x2000
+RADOLAN_NEGATIVE_FLAG = 0x4000
+# lower left corner of the national 900x900 RADOLAN grid in polar stereographic coordinates [km]
+RADOLAN_GRID_ORIGIN = (-523.4622, -4658.645)
+RADOLAN_GRID_SHAPE = (900, 900)
+
+CUBE_DATA_FILENAME = "data.f32"
+CUBE_METADATA_FILENAME = "metadata.json"
+
+
+def read_radolan_composite(data: BytesIO) -> tuple[dict, np.ndarray]:
+    """
+    Decode a RADOLAN binary composite with two bytes per value e.g. RW, SF or YW.
+
+    :param data: content of the RADOLAN file
+    :return: tuple of header attributes and array of values with rows from south to north,
+        values flagged as no data are NaN
+    """
+    content = data.read()
+    data.seek(0)
+    try:
+        header_end = content.index(RADOLAN_HEADER_END)
+    except ValueError as e:
+        raise ValueError("data is not a RADOLAN binary composite") from e
+    header = content[:header_end].decode("ascii")
+    grid = re.search(r"GP\s*(\d+)x\s*(\d+)", header)
+    precision = re.search(r"PR\s*E([+-]\d+)", header)
+    if not grid or not precision:
+        raise ValueError("data is not a RADOLAN binary composite")
+    nrow, ncol = int(grid.group(1)), int(grid.group(2))
+    payload = content[header_end + 1 :]
+    if len(payload) != nrow * ncol * 2:
+        raise ValueError(f"RADOLAN product {header[:2]} is not stored with two bytes per value")
+    raw = np.frombuffer(payload, dtype="<u2").reshape(nrow, ncol)
+    values = (raw & RADOLAN_VALUE_MASK).astype(np.float32) * np.float32(10 ** int(precision.group(1)))
+    values[(raw & RADOLAN_NEGATIVE_FLAG) > 0] *= -1
+    values[(raw & RADOLAN_NODATA_FLAG) > 0] = np.nan
+    attrs = {"product": header[:2], "nrow": nrow, "ncol": ncol, "precision": float(10 ** int(precision.group(1)))}
+    return attrs, values
+
+
+def write_radolan_cube(results: Iterable[RadarResult], path: Path | str) -> RadolanCube:
+    """
+    Decode RADOLAN binary composites one by one into a (time, y, x) array on disk. Only one
+    composite is held in memory at a time, the timestamps and grid are written as metadata
+    next to the array.
+
+    :param results: ``RadarResult`` items holding RADOLAN binary composites in chronological order
+    :param path: directory of the cube, existing cubes are replaced
+    :return: ``RadolanCube`` reading the written array memory-mapped
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    metadata_path = path / CUBE_METADATA_FILENAME
+    # the metadata is written last, so a cube is only readable once it is complete
+    metadata_path.unlink(missing_ok=True)
+    attrs = None
+    timestamps = []
+    with (path / CUBE_DATA_FILENAME).open("wb") as f:
+        for result in results:
+            result_attrs, values = read_radolan_composite(result.data)
+            if attrs is None:
+                attrs = result_attrs
+            elif (result_attrs["nrow"], result_attrs["ncol"]) != (attrs["nrow"], attrs["ncol"]):
+                raise ValueError(f"RADOLAN composite of {result.timestamp} does not match the grid of the cube")
+            f.write(values.tobytes())
+            timestamps.append(result.timestamp)
+    if attrs is None:
+        raise ValueError("no RADOLAN composites to write")
+    metadata = {
+        "product": attrs["product"],
+        "precision": attrs["precision"],
+        "shape": [len(timestamps), attrs["nrow"], attrs["ncol"]],
+        "dtype": "float32",
+        "timestamps": [timestamp.isoformat() for timestamp in timestamps],
+    }
+    if (attrs["nrow"], attrs["ncol"]) == RADOLAN_GRID_SHAPE:
+        metadata["origin"] = list(RADOLAN_GRID_ORIGIN)
+        metadata["resolution"] = 1.0
+    metadata_path.write_text(json.dumps(metadata, indent=2))
+    log.info(f"Wrote {len(timestamps)} RADOLAN composites to {path}")
+    return RadolanCube(path)
+
+
+class RadolanCube:
+    """
+    Memory-mapped (time, y, x) array of RADOLAN composites as written by ``write_radolan_cube``.
+    Selections return views of the array, so only the parts that are actually used are read
+    from disk.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        :param path: directory of the cube
+        """
+        self.path = Path(path)
+        self.metadata = json.loads((self.path / CUBE_METADATA_FILENAME).read_text())
+        self.timestamps = [dt.datetime.fromisoformat(timestamp) for timestamp in self.metadata["timestamps"]]
+        self.data = np.memmap(
+            self.path / CUBE_DATA_FILENAME,
+            dtype=self.metadata["dtype"],
+            mode="r",
+            shape=tuple(self.metadata["shape"]),
+        )
+
+    def __repr__(self) -> str:
+        return f"RadolanCube(path={self.path}, product={self.metadata['product']}, shape={self.data.shape})"
+
+    @property
+    def x(self) -> np.ndarray:
+        """Polar stereographic x coordinates of the lower left corners of the grid cells [km]."""
+        return self._get_coordinates(0, self.data.shape[2])
+
+    @property
+    def y(self) -> np.ndarray:
+        """Polar stereographic y coordinates of the lower left corners of the grid cells [km]."""
+        return self._get_coordinates(1, self.data.shape[1])
+
+    def _get_coordinates(self, axis: int, size: int) -> np.ndarray:
+        if "origin" not in self.metadata:
+            raise ValueError(f"coordinates of the {self.data.shape[1]}x{self.data.shape[2]} grid are unknown")
+        return self.metadata["origin"][axis] + np.arange(size) * self.metadata["resolution"]
+
+    def _get_time_slice(self, start_date: dt.datetime | None, end_date: dt.datetime | None) -> slice:
+        start = 0
+        stop = len(self.timestamps)
+        if start_date:
+            start = next((i for i, timestamp in enumerate(self.timestamps) if timestamp >= start_date), stop)
+        if end_date:
+            stop = next((i for i, timestamp in enumerate(self.timestamps) if timestamp > end_date), stop)
+        return slice(start, stop)
+
+    def _get_index(self, coordinates: np.ndarray, value: float) -> int:
+        index = int(np.searchsorted(coordinates, value, side="right")) - 1
+        if index < 0 or value >= coordinates[-1] + self.metadata["resolution"]:
+            raise ValueError(f"coordinate {value} is outside of the grid")
+        return index
+
+    def sel_time(self, start_date: dt.datetime | None = None, end_date: dt.datetime | None = None) -> np.ndarray:
+        """
+        Select the composites between the given dates.
+
+        :param start_date: optional start date (inclusive)
+        :param end_date: optional end date (inclusive)
+        :return: (time, y, x) array
+        """
+        return self.data[self._get_time_slice(start_date, end_date)]
+
+    def sel_point(
+        self,
+        x: float,
+        y: float,
+        start_date: dt.datetime | None = None,
+        end_date: dt.datetime | None = None,
+    ) -> np.ndarray:
+        """
+        Select the time series of the grid cell which holds the given point.
+
+        :param x: polar stereographic x coordinate [km]
+        :param y: polar stereographic y coordinate [km]
+        :param start_date: optional start date (inclusive)
+        :param end_date: optional end date (inclusive)
+        :return: (time,) array
+        """
+        time = self._get_time_slice(start_date, end_date)
+        return self.data[time, self._get_index(self.y, y), self._get_index(self.x, x)]
+
+    def sel_bbox(
+        self,
+        xmin: float,
+        ymin: float,
+        xmax: float,
+        ymax: float,
+        start_date: dt.datetime | None = None,
+        end_date: dt.datetime | None = None,
+    ) -> np.ndarray:
+        """
+        Select the grid cells within the given bounding box.
+
+        :param xmin: polar stereographic x coordinate of the lower left corner [km]
+        :param ymin: polar stereographic y coordinate of the lower left corner [km]
+        :param xmax: polar stereographic x coordinate of the upper right corner [km]
+        :param ymax: polar stereographic y coordinate of the upper right corner [km]
+        :param start_date: optional start date (inclusive)
+        :param end_date: optional end date (inclusive)
+        :return: (time, y, x) array
+        """
+        x = slice(self._get_index(self.x, xmin), self._get_index(self.x, xmax) + 1)
+        y = slice(self._get_index(self.y, ymin), self._get_index(self.y, ymax) + 1)
+        return self.data[self._get_time_slice(start_date, end_date), y, x]
@@ -2,10 +2,14 @@
 # Distributed under the MIT License. See LICENSE for more info.
 from __future__ import annotations
 
+import atexit
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum
-from functools import reduce
+from functools import partial, reduce
 from tempfile import NamedTemporaryFile
 from typing import TYPE_CHECKING
 from urllib.parse import urljoin
@@ -21,6 +25,7 @@ from wetterdienst.metadata.period import PeriodType
 from wetterdienst.metadata.resolution import ResolutionType
 from wetterdienst.metadata.timezone import Timezone
 from wetterdienst.metadata.unit import OriginUnit, SIUnit, UnitEnum
+from wetterdienst.util.archive import read_parsed_file
 from wetterdienst.util.cache import CacheExpiry
 from wetterdienst.util.eccodes import check_pdbufr
 from wetterdienst.util.network import download_file, list_remote_files_fsspec
@@ -38,6 +43,11 @@ log = logging.getLogger(__name__)
 DATE_REGEX = r"-(\d{10,})-"
 TIME_COLUMNS = ("year", "month", "day", "hour", "minute")
 
+# BUFR files are decoded in one process pool which is shared by all requests and created on first use
+DECODE_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_decode_executor: ProcessPoolExecutor | None = None
+_decode_executor_lock = threading.Lock()
+
 
 class DwdRoadParameter(DatasetTreeCore):
     """
@@ -167,6 +177,7 @@ class DwdRoadValues(TimeseriesValues):
     """
 
     _data_tz = Timezone.UTC
+    _collect_by_dataset = True
 
     def __init__(self, stations_result: StationsResult) -> None:
         check_pdbufr()
@@ -180,16 +191,12 @@ class DwdRoadValues(TimeseriesValues):
             .item()
         )
         station_group = DwdRoadStationGroup(station_group)
-        if parameter == dataset:
-            parameters = [par.value for par in DwdRoadParameter.MINUTE_15 if hasattr(par, "name")]
-        else:
-            parameters = [parameter.value]
-        try:
-            df = self._collect_data_by_station_group(station_group, parameters)
-        except ValueError:
+        df = self._collect_data_by_station_group(station_group, station_id)
+        if df.is_empty():
             return pl.DataFrame()
-        df = df.rename(mapping={"timestamp": Columns.DATE.value, "shortstationname": Columns.STATION_ID.value})
-        return df.filter(pl.col(Columns.STATION_ID.value).eq(station_id))
+        if parameter != dataset:
+            df = df.filter(pl.col(Columns.PARAMETER.value).eq(parameter.value.lower()))
+        return df
 
     def _create_file_index_for_dwd_road_weather_station(
         self,
@@ -225,18 +232,19 @@ class DwdRoadValues(TimeseriesValues):
     def _collect_data_by_station_group(
         self,
         road_weather_station_group: DwdRoadStationGroup,
-        parameters: list[str],
+        station_id: str,
     ) -> pl.DataFrame:
         """
-        Method to collect data for one specified parameter. Manages restoring,
-        collection and storing of data, transformation and combination of different
-        periods.
+        Method to collect the data of one station from the files of its station group. Each
+        file holds the data of all stations of the group, it is decoded once for all parameters
+        and stations and the decoded data is cached for the other stations of the group.
 
         Args:
             road_weather_station_group: subset id for which parameter is collected
+            station_id: station id of which the data is collected
 
         Returns:
-            pandas.DataFrame for given parameter of station
+            polars.DataFrame with all parameters of the station
         """
         remote_files = self._create_file_index_for_dwd_road_weather_station(road_weather_station_group)
         if self.sr.start_date:
@@ -244,114 +252,112 @@ class DwdRoadValues(TimeseriesValues):
                 pl.col(Columns.DATE.value).is_between(self.sr.start_date, self.sr.end_date),
             )
         remote_files = remote_files.get_column(Columns.FILENAME.value).to_list()
-        filenames_and_files = self._download_road_weather_observations(remote_files, self.sr.settings)
-        return self._parse_dwd_road_weather_data(filenames_and_files, parameters)
-
-    @staticmethod
-    def _download_road_weather_observations(remote_files: list[str], settings) -> list[tuple[str, BytesIO]]:
-        """
-        :param remote_files:    List of requested files
-        :return:                List of downloaded files
-        """
-        log.info(f"Downloading {len(remote_files)} files from DWD Road Weather.")
+        log.info(f"Collecting {len(remote_files)} files from DWD Road Weather.")
+        # decoding BUFR is CPU-bound, so it runs in processes, downloading in threads
+        decode_executor = _get_decode_executor()
         with ThreadPoolExecutor() as p:
-            files_in_bytes = p.map(
-                lambda file: download_file(url=file, settings=settings, ttl=CacheExpiry.TWELVE_HOURS),
+            data = p.map(
+                lambda url: read_parsed_file(
+                    url=url,
+                    station_id=station_id,
+                    parse=partial(_parse_dwd_road_weather_data, executor=decode_executor),
+                    settings=self.sr.settings,
+                    ttl=CacheExpiry.TWELVE_HOURS,
+                ),
                 remote_files,
             )
+            data = [df for df in data if not df.is_empty()]
+        if not data:
+            return pl.DataFrame()
+        return pl.concat(data)
 
-        return list(zip(remote_files, files_in_bytes))
 
-    def _parse_dwd_road_weather_data(
-        self,
-        filenames_and_files: list[tuple[str, BytesIO]],
-        parameters: list[str],
-    ) -> pl.DataFrame:
-        """
-        This function is used to read the road weather station data from given bytes object.
-        The filename is required to defined if and where an error happened.
+def _get_decode_executor() -> ProcessPoolExecutor:
+    """
+    Get the process pool in which BUFR files are decoded. Its processes are spawned instead of
+    forked, as forking a process which already runs threads, e.g. the event loop of fsspec, may
+    deadlock. The pool is shut down when the interpreter exits.
+    """
+    global _decode_executor
+    with _decode_executor_lock:
+        if _decode_executor is None:
+            _decode_executor = ProcessPoolExecutor(
+                max_workers=DECODE_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(_decode_executor.shutdown)
+        return _decode_executor
 
-        Args:
-            filenames_and_files: list of tuples of a filename and its local stored file
-            that should be read
 
-        Returns:
-            pandas.DataFrame with requested data, for different station ids the data is
-            still put into one DataFrame
-        """
-        return pl.concat(
-            [
-                self.__parse_dwd_road_weather_data(filename_and_file, parameters)
-                for filename_and_file in filenames_and_files
-            ],
-        )
+def _parse_dwd_road_weather_data(file: BytesIO, executor: Executor) -> pl.DataFrame:
+    """
+    This function is used to read the road weather station data from given bytes object.
+    All parameters of all stations of the file are decoded at once in the given executor.
 
-    @staticmethod
-    def __parse_dwd_road_weather_data(filename_and_file: tuple[str, BytesIO], parameters: list[str]) -> pl.DataFrame:
-        """
-        A wrapping function that only handles data for one station id. The files passed to
-        it are thus related to this id. This is important for storing the data locally as
-        the DataFrame that is stored should obviously only handle one station at a time.
-        Args:
-            filename_and_file: the files belonging to one station
-            resolution: enumeration of time resolution used to correctly parse the
-            date field
-        Returns:
-            pandas.DataFrame with data from that station, acn be empty if no data is
-            provided or local file is not found or has no data in it
-        """
-        import pdbufr
-
-        _, file = filename_and_file
-        tf = NamedTemporaryFile("w+b")
-        tf.write(file.read())
-        tf.seek(0)
-        first_batch = parameters[:10]
-        second_batch = parameters[10:]
+    Args:
+        file: downloaded BUFR file
+        executor: executor in which the file is decoded
+
+    Returns:
+        polars.DataFrame with all parameters, for different station ids the data is
+        still put into one DataFrame
+    """
+    parameters = tuple(par.value for par in DwdRoadParameter.MINUTE_15 if hasattr(par, "name"))
+    return executor.submit(_decode_dwd_road_weather_data, file.read(), parameters).result()
+
+
+def _decode_dwd_road_weather_data(content: bytes, parameters: tuple[str, ...]) -> pl.DataFrame:
+    """
+    Decode the given parameters of all stations of one BUFR file. Messages that lack some of
+    the parameters are kept with missing values for them.
+
+    Args:
+        content: content of the BUFR file
+        parameters: BUFR keys of the parameters
+
+    Returns:
+        polars.DataFrame with data from all stations of the file, can be empty if the file
+        has no data in it
+    """
+    import pdbufr
+
+    # pdbufr only reads from paths
+    with NamedTemporaryFile("w+b", suffix=".bufr") as tf:
+        tf.write(content)
+        tf.flush()
         df = pdbufr.read_bufr(
             tf.name,
-            columns=TIME_COLUMNS
-            + (
-                "shortStationName",
-                *first_batch,
-            ),
+            columns=TIME_COLUMNS + ("shortStationName", *parameters),
+            required_columns=TIME_COLUMNS + ("shortStationName",),
         )
-        if second_batch:
-            df2 = pdbufr.read_bufr(
-                tf.name,
-                columns=TIME_COLUMNS
-                + (
-                    "shortStationName",
-                    *second_batch,
-                ),
-            )
-            df = df.merge(df2, on=TIME_COLUMNS + ("shortStationName",))
-        df = pl.from_pandas(df)
-        df = df.select(
-            pl.col("shortStationName"),
-            pl.concat_str(
-                exprs=[
-                    pl.col("year").cast(pl.String),
-                    pl.col("month").cast(pl.String).str.pad_start(2, "0"),
-                    pl.col("day").cast(pl.String).str.pad_start(2, "0"),
-                    pl.col("hour").cast(pl.String).str.pad_start(2, "0"),
-                    pl.col("minute").cast(pl.String).str.pad_start(2, "0"),
-                ],
-            )
-            .str.to_datetime("%Y%m%d%H%M", time_zone="UTC")
-            .alias("timestamp"),
-            *parameters,
-        )
-        df = df.rename(mapping=lambda col: col.lower())
-        df = df.unpivot(
-            index=["shortstationname", "timestamp"],
-            variable_name=Columns.PARAMETER.value,
-            value_name=Columns.VALUE.value,
-        )
-        return df.with_columns(
-            pl.col("value").cast(pl.Float64),
-            pl.lit(None, dtype=pl.Float64).alias(Columns.QUALITY.value),
+    if df.empty:
+        return pl.DataFrame()
+    df = pl.from_pandas(df)
+    df = df.select(
+        pl.col("shortStationName").alias(Columns.STATION_ID.value),
+        pl.concat_str(
+            exprs=[
+                pl.col("year").cast(pl.String),
+                pl.col("month").cast(pl.String).str.pad_start(2, "0"),
+                pl.col("day").cast(pl.String).str.pad_start(2, "0"),
+                pl.col("hour").cast(pl.String).str.pad_start(2, "0"),
+                pl.col("minute").cast(pl.String).str.pad_start(2, "0"),
+            ],
         )
+        .str.to_datetime("%Y%m%d%H%M", time_zone="UTC")
+        .alias(Columns.DATE.value),
+        *[pl.col(parameter).cast(pl.Float64) for parameter in parameters if parameter in df.columns],
+    )
+    df = df.rename(mapping=lambda col: col.lower())
+    df = df.unpivot(
+        index=[Columns.STATION_ID.value, Columns.DATE.value],
+        variable_name=Columns.PARAMETER.value,
+        value_name=Columns.VALUE.value,
+    )
+    return df.with_columns(
+        pl.col(Columns.VALUE.value).cast(pl.Float64),
+        pl.lit(None, dtype=pl.Float64).alias(Columns.QUALITY.value),
+    )
 
 
 class DwdRoadRequest(TimeseriesRequest):
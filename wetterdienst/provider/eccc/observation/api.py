@@ -46,6 +46,7 @@ class EcccObservationPeriod(Enum):
 
 class EcccObservationValues(TimeseriesValues):
     _data_tz = Timezone.UTC
+    _collect_by_dataset = True
 
     _base_url = (
         "https://climate.weather.gc.ca/climate_data/bulk_data_e.html?"
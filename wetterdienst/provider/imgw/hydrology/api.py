@@ -7,6 +7,7 @@ import logging
 import re
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import partial
 from io import StringIO
 from typing import TYPE_CHECKING
 
@@ -24,6 +25,7 @@ from wetterdienst.metadata.period import PeriodType
 from wetterdienst.metadata.resolution import ResolutionType
 from wetterdienst.metadata.timezone import Timezone
 from wetterdienst.metadata.unit import OriginUnit, SIUnit, UnitEnum
+from wetterdienst.util.archive import read_parsed_file
 from wetterdienst.util.cache import CacheExpiry
 from wetterdienst.util.geo import convert_dms_string_to_dd
 from wetterdienst.util.network import download_file, list_remote_files_fsspec
@@ -110,6 +112,7 @@ class ImgwHydrologyPeriod(Enum):
 
 class ImgwHydrologyValues(TimeseriesValues):
     _data_tz = Timezone.UTC
+    _collect_by_dataset = True
     _endpoint = "https://danepubliczne.imgw.pl/data/dane_pomiarowo_obserwacyjne/dane_hydrologiczne/{resolution}/"
     _file_schema = {
         "daily": {
@@ -154,17 +157,14 @@ class ImgwHydrologyValues(TimeseriesValues):
         :return:
         """
         urls = self._get_urls(dataset)
+        file_schema = self._file_schema[self.sr.resolution.name.lower()][dataset.name.lower()]
+        parse = partial(self._parse_file, file_schema=file_schema)
         with ThreadPoolExecutor() as p:
-            files_in_bytes = p.map(
-                lambda file: download_file(url=file, settings=self.sr.settings, ttl=CacheExpiry.FIVE_MINUTES),
+            data = p.map(
+                lambda url: read_parsed_file(url=url, station_id=station_id, parse=parse, settings=self.sr.settings),
                 urls,
             )
-        data = []
-        file_schema = self._file_schema[self.sr.resolution.name.lower()][dataset.name.lower()]
-        for file_in_bytes in files_in_bytes:
-            df = self._parse_file(file_in_bytes=file_in_bytes, station_id=station_id, file_schema=file_schema)
-            if not df.is_empty():
-                data.append(df)
+            data = [df for df in data if not df.is_empty()]
         try:
             df = pl.concat(data)
         except ValueError:
@@ -172,14 +172,12 @@ class ImgwHydrologyValues(TimeseriesValues):
         if df.is_empty():
             return pl.DataFrame()
         return df.with_columns(
-            pl.col("date").dt.replace_time_zone("UTC"),
-            pl.col("value").cast(pl.Float64),
             pl.lit(None, dtype=pl.Float64).alias("quality"),
         )
 
-    def _parse_file(self, file_in_bytes: bytes, station_id: str, file_schema: dict) -> pl.DataFrame:
+    def _parse_file(self, file_in_bytes: bytes, file_schema: dict) -> pl.DataFrame:
         """Function to parse hydrological zip file, parses all files and combines
-        them
+        them, the data of all stations is kept
 
         :param file_in_bytes:
         :param file_schema:
@@ -194,7 +192,7 @@ class ImgwHydrologyValues(TimeseriesValues):
                 if re.match(file_pattern, f):
                     file = f
                     break
-            df = self.__parse_file(file=zfs.read_bytes(file), station_id=station_id, schema=schema)
+            df = self.__parse_file(file=zfs.read_bytes(file), schema=schema)
             if not df.is_empty():
                 data.append(df)
         try:
@@ -203,9 +201,9 @@ class ImgwHydrologyValues(TimeseriesValues):
             return pl.DataFrame()
         if df.is_empty():
             return pl.DataFrame()
-        return df.unique(subset=["parameter", "date"], keep="first")
+        return df.unique(subset=["station_id", "parameter", "date"], keep="first", maintain_order=True)
 
-    def __parse_file(self, file: bytes, station_id: str, schema: dict) -> pl.DataFrame:
+    def __parse_file(self, file: bytes, schema: dict) -> pl.DataFrame:
         """Function to parse a single file out of the zip file
 
         :param file: unzipped file bytes
@@ -221,7 +219,6 @@ class ImgwHydrologyValues(TimeseriesValues):
         )
         df = df.select(list(schema.keys())).rename(schema)
         df = df.with_columns(pl.col("station_id").str.strip_chars())
-        df = df.filter(pl.col("station_id").eq(station_id))
         if df.is_empty():
             return df
         df = df.with_columns(pl.col("year").cast(pl.Int64), pl.col("month").cast(pl.Int64))
@@ -258,7 +255,7 @@ class ImgwHydrologyValues(TimeseriesValues):
                 ).alias("parameter"),
                 pl.col("value"),
             )
-        return df
+        return df.with_columns(pl.col("date").dt.replace_time_zone("UTC"))
 
     def _get_urls(self, dataset: Enum) -> pl.Series:
         """Get file urls from server
@@ -6,6 +6,7 @@ import datetime as dt
 import re
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import partial
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
@@ -23,6 +24,7 @@ from wetterdienst.metadata.period import PeriodType
 from wetterdienst.metadata.resolution import ResolutionType
 from wetterdienst.metadata.timezone import Timezone
 from wetterdienst.metadata.unit import OriginUnit, SIUnit, UnitEnum
+from wetterdienst.util.archive import read_parsed_file
 from wetterdienst.util.cache import CacheExpiry
 from wetterdienst.util.geo import convert_dms_string_to_dd
 from wetterdienst.util.network import download_file, list_remote_files_fsspec
@@ -220,6 +222,7 @@ class ImgwMeteorologyPeriod(Enum):
 
 class ImgwMeteorologyValues(TimeseriesValues):
     _data_tz = Timezone.UTC
+    _collect_by_dataset = True
     _endpoint = (
         "https://danepubliczne.imgw.pl/data/dane_pomiarowo_obserwacyjne/dane_meteorologiczne/{resolution}/{dataset}/"
     )
@@ -372,17 +375,14 @@ class ImgwMeteorologyValues(TimeseriesValues):
         :return:
         """
         urls = self._get_urls(dataset)
+        file_schema = self._file_schema[self.sr.resolution.name.lower()][dataset.name.lower()]
+        parse = partial(self._parse_file, file_schema=file_schema)
         with ThreadPoolExecutor() as p:
-            files_in_bytes = p.map(
-                lambda file: download_file(url=file, settings=self.sr.settings, ttl=CacheExpiry.FIVE_MINUTES),
+            data = p.map(
+                lambda url: read_parsed_file(url=url, station_id=station_id, parse=parse, settings=self.sr.settings),
                 urls,
             )
-        data = []
-        file_schema = self._file_schema[self.sr.resolution.name.lower()][dataset.name.lower()]
-        for file_in_bytes in files_in_bytes:
-            df = self._parse_file(file_in_bytes, station_id, file_schema)
-            if not df.is_empty():
-                data.append(df)
+            data = [df for df in data if not df.is_empty()]
         try:
             df = pl.concat(data)
         except ValueError:
@@ -390,14 +390,12 @@ class ImgwMeteorologyValues(TimeseriesValues):
         if df.is_empty():
             return pl.DataFrame()
         return df.with_columns(
-            pl.col("date").dt.replace_time_zone("UTC"),
-            pl.col("value").cast(pl.Float64),
             pl.lit(None, dtype=pl.Float64).alias("quality"),
         )
 
-    def _parse_file(self, file_in_bytes: bytes, station_id, file_schema: dict) -> pl.DataFrame:
+    def _parse_file(self, file_in_bytes: bytes, file_schema: dict) -> pl.DataFrame:
         """Function to parse meteorological zip file, parses all files and combines
-        them
+        them, the data of all stations is kept
 
         :param file_in_bytes:
         :param file_schema:
@@ -412,7 +410,7 @@ class ImgwMeteorologyValues(TimeseriesValues):
                 if re.match(file_pattern, f):
                     file = f
                     break
-            df = self.__parse_file(zfs.read_bytes(file), station_id, schema)
+            df = self.__parse_file(zfs.read_bytes(file), schema)
             if not df.is_empty():
                 data.append(df)
         try:
@@ -421,9 +419,9 @@ class ImgwMeteorologyValues(TimeseriesValues):
             return pl.DataFrame()
         if df.is_empty():
             return pl.DataFrame()
-        return df.unique(subset=["parameter", "date"], keep="first")
+        return df.unique(subset=["station_id", "parameter", "date"], keep="first", maintain_order=True)
 
-    def __parse_file(self, file: bytes, station_id: str, schema: dict) -> pl.DataFrame:
+    def __parse_file(self, file: bytes, schema: dict) -> pl.DataFrame:
         """Function to parse a single file out of the zip file
 
         :param file:
@@ -432,7 +430,6 @@ class ImgwMeteorologyValues(TimeseriesValues):
         df = pl.read_csv(file, encoding="latin-1", separator=",", has_header=False, infer_schema_length=0)
         df = df.select(list(schema.keys())).rename(schema)
         df = df.with_columns(pl.col("station_id").str.strip_chars())
-        df = df.filter(pl.col("station_id").eq(station_id))
         if df.is_empty():
             return df
         if self.sr.resolution == Resolution.DAILY:
@@ -443,7 +440,7 @@ class ImgwMeteorologyValues(TimeseriesValues):
             exp2 = pl.datetime("year", "month", 1).alias(Columns.DATE.value)
         df = df.select(exp1, exp2)
         df = df.unpivot(index=["station_id", "date"], variable_name="parameter", value_name="value")
-        return df.with_columns(pl.col("value").cast(pl.Float64))
+        return df.with_columns(pl.col("date").dt.replace_time_zone("UTC"), pl.col("value").cast(pl.Float64))
 
     def _get_urls(self, dataset: Enum) -> pl.Series:
         """Get file urls from server
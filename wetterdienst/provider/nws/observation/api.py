@@ -102,6 +102,7 @@ class NwsObservationPeriod(Enum):
 
 class NwsObservationValues(TimeseriesValues):
     _data_tz = Timezone.UTC
+    _collect_by_dataset = True
     _endpoint = "https://api.weather.gov/stations/{station_id}/observations"
 
     def _collect_station_parameter(
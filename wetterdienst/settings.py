@@ -22,7 +22,11 @@ class Settings(BaseModel):
 
     cache_disable: bool | None = Field(default=False)
     cache_dir: Path | None = Field(default=platformdirs.user_cache_dir(appname="wetterdienst"))
+    cache_stale_while_revalidate: int | None = Field(default=0)
+    cache_max_size: int | None = Field(default=None)
+    cache_max_size_per_bucket: dict[str, int] | None = Field(default_factory=dict)
     fsspec_client_kwargs: dict | None = Field(default_factory=dict)
+    fsspec_pool_size_per_host: dict[str, int] | None = Field(default_factory=lambda: {"default": 10})
     ts_humanize: bool | None = Field(default=True)
     ts_shape: Literal["wide", "long"] | None = Field(default="long")
     ts_si_units: bool | None = Field(default=True)
@@ -30,6 +34,9 @@ class Settings(BaseModel):
     ts_skip_threshold: float | None = Field(default=0.95)
     ts_skip_criteria: Literal["min", "mean", "max"] | None = Field(default="min")
     ts_dropna: bool | None = Field(default=False)
+    ts_max_workers: int | None = Field(default=1)
+    ts_store: bool | None = Field(default=False)
+    ts_store_expiry: int | None = Field(default=300)
     ts_interpolation_station_distance: dict[str, float] | None = Field(
         default_factory=lambda: {
             "default": 40.0,
@@ -61,11 +68,31 @@ class Settings(BaseModel):
             values["cache_dir"] = decide_arg(
                 values.get("cache_dir"), env.path("CACHE_DIR", None), _defaults["cache_dir"]
             )
+            values["cache_stale_while_revalidate"] = decide_arg(
+                values.get("cache_stale_while_revalidate"),
+                env.int("CACHE_STALE_WHILE_REVALIDATE", None),
+                _defaults["cache_stale_while_revalidate"],
+            )
+            values["cache_max_size"] = decide_arg(
+                values.get("cache_max_size"),
+                env.int("CACHE_MAX_SIZE", None),
+                _defaults["cache_max_size"],
+            )
+            cache_max_size_per_bucket = _defaults["cache_max_size_per_bucket"].copy()
+            if not ignore_env:
+                cache_max_size_per_bucket.update(env.dict("CACHE_MAX_SIZE_PER_BUCKET", {}, subcast_values=int))
+            cache_max_size_per_bucket.update(values.get("cache_max_size_per_bucket", {}))
+            values["cache_max_size_per_bucket"] = cache_max_size_per_bucket
             values["fsspec_client_kwargs"] = decide_arg(
                 values.get("fsspec_client_kwargs"),
                 env.dict("FSSPEC_CLIENT_KWARGS", {}),
                 _defaults["fsspec_client_kwargs"],
             )
+            fsspec_pool_size_per_host = _defaults["fsspec_pool_size_per_host"].copy()
+            if not ignore_env:
+                fsspec_pool_size_per_host.update(env.dict("FSSPEC_POOL_SIZE_PER_HOST", {}, subcast_values=int))
+            fsspec_pool_size_per_host.update(values.get("fsspec_pool_size_per_host", {}))
+            values["fsspec_pool_size_per_host"] = fsspec_pool_size_per_host
             with env.prefixed("TS_"):
                 values["ts_humanize"] = decide_arg(
                     values.get("ts_humanize"), env.bool("HUMANIZE", None), _defaults["ts_humanize"]
@@ -86,6 +113,13 @@ class Settings(BaseModel):
                 values["ts_dropna"] = decide_arg(
                     values.get("ts_dropna"), env.bool("DROPNA", None), _defaults["ts_dropna"]
                 )
+                values["ts_max_workers"] = decide_arg(
+                    values.get("ts_max_workers"), env.int("MAX_WORKERS", None), _defaults["ts_max_workers"]
+                )
+                values["ts_store"] = decide_arg(values.get("ts_store"), env.bool("STORE", None), _defaults["ts_store"])
+                values["ts_store_expiry"] = decide_arg(
+                    values.get("ts_store_expiry"), env.int("STORE_EXPIRY", None), _defaults["ts_store_expiry"]
+                )
                 with env.prefixed("INTERPOLATION_"):
                     ts_interpolation_station_distance = _defaults["ts_interpolation_station_distance"].copy()
                     if not ignore_env:
@@ -20,6 +20,7 @@ from cloup.constraints import If, RequireExactly, accept_none
 from PIL import Image
 
 from wetterdienst import Provider, Wetterdienst, __appname__, __version__
+from wetterdienst.core.timeseries.export import stream_to_target
 from wetterdienst.exceptions import ProviderNotFoundError
 from wetterdienst.ui.core import (
     _get_stripes_stations,
@@ -28,7 +29,9 @@ from wetterdienst.ui.core import (
     get_stations,
     get_summarize,
     get_values,
+    get_values_stream,
     set_logging_level,
+    sync_store,
 )
 from wetterdienst.util.cli import docstring_format_verbatim, setup_logging
 
@@ -152,8 +155,8 @@ def station_options_interpolate_summarize(command):
             cloup.option("--station", type=comma_separated_list),
         ),
         cloup.option_group(
-            "Latitude-Longitude rank/distance filtering",
-            cloup.option("--coordinates", metavar="LATITUDE,LONGITUDE", type=click.STRING),
+            "Latitude-Longitude filtering, multiple points separated by semicolon",
+            cloup.option("--coordinates", metavar="LATITUDE,LONGITUDE[;LATITUDE,LONGITUDE...]", type=click.STRING),
         ),
         cloup.constraint(
             RequireExactly(1),
@@ -171,6 +174,9 @@ Usage
     wetterdienst (-h | --help)  Display this page
     wetterdienst --version      Display the version number
     wetterdienst cache          Display cache location
+    wetterdienst cache stats    Display size and number of entries of the cache
+    wetterdienst cache prune    Evict least recently used entries beyond the budget of the cache
+    wetterdienst cache clear    Remove entries of the cache
     wetterdienst info           Display project information
 
 
@@ -223,7 +229,7 @@ Data computation:
 
         # Filtering options
         --station=<station>
-        --coordinates=<latitude,longitude>
+        --coordinates=<latitude,longitude>[;<latitude,longitude>...]
 
         # Output options
         [--format=<format>] [--pretty]
@@ -414,6 +420,10 @@ Compute data:
     wetterdienst interpolate --provider=dwd --network=observation --parameter=precipitation_height --resolution=daily \\
         --date=2020-06-30 --coordinates=49.9195,8.9671
 
+    # Compute daily interpolation of precipitation for multiple points at once
+    wetterdienst interpolate --provider=dwd --network=observation --parameter=precipitation_height --resolution=daily \\
+        --date=2020-06-30 --coordinates="49.9195,8.9671;50.0,8.9"
+
     # Compute daily summary of precipitation for specific station selected by id
     wetterdienst summarize --provider=dwd --network=observation --parameter=precipitation_height --resolution=daily \\
         --date=2020-06-30 --station=01048
@@ -498,6 +508,11 @@ Export data to files:
     # Export readings into Zarr format
     fetch --target="file://observations.zarr"
 
+    # Export readings station by station into CSV or NDJSON format, without holding all of them in memory,
+    # Parquet files and databases are written station by station as well
+    fetch --target="file://observations.csv"
+    fetch --target="file://observations.ndjson"
+
 Export data to databases:
 
     # Shortcut command for fetching readings.
@@ -552,6 +567,14 @@ Explore OPERA radar stations:
     wetterdienst radar --odim-code=deasb
     wetterdienst radar --wmo-code=10103
 
+Mirror data into the local store (only DWD Observation data):
+
+    # Sync all stations of a dataset, files which are already stored are skipped
+    wetterdienst sync --provider=dwd --network=observation --parameter=kl --resolution=daily
+
+    # Queries read from the store when it is enabled, recent data is kept for a day
+    WD_TS_STORE=true WD_TS_STORE_EXPIRY=86400 wetterdienst values --provider=dwd --network=observation --parameter=kl --resolution=daily --station=1048
+
 Create warming stripes (only DWD Observation data):
 
     # Create warming stripes for a specific station
@@ -578,11 +601,76 @@ def cli():
     setup_logging()
 
 
-@cli.command("cache", section=basic_section)
-def cache():
+def parse_duration(_ctx: click.Context, _param: click.Parameter, value: str | None) -> float | None:
+    """Parse a duration like 30m, 12h or 7d into seconds, plain numbers are seconds."""
+    if value is None:
+        return None
+    units = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+    try:
+        if value[-1:].lower() in units:
+            return float(value[:-1]) * units[value[-1:].lower()]
+        return float(value)
+    except ValueError as e:
+        raise click.BadParameter(f"'{value}' is not a duration like 30m, 12h or 7d") from e
+
+
+@cli.group("cache", section=basic_section, invoke_without_command=True)
+@click.pass_context
+def cache(ctx: click.Context):
+    if ctx.invoked_subcommand is None:
+        from wetterdienst import Settings
+
+        print(Settings().cache_dir)  # noqa: T201
+    return
+
+
+@cache.command("stats")
+def cache_stats():
     from wetterdienst import Settings
+    from wetterdienst.util.cache import CacheIndex
+
+    settings = Settings()
+    buckets = CacheIndex.get(settings.cache_dir).stats()
+    stats = {
+        "cache_dir": str(settings.cache_dir),
+        "buckets": buckets,
+        "total": {
+            "size": sum(bucket["size"] for bucket in buckets.values()),
+            "count": sum(bucket["count"] for bucket in buckets.values()),
+        },
+        "max_size": settings.cache_max_size,
+        "max_size_per_bucket": settings.cache_max_size_per_bucket,
+    }
+    print(json.dumps(stats, indent=2))  # noqa: T201
+    return
 
-    print(Settings().cache_dir)  # noqa: T201
+
+@cache.command("prune")
+@cloup.option("--max-size", type=click.IntRange(min=0), default=None, help="maximum size of the cache in bytes")
+def cache_prune(max_size: int | None):
+    from wetterdienst import Settings
+    from wetterdienst.util.cache import CacheIndex
+
+    settings = Settings()
+    count, size = CacheIndex.get(settings.cache_dir).evict(settings, max_size=max_size)
+    print(json.dumps({"evicted": count, "size": size}, indent=2))  # noqa: T201
+    return
+
+
+@cache.command("clear")
+@cloup.option(
+    "--older-than",
+    callback=parse_duration,
+    default=None,
+    help="only remove entries which were not used within the duration e.g. 12h or 7d",
+)
+def cache_clear(older_than: float | None):
+    from wetterdienst import Settings
+    from wetterdienst.util.cache import CacheIndex
+
+    settings = Settings()
+    count, size = CacheIndex.get(settings.cache_dir).clear(older_than=older_than)
+    print(json.dumps({"removed": count, "size": size}, indent=2))  # noqa: T201
     return
 
 
@@ -885,6 +973,42 @@ def values(
 
     api = get_api(provider, network)
 
+    # filtering with SQL requires all values at once, otherwise values are written station by station
+    if target and not sql_values:
+        try:
+            results = get_values_stream(
+                api=api,
+                parameter=parameter,
+                resolution=resolution,
+                period=period,
+                lead_time=lead_time,
+                date=date,
+                issue=issue,
+                all_=all_,
+                station_id=station,
+                name=name,
+                coordinates=coordinates,
+                rank=rank,
+                distance=distance,
+                bbox=bbox,
+                sql=sql,
+                si_units=si_units,
+                shape=shape,
+                humanize=humanize,
+                skip_empty=skip_empty,
+                skip_criteria=skip_criteria,
+                skip_threshold=skip_threshold,
+                dropna=dropna,
+            )
+            count = stream_to_target(results, target)
+        except ValueError as e:
+            log.exception(e)
+            sys.exit(1)
+        if not count:
+            log.error("No data available for given constraints")
+            sys.exit(1)
+        return
+
     try:
         values_ = get_values(
             api=api,
@@ -1263,5 +1387,47 @@ def interactive(debug: bool):
             process.terminate()
 
 
+@cli.command("sync", section=data_section)
+@provider_opt
+@network_opt
+@station_options_core
+@cloup.option("--station", type=comma_separated_list, help="only sync the given stations")
+@cloup.option("--max-workers", type=click.IntRange(min=1), default=4, help="number of files synced concurrently")
+@debug_opt
+def sync(
+    provider: str,
+    network: str,
+    parameter: list[str],
+    resolution: str,
+    period: list[str],
+    station: list[str],
+    max_workers: int,
+    debug: bool,
+):
+    set_logging_level(debug)
+
+    api = get_api(provider, network)
+
+    try:
+        summary = sync_store(
+            api=api,
+            parameter=parameter,
+            resolution=resolution,
+            period=period,
+            station_id=station,
+            max_workers=max_workers,
+        )
+    except (TypeError, ValueError) as e:
+        log.error(str(e))
+        sys.exit(1)
+
+    print(json.dumps(summary, indent=2))  # noqa: T201
+
+    if any(counts["failed"] for counts in summary.values()):
+        sys.exit(1)
+
+    return
+
+
 if __name__ == "__main__":
     cli()
@@ -21,6 +21,8 @@ from wetterdienst.settings import Settings
 from wetterdienst.util.enumeration import parse_enumeration_from_template
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from wetterdienst.core.timeseries.request import TimeseriesRequest
     from wetterdienst.core.timeseries.result import (
         InterpolatedValuesResult,
@@ -292,7 +294,6 @@ def get_values(
     )
 
     try:
-        # TODO: Add stream-based processing here.
         values_ = stations_.values.all()
     except ValueError as e:
         log.exception(e)
@@ -310,6 +311,72 @@ def get_values(
     return values_
 
 
+def get_values_stream(
+    api: TimeseriesRequest,
+    parameter: list[str],
+    resolution: str,
+    lead_time: str,
+    date: str,
+    issue: str,
+    period: list[str],
+    all_,
+    station_id: list[str],
+    name: str,
+    coordinates: str,
+    rank: int,
+    distance: float,
+    bbox: str,
+    sql: str,
+    si_units: bool,
+    shape: Literal["wide", "long"],
+    humanize: bool,
+    skip_empty: bool,
+    skip_threshold: float,
+    skip_criteria: Literal["min", "mean", "max"],
+    dropna: bool,
+) -> Iterator[ValuesResult]:
+    """Core function for querying values station by station via cli and restapi, without collecting all of them"""
+    stations_ = get_stations(
+        api=api,
+        parameter=parameter,
+        resolution=resolution,
+        period=period,
+        lead_time=lead_time,
+        date=date,
+        issue=issue,
+        all_=all_,
+        station_id=station_id,
+        name=name,
+        coordinates=coordinates,
+        rank=rank,
+        distance=distance,
+        bbox=bbox,
+        sql=sql,
+        si_units=si_units,
+        shape=shape,
+        humanize=humanize,
+        skip_empty=skip_empty,
+        skip_threshold=skip_threshold,
+        skip_criteria=skip_criteria,
+        dropna=dropna,
+    )
+    return stations_.values.query()
+
+
+def _parse_points(coordinates: str) -> list[tuple[float, float]]:
+    """
+    Parse one or multiple points given as "lat,lon" pairs separated by semicolon e.g. "50.0,8.9;50.1,8.7".
+
+    :param coordinates: string with semicolon separated latitude-longitude pairs
+    :return: list of tuples of latitude and longitude
+    """
+    points = []
+    for point in coordinates.split(";"):
+        lat, lon = point.split(",")
+        points.append((float(lat), float(lon)))
+    return points
+
+
 def get_interpolate(
     api: TimeseriesRequest,
     parameter: list[str],
@@ -346,8 +413,11 @@ def get_interpolate(
 
     try:
         if coordinates:
-            lat, lon = coordinates.split(",")
-            values_ = r.interpolate((float(lat), float(lon)))
+            points = _parse_points(coordinates)
+            if len(points) > 1:
+                values_ = r.interpolate_many(points)
+            else:
+                values_ = r.interpolate(points[0])
         else:
             values_ = r.interpolate_by_station_id(station_id)
     except ValueError as e:
@@ -400,8 +470,11 @@ def get_summarize(
 
     try:
         if coordinates:
-            lat, lon = coordinates.split(",")
-            values_ = r.summarize((float(lat), float(lon)))
+            points = _parse_points(coordinates)
+            if len(points) > 1:
+                values_ = r.summarize_many(points)
+            else:
+                values_ = r.summarize(points[0])
         else:
             values_ = r.summarize_by_station_id(station_id)
     except ValueError as e:
@@ -419,6 +492,46 @@ def get_summarize(
     return values_
 
 
+def sync_store(
+    api,
+    parameter: list[str],
+    resolution: str,
+    period: list[str],
+    station_id: list[str] | None,
+    max_workers: int,
+) -> dict[str, dict[str, int]]:
+    """Core function for mirroring DWD observation data into the local Parquet store via cli"""
+    from wetterdienst.provider.dwd.observation.store import sync_climate_observations_store
+    from wetterdienst.provider.dwd.observation.util.parameter import check_dwd_observations_dataset
+
+    if not issubclass(api, DwdObservationRequest):
+        raise TypeError("Syncing is only available for provider DWD and network observation")
+
+    request = api(parameter=unpack_parameters(parameter), resolution=resolution, period=period, settings=Settings())
+
+    datasets = list(dict.fromkeys(dataset for _, dataset in request.parameter))
+
+    # station ids are padded like in the request, so e.g. 1048 matches 01048 of the file index
+    if station_id:
+        station_id = request._parse_station_id(pl.Series(values=station_id, dtype=pl.String)).to_list()
+
+    summary = {}
+    for dataset in datasets:
+        for period_ in request.period:
+            if not check_dwd_observations_dataset(dataset, request.resolution, period_):
+                continue
+            log.info(f"Syncing {dataset.value}/{request.resolution.value}/{period_.value}")
+            summary[f"{dataset.value}/{request.resolution.value}/{period_.value}"] = sync_climate_observations_store(
+                dataset=dataset,
+                resolution=request.resolution,
+                period=period_,
+                settings=request.settings,
+                station_id=station_id,
+                max_workers=max_workers,
+            )
+    return summary
+
+
 def _get_stripes_temperature_request(period: Period = Period.HISTORICAL):
     """Need this for displaying stations in the interactive app."""
     return DwdObservationRequest(
@@ -2,15 +2,18 @@
 # Distributed under the MIT License. See LICENSE for more info.
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Annotated, Any, Literal, Optional, Union
 
 from click_params import StringListParamType
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 
-from wetterdienst import Author, Info, Provider, Wetterdienst
+from wetterdienst import Author, Info, Provider, Settings, Wetterdienst
+from wetterdienst.core.timeseries.export import stream_format
 from wetterdienst.core.timeseries.result import (
     _InterpolatedValuesDict,
     _InterpolatedValuesOgcFeatureCollection,
@@ -30,19 +33,44 @@ from wetterdienst.ui.core import (
     get_stations,
     get_summarize,
     get_values,
+    get_values_stream,
     set_logging_level,
 )
 from wetterdienst.util.cli import read_list, setup_logging
+from wetterdienst.util.network import refresh_hot_keys
 
 if TYPE_CHECKING:
     from wetterdienst.core.timeseries.request import TimeseriesRequest
 
 info = Info()
 
-app = FastAPI(debug=False)
-
 log = logging.getLogger(__name__)
 
+# interval in seconds in which recently used cache entries are refreshed ahead of their expiration
+HOT_KEYS_REFRESH_INTERVAL = 60
+
+
+async def _refresh_hot_keys_periodically(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        # refresh entries which would expire before the next run
+        refreshed = await asyncio.to_thread(refresh_hot_keys, margin=2 * interval)
+        if refreshed:
+            log.info(f"Refreshed {refreshed} cache entries ahead of their expiration")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    task = None
+    if Settings().cache_stale_while_revalidate:
+        task = asyncio.create_task(_refresh_hot_keys_periodically(HOT_KEYS_REFRESH_INTERVAL))
+    yield
+    if task:
+        task.cancel()
+
+
+app = FastAPI(debug=False, lifespan=lifespan)
+
 CommaSeparator = StringListParamType(",")
 
 
@@ -146,6 +174,7 @@ def index():
                     <li><a href="api/stations?provider=dwd&network=observation&parameter=kl&resolution=daily&period=recent&all=true" target="_blank" rel="noopener">DWD Obs Daily Climate Stations</a></li>
                     <li><a href="api/values?provider=dwd&network=observation&parameter=kl&resolution=daily&period=recent&station=00011" target="_blank" rel="noopener">DWD Obs Daily Climate Values</a></li>
                     <li><a href="api/interpolate?provider=dwd&network=observation&parameter=temperature_air_mean_2m&resolution=daily&station=00071&date=1986-10-31/1986-11-01" target="_blank" rel="noopener">DWD Obs Daily Climate Interpolation</a></li>
+                    <li><a href="api/interpolate?provider=dwd&network=observation&parameter=temperature_air_mean_2m&resolution=daily&coordinates=50.0,8.9;50.1,8.7&date=1986-10-31/1986-11-01" target="_blank" rel="noopener">DWD Obs Daily Climate Interpolation for Multiple Points</a></li>
                     <li><a href="api/summarize?provider=dwd&network=observation&parameter=temperature_air_mean_2m&resolution=daily&station=00071&date=1986-10-31/1986-11-01" target="_blank" rel="noopener">DWD Obs Daily Climate Summary</a></li>
                     <li><a href="api/stripes/stations?kind=temperature" target="_blank" rel="noopener">DWD Obs Daily Climate Stripes Stations</a></li>
                     <li><a href="api/stripes/values?kind=temperature&station=1048" target="_blank" rel="noopener">DWD Obs Daily Climate Stripes Values</a></li>
@@ -337,6 +366,7 @@ def values(
     dropna: Annotated[bool, Query(alias="dropna")] = False,
     fmt: Annotated[str, Query(alias="format")] = "json",
     pretty: Annotated[bool, Query()] = False,
+    stream: Annotated[bool, Query()] = False,
     debug: Annotated[bool, Query()] = False,
 ) -> Any:
     if provider is None or network is None:
@@ -349,7 +379,18 @@ def values(
             status_code=400,
             detail="Query arguments 'parameter', 'resolution' and 'date' are required",
         )
-    if fmt not in ("json", "geojson", "csv"):
+    if stream:
+        if fmt not in ("csv", "ndjson"):
+            raise HTTPException(
+                status_code=400,
+                detail="Query argument 'format' must be one of 'csv' or 'ndjson' when using 'stream'",
+            )
+        if sql_values:
+            raise HTTPException(
+                status_code=400,
+                detail="Query argument 'sql-values' can't be used with 'stream'",
+            )
+    elif fmt not in ("json", "geojson", "csv"):
         raise HTTPException(
             status_code=400,
             detail="Query argument 'format' must be one of 'json', 'geojson' or 'csv'",
@@ -372,6 +413,40 @@ def values(
     if station:
         station = read_list(station)
 
+    if stream:
+        try:
+            results = get_values_stream(
+                api=api,
+                parameter=parameter,
+                resolution=resolution,
+                date=date,
+                issue=issue,
+                period=period,
+                lead_time=lead_time,
+                all_=all_,
+                station_id=station,
+                name=name,
+                coordinates=coordinates,
+                rank=rank,
+                distance=distance,
+                bbox=bbox,
+                sql=sql,
+                si_units=si_units,
+                skip_empty=skip_empty,
+                skip_threshold=skip_threshold,
+                skip_criteria=skip_criteria,
+                dropna=dropna,
+                shape=shape,
+                humanize=humanize,
+            )
+        except Exception as e:
+            log.exception(e)
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+        # values are sent station by station in chunks
+        media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+        return StreamingResponse(stream_format(results, fmt), media_type=media_type)
+
     try:
         values_ = get_values(
             api=api,
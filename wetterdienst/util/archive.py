@@ -0,0 +1,128 @@
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+import polars as pl
+
+from wetterdienst.metadata.columns import Columns
+from wetterdienst.util.cache import CacheExpiry, record_cache_entry, touch_cache_entry
+from wetterdienst.util.network import download_file
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from io import BytesIO
+
+    from wetterdienst.settings import Settings
+
+log = logging.getLogger(__name__)
+
+# number of parsed files that are kept in memory, others are read from their Parquet file
+PARSED_FILES_IN_MEMORY = 32
+# number of locks the urls are spread over, so that the locks don't grow with the number of urls
+PARSED_FILE_LOCK_STRIPES = 64
+
+_parsed_file_cache: OrderedDict[str, tuple[float, pl.DataFrame]] = OrderedDict()
+_parsed_file_locks = [threading.Lock() for _ in range(PARSED_FILE_LOCK_STRIPES)]
+_parsed_file_lock = threading.Lock()
+
+
+def _get_parsed_file_path(url: str, settings: Settings, ttl: CacheExpiry) -> Path:
+    """Path of the Parquet file which holds the parsed content of the remote file."""
+    return (
+        Path(settings.cache_dir)
+        / "parsed"
+        / f"ttl-{ttl.name}"
+        / urlparse(url).netloc
+        / Path(urlparse(url).path.lstrip("/")).with_suffix(".parquet")
+    )
+
+
+def _is_fresh(created: float, ttl: CacheExpiry) -> bool:
+    return time.time() - created < ttl.value
+
+
+def _remember_parsed_file(url: str, created: float, df: pl.DataFrame) -> None:
+    """Keep the parsed file in memory and drop the least recently used ones beyond the limit."""
+    with _parsed_file_lock:
+        _parsed_file_cache[url] = (created, df)
+        _parsed_file_cache.move_to_end(url)
+        while len(_parsed_file_cache) > PARSED_FILES_IN_MEMORY:
+            _parsed_file_cache.popitem(last=False)
+
+
+def read_parsed_file(
+    url: str,
+    station_id: str,
+    parse: Callable[[BytesIO], pl.DataFrame],
+    settings: Settings,
+    ttl: CacheExpiry = CacheExpiry.FIVE_MINUTES,
+) -> pl.DataFrame:
+    """
+    Get the data of one station from a remote archive which holds the data of many stations. The
+    archive is downloaded and parsed only once and the parsed, typed data of all stations is kept
+    in memory and as Parquet file in the cache directory. Further stations, within the same request
+    or in later requests, are filtered from the parsed data.
+
+    :param url: url of the remote archive
+    :param station_id: station id
+    :param parse: function which parses the downloaded archive into a DataFrame with a station_id column
+    :param settings: settings holding the cache directory
+    :param ttl: expiry of the downloaded archive, the parsed data is kept as long so it is never older
+        than a fresh download
+    :return: polars.DataFrame with the data of the station
+    """
+    # the lock makes concurrent requests for the same archive wait for the first one to parse it
+    with _parsed_file_locks[hash(url) % PARSED_FILE_LOCK_STRIPES]:
+        df = _get_parsed_file(url, parse, settings, ttl)
+    if isinstance(df, pl.LazyFrame):
+        return df.filter(pl.col(Columns.STATION_ID.value).eq(station_id)).collect()
+    if df.is_empty():
+        return df
+    return df.filter(pl.col(Columns.STATION_ID.value).eq(station_id))
+
+
+def _get_parsed_file(
+    url: str,
+    parse: Callable[[BytesIO], pl.DataFrame],
+    settings: Settings,
+    ttl: CacheExpiry,
+) -> pl.DataFrame | pl.LazyFrame:
+    """Get the parsed file from memory, from its Parquet file or by downloading and parsing it, in this order."""
+    with _parsed_file_lock:
+        created, df = _parsed_file_cache.get(url, (0, None))
+        if df is not None and _is_fresh(created, ttl):
+            _parsed_file_cache.move_to_end(url)
+            return df
+
+    path = None
+    if not settings.cache_disable:
+        path = _get_parsed_file_path(url, settings, ttl)
+        if path.exists() and _is_fresh(path.stat().st_mtime, ttl):
+            log.info(f"Reading parsed file {url} from {path}")
+            touch_cache_entry(settings, path)
+            return pl.scan_parquet(path)
+
+    created = time.time()
+    df = parse(download_file(url=url, settings=settings, ttl=ttl))
+    if df.is_empty():
+        _remember_parsed_file(url, created, df)
+        return df
+    # sorting by station allows skipping the row groups of other stations when reading the Parquet file
+    df = df.sort(Columns.STATION_ID.value, maintain_order=True)
+    if path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path_tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        df.write_parquet(path_tmp, row_group_size=100_000)
+        path_tmp.replace(path)
+        record_cache_entry(settings, path)
+    _remember_parsed_file(url, created, df)
+    return df
@@ -1,6 +1,23 @@
 # Copyright (C) 2018-2021, earthobservations developers.
 # Distributed under the MIT License. See LICENSE for more info.
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from wetterdienst.settings import Settings
+
+log = logging.getLogger(__name__)
 
 
 class CacheExpiry(Enum):
@@ -19,3 +36,311 @@ class CacheExpiry(Enum):
 
     METAINDEX = TWELVE_HOURS
     FILEINDEX = FIVE_MINUTES
+
+
+# index of the files below the cache directory
+CACHE_INDEX_FILENAME = "index.sqlite"
+# directories below the cache directory whose files are indexed, their ttl-* subdirectories are separate buckets
+CACHE_BUCKET_ROOTS = ("fsspec", "parsed", "fileindex", "snapshot", "radolan")
+# files which are part of another cache entry, by their suffix and the suffix of the file they belong to
+CACHE_SIDECAR_SUFFIXES = {".validators": "", ".json": ".tar"}
+# files which are not cache entries e.g. the metadata of fsspec, locks and files being written
+CACHE_IGNORED_NAMES = ("cache",)
+CACHE_IGNORED_SUFFIXES = (".lock", ".tmp")
+# prefix of the buckets of the listings caches, which are bounded by diskcache itself
+LISTINGS_BUCKET_PREFIX = "listings/"
+# the last access of an entry is only updated if it is older than this many seconds
+CACHE_ACCESS_RESOLUTION = 60
+
+_CACHE_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    bucket TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sidecars TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_bucket_accessed ON entries (bucket, accessed);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO buckets (bucket, size, count) VALUES (NEW.bucket, NEW.size, 1)
+    ON CONFLICT (bucket) DO UPDATE SET size = size + NEW.size, count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE buckets SET size = size - OLD.size + NEW.size WHERE bucket = OLD.bucket;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE buckets SET size = size - OLD.size, count = count - 1 WHERE bucket = OLD.bucket;
+END;
+"""
+
+
+def get_cache_bucket_limit(settings: Settings, bucket: str) -> int | None:
+    """Get the maximum size in bytes of a bucket of the cache, None if it is unbounded."""
+    limits = settings.cache_max_size_per_bucket
+    return limits.get(bucket, limits.get("default"))
+
+
+class CacheIndex:
+    """
+    Index of the files below the cache directory, which are grouped into buckets e.g.
+    ``fsspec/ttl-FIVE_MINUTES``. Each entry is a file, optionally with sidecar files, with its size
+    and the time of its last access. The size and count of each bucket are kept up to date by
+    triggers, so stats are read without walking the cache directory and the least recently used
+    entries are evicted once a bucket or the whole cache exceeds its budget.
+    """
+
+    _instances: dict[Path, CacheIndex] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_dir: Path | str) -> None:
+        """
+        :param cache_dir: the cache directory, existing files are indexed when the index is created
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.cache_dir / CACHE_INDEX_FILENAME
+        self._local = threading.local()
+        created = not self.path.exists()
+        self._connection.executescript(_CACHE_INDEX_SCHEMA)
+        if created:
+            self.scan()
+
+    @classmethod
+    def get(cls, cache_dir: Path | str) -> CacheIndex:
+        """Get the index of a cache directory, which is shared by all users within the process."""
+        cache_dir = Path(cache_dir)
+        with cls._instances_lock:
+            if cache_dir not in cls._instances:
+                cls._instances[cache_dir] = cls(cache_dir)
+            return cls._instances[cache_dir]
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the current thread, sqlite connections can not be shared across threads."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _get_bucket(self, path: Path) -> str:
+        parts = path.relative_to(self.cache_dir).parts
+        if len(parts) > 2 and parts[1].startswith("ttl-"):
+            return f"{parts[0]}/{parts[1]}"
+        return parts[0]
+
+    def add(self, path: Path | str, sidecars: Iterable[Path | str] = (), settings: Settings | None = None) -> None:
+        """
+        Add or update an entry once its files are written and evict the least recently used entries
+        if that exceeds the budget of the cache.
+
+        :param path:        path of the file, below the cache directory
+        :param sidecars:    paths of files which belong to the file and are evicted with it
+        :param settings:    settings holding the budget of the cache, nothing is evicted if None
+        """
+        path = Path(path)
+        sidecars = [Path(sidecar) for sidecar in sidecars]
+        size = sum(file.stat().st_size for file in (path, *sidecars) if file.exists())
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO entries (path, bucket, size, sidecars, created, accessed) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET size = excluded.size, sidecars = excluded.sidecars, "
+                "created = excluded.created, accessed = excluded.accessed",
+                (
+                    path.relative_to(self.cache_dir).as_posix(),
+                    self._get_bucket(path),
+                    size,
+                    json.dumps([sidecar.relative_to(self.cache_dir).as_posix() for sidecar in sidecars]),
+                    now,
+                    now,
+                ),
+            )
+        if settings:
+            self.evict(settings)
+
+    def touch(self, path: Path | str) -> None:
+        """Update the last access of an entry, which decides on the order of eviction."""
+        now = time.time()
+        self._connection.execute(
+            "UPDATE entries SET accessed = ? WHERE path = ? AND accessed < ?",
+            (now, Path(path).relative_to(self.cache_dir).as_posix(), now - CACHE_ACCESS_RESOLUTION),
+        )
+
+    def scan(self) -> None:
+        """Index the files which exist below the cache directory, with their modification time as last access."""
+        for root in CACHE_BUCKET_ROOTS:
+            for file in sorted((self.cache_dir / root).rglob("*")):
+                if (
+                    not file.is_file()
+                    or file.name in CACHE_IGNORED_NAMES
+                    or file.suffix in CACHE_IGNORED_SUFFIXES
+                    or self._is_sidecar(file)
+                ):
+                    continue
+                sidecars = [file.with_suffix(suffix) for suffix in CACHE_SIDECAR_SUFFIXES if suffix != file.suffix]
+                self.add(file, [sidecar for sidecar in sidecars if sidecar.exists() and self._is_sidecar(sidecar)])
+                mtime = file.stat().st_mtime
+                self._connection.execute(
+                    "UPDATE entries SET created = ?, accessed = ? WHERE path = ?",
+                    (mtime, mtime, file.relative_to(self.cache_dir).as_posix()),
+                )
+
+    @staticmethod
+    def _is_sidecar(file: Path) -> bool:
+        main_suffix = CACHE_SIDECAR_SUFFIXES.get(file.suffix)
+        return main_suffix is not None and file.with_suffix(main_suffix).is_file()
+
+    def _get_listings(self) -> dict[str, Path]:
+        """Get the directories of the listings caches by their bucket."""
+        listings = {}
+        for directory in self.cache_dir.iterdir():
+            try:
+                float(directory.name)
+            except ValueError:
+                continue
+            if (directory / "cache.db").exists():
+                listings[f"{LISTINGS_BUCKET_PREFIX}{directory.name}"] = directory
+        return listings
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Get the size in bytes and the number of entries of each bucket, read from the totals of the
+        index and of the listings caches.
+
+        :return: dictionary of size and count by bucket
+        """
+        from diskcache import Cache
+
+        stats = {
+            bucket: {"size": size, "count": count}
+            for bucket, size, count in self._connection.execute(
+                "SELECT bucket, size, count FROM buckets WHERE count > 0 ORDER BY bucket"
+            )
+        }
+        for bucket, directory in self._get_listings().items():
+            with Cache(directory) as listings:
+                stats[bucket] = {"size": listings.volume(), "count": len(listings)}
+        return stats
+
+    def evict(self, settings: Settings, max_size: int | None = None) -> tuple[int, int]:
+        """
+        Evict the least recently used entries of buckets which exceed their budget and then of the
+        whole cache if it exceeds its budget.
+
+        :param settings:    settings holding the budget of the cache
+        :param max_size:    maximum size of the whole cache in bytes, overrides the settings
+        :return:            number and size in bytes of the evicted entries
+        """
+        max_size = max_size if max_size is not None else settings.cache_max_size
+        evicted = []
+        with self._transaction() as connection:
+            for bucket, size in connection.execute("SELECT bucket, size FROM buckets").fetchall():
+                limit = get_cache_bucket_limit(settings, bucket)
+                if limit is not None and size > limit:
+                    evicted += self._delete_least_recently_used(connection, size - limit, bucket)
+            if max_size is not None:
+                (size,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM buckets").fetchone()
+                if size > max_size:
+                    evicted += self._delete_least_recently_used(connection, size - max_size)
+        self._remove_files(evicted)
+        if evicted:
+            log.info(f"Evicted {len(evicted)} entries from the cache")
+        return len(evicted), sum(size for _, size, _ in evicted)
+
+    @staticmethod
+    def _delete_least_recently_used(
+        connection: sqlite3.Connection,
+        excess: int,
+        bucket: str | None = None,
+    ) -> list[tuple[str, int, str]]:
+        """Delete the least recently used entries, of one bucket or all, until they free the given size."""
+        query = "SELECT path, size, sidecars FROM entries"
+        parameters = ()
+        if bucket is not None:
+            query += " WHERE bucket = ?"
+            parameters = (bucket,)
+        entries = []
+        freed = 0
+        cursor = connection.execute(f"{query} ORDER BY accessed", parameters)
+        for entry in cursor:
+            if freed >= excess:
+                break
+            entries.append(entry)
+            freed += entry[1]
+        cursor.close()
+        connection.executemany("DELETE FROM entries WHERE path = ?", [(path,) for path, _, _ in entries])
+        return entries
+
+    def clear(self, older_than: float | None = None) -> tuple[int, int]:
+        """
+        Remove the entries of the cache, expired listings are removed as well.
+
+        :param older_than:  only remove entries which were not accessed within this many seconds, all if None
+        :return:            number and size in bytes of the removed entries
+        """
+        from diskcache import Cache
+
+        accessed = time.time() - older_than if older_than is not None else float("inf")
+        with self._transaction() as connection:
+            entries = connection.execute(
+                "SELECT path, size, sidecars FROM entries WHERE accessed < ?", (accessed,)
+            ).fetchall()
+            connection.execute("DELETE FROM entries WHERE accessed < ?", (accessed,))
+        self._remove_files(entries)
+        for directory in self._get_listings().values():
+            with Cache(directory) as listings:
+                if older_than is None:
+                    listings.clear()
+                else:
+                    listings.expire()
+        return len(entries), sum(size for _, size, _ in entries)
+
+    def _remove_files(self, entries: list[tuple[str, int, str]]) -> None:
+        """Remove the files of entries, sidecars first so the file is never used without them."""
+        for path, _, sidecars in entries:
+            for file in [*json.loads(sidecars), path]:
+                (self.cache_dir / file).unlink(missing_ok=True)
+
+
+def record_cache_entry(settings: Settings, path: Path, *sidecars: Path) -> None:
+    """
+    Record a file which was written to the cache directory in the index of the cache and keep the
+    cache within its budget.
+
+    :param settings:    settings holding the cache directory and its budget
+    :param path:        path of the file
+    :param sidecars:    paths of files which belong to the file
+    """
+    try:
+        CacheIndex.get(settings.cache_dir).add(path, sidecars, settings)
+    except sqlite3.Error as e:
+        log.warning(f"Failed recording {path} in the cache index: {e}")
+
+
+def touch_cache_entry(settings: Settings, path: Path) -> None:
+    """Record the access of a file in the cache directory, which keeps it from being evicted."""
+    try:
+        CacheIndex.get(settings.cache_dir).touch(path)
+    except sqlite3.Error as e:
+        log.warning(f"Failed recording the access of {path} in the cache index: {e}")
@@ -41,6 +41,63 @@ class Coordinates:
         return np.array_equal(self.latitudes, other.latitudes) and np.array_equal(self.longitudes, other.longitudes)
 
 
+class SpatialIndex:
+    """Spatial index over station coordinates for nearest neighbour and radius lookups.
+
+    The underlying ball tree is built once and can then be queried for any number of
+    points, which allows to keep it alongside a station catalog.
+    """
+
+    def __init__(self, latitudes: np.array, longitudes: np.array):
+        """
+        Args:
+            latitudes: latitudes of stations in degree
+            longitudes: longitudes of stations in degree
+
+        """
+        points = np.c_[np.radians(latitudes), np.radians(longitudes)]
+        self.size = points.shape[0]
+        self._tree = BallTree(points, metric="haversine")
+
+    def __len__(self) -> int:
+        return self.size
+
+    def query(self, coordinates: Coordinates, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the k nearest stations for each of the given coordinates
+
+        Args:
+            coordinates: the coordinates for which the nearest neighbours are searched
+            k: number of nearest stations per coordinate, capped at the number of stations
+
+        Returns:
+            Tuple of distances (radians) and indices of nearest to most distant stations,
+            one row per coordinate
+        """
+        k = min(k, self.size)
+        return self._tree.query(coordinates.get_coordinates_in_radians().reshape(-1, 2), k=k)
+
+    def query_radius(self, coordinates: Coordinates, radius: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get all stations within the given radius for each of the given coordinates
+
+        Args:
+            coordinates: the coordinates for which the stations are searched
+            radius: radius in radians
+
+        Returns:
+            Tuple of object arrays with distances (radians) and indices sorted from nearest
+            to most distant station, one entry per coordinate
+        """
+        indices, distances = self._tree.query_radius(
+            coordinates.get_coordinates_in_radians().reshape(-1, 2),
+            r=radius,
+            return_distance=True,
+            sort_results=True,
+        )
+        return distances, indices
+
+
 def derive_nearest_neighbours(
     latitudes: np.array,
     longitudes: np.array,
@@ -63,9 +120,7 @@ def derive_nearest_neighbours(
     Returns:
         Tuple of distances and ranks of nearest to most distant stations_result
     """
-    points = np.c_[np.radians(latitudes), np.radians(longitudes)]
-    distance_tree = BallTree(points, metric="haversine")
-    return distance_tree.query(coordinates.get_coordinates_in_radians().reshape(-1, 2), k=number_nearby)
+    return SpatialIndex(latitudes, longitudes).query(coordinates, k=number_nearby)
 
 
 def convert_dm_to_dd(dm: pl.Series) -> pl.Series:
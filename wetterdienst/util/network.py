@@ -2,25 +2,70 @@
 # Distributed under the MIT License. See LICENSE for more info.
 from __future__ import annotations
 
+import json
 import logging
+import os
+import socket
+import threading
+import time
 from collections.abc import MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
 
 import stamina
+from fsspec.asyn import sync_wrapper
+from fsspec.callbacks import DEFAULT_CALLBACK
 from fsspec.implementations.cached import WholeFileCacheFileSystem
 from fsspec.implementations.http import HTTPFileSystem as _HTTPFileSystem
 
-from wetterdienst.util.cache import CacheExpiry
+from wetterdienst.util.cache import (
+    LISTINGS_BUCKET_PREFIX,
+    CacheExpiry,
+    get_cache_bucket_limit,
+    record_cache_entry,
+    touch_cache_entry,
+)
 
 if TYPE_CHECKING:
+    import aiohttp
     from fsspec import AbstractFileSystem
 
     from wetterdienst.settings import Settings
 
 log = logging.getLogger(__name__)
 
+# pooled clients by host, they are only used within the event loop thread of fsspec
+_clients: dict[tuple[str, int, str], aiohttp.ClientSession] = {}
+_filesystems_lock = threading.Lock()
+
+# suffix of the files next to cached files which hold the validators of the cached response
+VALIDATORS_SUFFIX = ".validators"
+
+# suffix of the lock files of cache entries which are downloaded
+LOCK_SUFFIX = ".lock"
+# time in seconds after which a lock file which was not refreshed is considered to be left behind
+# by a failed process, the holder of a lock file refreshes it while its download is in flight
+LOCK_TIMEOUT = 60
+LOCK_REFRESH_INTERVAL = 10
+LOCK_POLL_INTERVAL = 0.1
+# downloads in flight within this process, by cache entry
+_downloads: dict[str, Future] = {}
+_downloads_lock = threading.Lock()
+
+# number of threads which refresh expired cache entries in the background
+REFRESH_WORKERS = 4
+# recently used cache entries of filesystems which serve expired entries, by filesystem and path
+_hot_keys: dict[tuple[int, str], tuple[AbstractFileSystem, str, bool | None, float]] = {}
+# cache entries which are currently refreshed
+_refreshing: set[tuple[int, str]] = set()
+_refresh_lock = threading.Lock()
+_refresh_executor: ThreadPoolExecutor | None = None
+
 
 class FileDirCache(MutableMapping):
     def __init__(
@@ -28,6 +73,8 @@ class FileDirCache(MutableMapping):
         use_listings_cache: bool,
         listings_expiry_time: int | float,
         listings_cache_location: str | None = None,
+        stale_while_revalidate: int | float = 0,
+        size_limit: int | None = None,
     ):
         """
 
@@ -42,6 +89,12 @@ class FileDirCache(MutableMapping):
         listings_cache_location: str (optional)
             Directory path at which the listings cache file is stored. If None,
             an autogenerated path at the user folder is created.
+        stale_while_revalidate: int or float (optional)
+            Time in seconds that an expired listing is kept to be served while
+            it is refreshed.
+        size_limit: int (optional)
+            Size in bytes of the cache, beyond which the least recently used
+            listings are evicted. If None, the default of diskcache applies.
 
         """
         import platformdirs
@@ -65,41 +118,67 @@ class FileDirCache(MutableMapping):
 
         self.cache_location = listings_cache_location
 
-        self._cache = Cache(directory=listings_cache_location)
+        cache_kwargs = {"size_limit": size_limit} if size_limit is not None else {}
+        self._cache = Cache(directory=listings_cache_location, eviction_policy="least-recently-used", **cache_kwargs)
         self.use_listings_cache = use_listings_cache
         self.listings_expiry_time = listings_expiry_time
+        self.stale_while_revalidate = stale_while_revalidate
+        self.size_limit = size_limit
 
     def __getitem__(self, item):
         """Draw item as fileobject from cache, retry if timeout occurs"""
-        return self._cache.get(key=item, read=True, retry=True)
+        entry = self.get_entry(item)
+        if not entry or not self.is_fresh(entry[1]):
+            return None
+        return entry[0]
+
+    def get_entry(self, item) -> tuple[Any, float | None] | None:
+        """Get a listing and the time it was stored, expired listings are returned as well while they are kept"""
+        value, created = self._cache.get(key=item, read=True, tag=True, retry=True)
+        if not value:
+            return None
+        return value, created
+
+    def is_fresh(self, created: float | None) -> bool:
+        """Check if a listing stored at the given time is still valid"""
+        # listings stored without time expire only by the expiration of the cache
+        return created is None or not self.listings_expiry_time or time.time() - created <= self.listings_expiry_time
 
     def clear(self):
         self._cache.clear()
 
     def __len__(self):
-        return len(list(self._cache.iterkeys()))
+        return len(self._cache)
 
     def __contains__(self, item):
-        value = self._cache.get(item, retry=True)  # None, if expired
-        if value:
+        entry = self.get_entry(item)  # None, if expired
+        if entry and self.is_fresh(entry[1]):
             return True
         return False
 
     def __setitem__(self, key, value):
         if not self.use_listings_cache:
             return
-        self._cache.set(key=key, value=value, expire=self.listings_expiry_time, retry=True)
+        expire = self.listings_expiry_time and self.listings_expiry_time + self.stale_while_revalidate
+        self._cache.set(key=key, value=value, expire=expire, tag=time.time(), retry=True)
 
     def __delitem__(self, key):
         del self._cache[key]
 
     def __iter__(self):
-        return (k for k in self._cache.iterkeys() if k in self)
+        # like __len__, all stored keys are iterated, expired listings which are still kept included
+        return self._cache.iterkeys()
 
     def __reduce__(self):
         return (
             FileDirCache,
-            (self.use_listings_cache, self.listings_expiry_time, self.cache_location),
+            (
+                self.use_listings_cache,
+                self.listings_expiry_time,
+                self.cache_location,
+                self.stale_while_revalidate,
+                self.size_limit,
+            ),
         )
 
 
@@ -109,6 +188,8 @@ class HTTPFileSystem(_HTTPFileSystem):
         use_listings_cache: bool | None = None,
         listings_expiry_time: int | float | None = None,
         listings_cache_location: str | None = None,
+        stale_while_revalidate: int | float = 0,
+        listings_size_limit: int | None = None,
         *args,
         **kwargs,
     ):
@@ -126,15 +207,425 @@ class HTTPFileSystem(_HTTPFileSystem):
             use_listings_cache=use_listings_cache,
             listings_expiry_time=listings_expiry_time,
             listings_cache_location=listings_cache_location,
+            stale_while_revalidate=stale_while_revalidate,
+            size_limit=listings_size_limit,
         )
 
+    async def _ls(self, url, detail=True, **kwargs):
+        if self.use_listings_cache:
+            _register_hot_key(self, url, detail)
+            entry = self.dircache.get_entry(url)
+            if entry:
+                out, created = entry
+                if self.dircache.is_fresh(created):
+                    return out
+                if time.time() - created <= self.dircache.listings_expiry_time + self.dircache.stale_while_revalidate:
+                    log.info(f"Serving expired listing of {url} while it is refreshed")
+                    _submit_refresh(self, url, detail)
+                    return out
+        out = await self._ls_real(url, detail=detail, **kwargs)
+        self.dircache[url] = out
+        return out
+
+    async def _refresh_listing(self, url: str, detail: bool = True) -> None:
+        """Download the listing of the url and replace the cached listing."""
+        self.dircache[url] = await self._ls_real(url, detail=detail)
+
+    refresh_listing = sync_wrapper(_refresh_listing)
+
+    async def _cat_file_validated(self, url: str, validators: dict) -> tuple[bytes | None, dict]:
+        """
+        Download a file unless it is unchanged with respect to the validators of a cached copy.
+
+        :param url:         The url of the file
+        :param validators:  ``etag`` and ``last_modified`` of the cached copy, sent as conditional headers
+        :return:            Tuple of the content, which is None if the file is not modified, and the
+            validators of the response
+        """
+        kw = self.kwargs.copy()
+        headers = kw.pop("headers", {}).copy()
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        session = await self.set_session()
+        async with session.get(self.encode_url(url), headers=headers, **kw) as r:
+            if r.status == 304:
+                return None, validators
+            out = await r.read()
+            self._raise_not_found_for_status(r, url)
+            content_length = r.headers.get("Content-Length")
+            validators = {
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "content_length": int(content_length) if content_length else None,
+            }
+        return out, validators
+
+    cat_file_validated = sync_wrapper(_cat_file_validated)
+
+
+class RevalidatingFileCacheFileSystem(WholeFileCacheFileSystem):
+    """
+    Caching filesystem which keeps the validators (ETag, Last-Modified, Content-Length) of each
+    cached file. Once a cached file is expired it is revalidated with a conditional request and
+    only downloaded again if it was modified, otherwise its expiration time is extended. With
+    ``stale_while_revalidate`` an expired file is served for that many more seconds while it is
+    revalidated in the background. Cached files are recorded in the index of the cache directory,
+    which evicts the least recently used files once the budget of the cache is exceeded.
+    """
+
+    def __init__(self, *args, settings: Settings, stale_while_revalidate: int | float = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.settings = settings
+        self.stale_while_revalidate = stale_while_revalidate
+
+    def cat(self, path, recursive=False, on_error="raise", callback=DEFAULT_CALLBACK, **kwargs):
+        if not isinstance(path, str) or recursive or any(char in path for char in "*?["):
+            return super().cat(path, recursive=recursive, on_error=on_error, callback=callback, **kwargs)
+        path = self._strip_protocol(path)
+        _register_hot_key(self, path)
+        detail = self._check_file(path)
+        if detail:
+            _, fn = detail
+            touch_cache_entry(self.settings, Path(fn))
+            return Path(fn).read_bytes()
+        if self.stale_while_revalidate and self.expiry:
+            created = _get_cached_file_time(self, path)
+            fn = Path(self.storage[-1]) / self._mapper(path)
+            if created and time.time() - created <= self.expiry + self.stale_while_revalidate and fn.exists():
+                log.info(f"Serving expired copy of {path} while it is revalidated")
+                touch_cache_entry(self.settings, fn)
+                _submit_refresh(self, path)
+                return fn.read_bytes()
+        return _revalidate_file(self, path)
+
+    def _open(self, path, mode="rb", **kwargs):
+        # files opened for reading are served by cat, so they are revalidated and downloaded only once at a time
+        if mode != "rb":
+            return super()._open(path, mode=mode, **kwargs)
+        path = self._strip_protocol(path)
+        f = BytesIO(self.cat(path))
+        f.original = path
+        return f
+
+
+def _get_cached_file_time(fs: RevalidatingFileCacheFileSystem, path: str) -> float | None:
+    """Get the time a file was cached or last revalidated, expired files included."""
+    detail = fs._metadata.cached_files[-1].get(path)
+    return detail and detail["time"]
+
+
+def _revalidate_file(fs: RevalidatingFileCacheFileSystem, path: str) -> bytes:
+    """
+    Download a file into the cache of the filesystem with only one download of the file in flight.
+    Within the process concurrent callers wait for the future of the download in flight, across
+    processes sharing the cache directory they wait for the lock file of the download and read the
+    finished cache entry.
+
+    :param fs:      The caching filesystem
+    :param path:    The url of the file
+    :return:        The content of the file
+    """
+    fn = Path(fs.storage[-1]) / fs._mapper(path)
+    key = str(fn)
+    with _downloads_lock:
+        future = _downloads.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _downloads[key] = future
+    if not leader:
+        log.info(f"Waiting for the download of {path} in flight")
+        return future.result()
+    try:
+        content = _download_file_locked(fs, path, fn)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(content)
+        return content
+    finally:
+        with _downloads_lock:
+            _downloads.pop(key, None)
+
+
+def _download_file_locked(fs: RevalidatingFileCacheFileSystem, path: str, fn: Path) -> bytes:
+    """
+    Download a file into the cache of the filesystem while holding the lock file of the cache
+    entry. If another process holds the lock, wait for it and read the cache entry it stored.
+    """
+    lock = fn.with_name(fn.name + LOCK_SUFFIX)
+    while not _acquire_lock_file(lock):
+        log.info(f"Waiting for the download of {path} by another process")
+        while lock.exists() and not _is_stale_lock_file(lock):
+            time.sleep(LOCK_POLL_INTERVAL)
+        owner = _read_lock_file(lock)
+        if _is_stale_lock_file(lock):
+            log.warning(f"Removing stale lock file {lock}")
+            # the lock is only removed if it was not taken over by another process in the meantime
+            if _read_lock_file(lock) == owner:
+                lock.unlink(missing_ok=True)
+            continue
+        fs.load_cache()
+        detail = fs._check_file(path)
+        if detail:
+            return Path(detail[1]).read_bytes()
+    with _hold_lock_file(lock):
+        return _download_file(fs, path)
+
+
+def _get_lock_owner() -> str:
+    """Get the owner of lock files created by this process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _read_lock_file(lock: Path) -> str | None:
+    """Read the owner of a lock file, None if it does not exist."""
+    try:
+        return lock.read_text()
+    except FileNotFoundError:
+        return None
+
+
+def _acquire_lock_file(lock: Path) -> bool:
+    """Create the lock file, unless it exists already."""
+    try:
+        fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        f.write(_get_lock_owner())
+    return True
+
+
+@contextmanager
+def _hold_lock_file(lock: Path):
+    """
+    Refresh the modification time of an acquired lock file while the block runs, so that long
+    downloads do not lose their lock, and remove the lock file afterwards if it is still owned
+    by this process.
+    """
+    owner = _get_lock_owner()
+    stop = threading.Event()
+
+    def _refresh():
+        while not stop.wait(LOCK_REFRESH_INTERVAL):
+            if _read_lock_file(lock) != owner:
+                return
+            try:
+                os.utime(lock)
+            except FileNotFoundError:
+                return
+
+    thread = threading.Thread(target=_refresh, name=f"refresh {lock.name}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+        if _read_lock_file(lock) == owner:
+            lock.unlink(missing_ok=True)
+
+
+def _is_stale_lock_file(lock: Path) -> bool:
+    """
+    Check if a lock file was left behind by a process which did not finish its download, either
+    because it was not refreshed for ``LOCK_TIMEOUT`` seconds or because its process on this host
+    is gone.
+    """
+    try:
+        if time.time() - lock.stat().st_mtime > LOCK_TIMEOUT:
+            return True
+        host, _, pid = lock.read_text().rpartition(":")
+    except FileNotFoundError:
+        return False
+    if os.name != "posix" or host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+def _download_file(fs: RevalidatingFileCacheFileSystem, path: str) -> bytes:
+    """
+    Download a file into the cache of the filesystem, a cached copy is revalidated with a
+    conditional request and only replaced if the file was modified.
+
+    :param fs:      The caching filesystem
+    :param path:    The url of the file
+    :return:        The content of the file
+    """
+    name = fs._mapper(path)
+    fn = Path(fs.storage[-1]) / name
+    validators = _read_validators(fn)
+    content, validators = fs.fs.cat_file_validated(path, validators)
+    if content is None:
+        log.info(f"Cached copy of {path} is not modified, extending its expiration")
+        content = fn.read_bytes()
+    else:
+        _write_atomic(fn, content)
+        _write_atomic(fn.with_name(fn.name + VALIDATORS_SUFFIX), json.dumps(validators).encode())
+    fs._metadata.update_file(
+        path,
+        {"original": path, "fn": name, "blocks": True, "time": time.time(), "uid": validators.get("etag")},
+    )
+    fs.save_cache()
+    record_cache_entry(fs.settings, fn, fn.with_name(fn.name + VALIDATORS_SUFFIX))
+    return content
+
+
+def _read_validators(fn: Path) -> dict:
+    """
+    Read the validators of a cached file, which are only usable as long as the cached file is
+    complete.
+
+    :param fn:  Path of the cached file
+    :return:    The validators, empty if there is no usable cached copy
+    """
+    try:
+        validators = json.loads(fn.with_name(fn.name + VALIDATORS_SUFFIX).read_text())
+        size = fn.stat().st_size
+    except (OSError, ValueError):
+        return {}
+    if validators.get("content_length") not in (None, size):
+        return {}
+    return validators
+
+
+def _write_atomic(fn: Path, content: bytes) -> None:
+    tmp = fn.with_name(f"{fn.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(content)
+    tmp.replace(fn)
+
+
+def _get_expiry(fs: AbstractFileSystem) -> tuple[float, float]:
+    """Get the expiration time of the cache entries of a filesystem and how long expired entries are served."""
+    if isinstance(fs, HTTPFileSystem):
+        return fs.dircache.listings_expiry_time, fs.dircache.stale_while_revalidate
+    return fs.expiry, fs.stale_while_revalidate
+
+
+def _get_entry_time(fs: AbstractFileSystem, path: str) -> float | None:
+    """Get the time a cache entry of a filesystem was stored or last revalidated."""
+    if isinstance(fs, HTTPFileSystem):
+        entry = fs.dircache.get_entry(path)
+        return entry and entry[1]
+    return _get_cached_file_time(fs, path)
+
+
+def _register_hot_key(fs: AbstractFileSystem, path: str, detail: bool | None = None) -> None:
+    """Remember a used cache entry of a filesystem which serves expired entries, to refresh it ahead of time."""
+    expiry, stale_while_revalidate = _get_expiry(fs)
+    if not expiry or not stale_while_revalidate:
+        return
+    with _refresh_lock:
+        _hot_keys[(id(fs), path)] = (fs, path, detail, time.time())
+
+
+def _refresh(fs: AbstractFileSystem, path: str, detail: bool | None = None) -> None:
+    if isinstance(fs, HTTPFileSystem):
+        fs.refresh_listing(path, detail)
+    else:
+        _revalidate_file(fs, path)
+
+
+def _refresh_in_background(fs: AbstractFileSystem, path: str, detail: bool | None) -> None:
+    try:
+        _refresh(fs, path, detail)
+    except Exception as e:
+        log.warning(f"Failed refreshing {path}: {e}")
+    finally:
+        with _refresh_lock:
+            _refreshing.discard((id(fs), path))
+
+
+def _submit_refresh(fs: AbstractFileSystem, path: str, detail: bool | None = None) -> None:
+    """Refresh a cache entry of a filesystem in the background, unless it is already being refreshed."""
+    global _refresh_executor
+    key = (id(fs), path)
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(REFRESH_WORKERS, thread_name_prefix="wetterdienst-refresh")
+    _refresh_executor.submit(_refresh_in_background, fs, path, detail)
+
+
+def refresh_hot_keys(margin: float = 0) -> int:
+    """
+    Refresh the recently used cache entries of filesystems which serve expired entries
+    (``stale_while_revalidate``) before they expire, so they are never served expired. Entries
+    which were not used for longer than their expiration time are forgotten.
+
+    :param margin:  Refresh the entries which expire within this many seconds
+    :return:        The number of refreshed entries
+    """
+    now = time.time()
+    with _refresh_lock:
+        hot_keys = list(_hot_keys.items())
+    refreshed = 0
+    for key, (fs, path, detail, used) in hot_keys:
+        expiry, _ = _get_expiry(fs)
+        if now - used > expiry:
+            with _refresh_lock:
+                _hot_keys.pop(key, None)
+            continue
+        created = _get_entry_time(fs, path)
+        if created and now - created < expiry - margin:
+            continue
+        with _refresh_lock:
+            if key in _refreshing:
+                continue
+            _refreshing.add(key)
+        try:
+            _refresh(fs, path, detail)
+            refreshed += 1
+        except Exception as e:
+            log.warning(f"Failed refreshing {path}: {e}")
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(key)
+    return refreshed
+
+
+async def _get_client(host: str, limit: int, **kwargs) -> aiohttp.ClientSession:
+    """
+    Get the pooled keep-alive client of a host, which is shared by all filesystems of that
+    host. Its connector limits the number of concurrent connections to the host.
+
+    :param host:    The host the client connects to
+    :param limit:   Maximum number of concurrent connections to the host
+    :param kwargs:  Arguments passed to ``aiohttp.ClientSession``
+    :return:        The client of the host
+    """
+    import aiohttp
+
+    key = (host, limit, json.dumps(kwargs, sort_keys=True, default=repr))
+    client = _clients.get(key)
+    if client is None or client.closed:
+        kwargs.setdefault("connector", aiohttp.TCPConnector(limit=limit, limit_per_host=limit))
+        client = aiohttp.ClientSession(**kwargs)
+        _clients[key] = client
+    return client
+
 
 class NetworkFilesystemManager:
     """
-    Manage multiple FSSPEC instances keyed by cache expiration time.
+    Manage multiple FSSPEC instances keyed by cache expiration time and host. The instances
+    are kept for the lifetime of the process and all instances of a host share one pooled
+    keep-alive client, so connections are reused across requests and cache expiration times.
     """
 
     filesystems: dict[str, AbstractFileSystem] = {}
+    http_filesystems: dict[str, HTTPFileSystem] = {}
 
     @staticmethod
     def resolve_ttl(ttl: int | CacheExpiry) -> tuple[str, int]:
@@ -147,29 +638,94 @@ class NetworkFilesystemManager:
 
         return ttl_name, ttl_value
 
+    @staticmethod
+    def get_pool_size(settings: Settings, host: str) -> int:
+        """Get the maximum number of concurrent connections to a host."""
+        return settings.fsspec_pool_size_per_host.get(host, settings.fsspec_pool_size_per_host["default"])
+
+    @staticmethod
+    def get_key(settings: Settings, ttl: int | CacheExpiry, url: str | None = None) -> str:
+        ttl_name, _ = NetworkFilesystemManager.resolve_ttl(ttl)
+        host = urlparse(url).netloc if url else ""
+        limit = NetworkFilesystemManager.get_pool_size(settings, host)
+        client_kwargs = json.dumps(settings.fsspec_client_kwargs, sort_keys=True, default=repr)
+        return (
+            f"ttl-{ttl_name}/{host}/{limit}/{settings.cache_disable}/{settings.cache_dir}/{client_kwargs}/"
+            f"{settings.cache_stale_while_revalidate}/{settings.cache_max_size}/"
+            f"{json.dumps(settings.cache_max_size_per_bucket, sort_keys=True)}"
+        )
+
     @classmethod
-    def register(cls, settings, ttl: int | CacheExpiry = CacheExpiry.NO_CACHE):
+    def register(cls, settings, ttl: int | CacheExpiry = CacheExpiry.NO_CACHE, url: str | None = None):
         ttl_name, ttl_value = cls.resolve_ttl(ttl)
-        key = f"ttl-{ttl_name}"
-        real_cache_dir = str(Path(settings.cache_dir) / "fsspec" / key)
+        key = cls.get_key(settings, ttl, url)
+        real_cache_dir = str(Path(settings.cache_dir) / "fsspec" / f"ttl-{ttl_name}")
 
+        host = urlparse(url).netloc if url else ""
+        limit = cls.get_pool_size(settings, host)
         use_cache = not (settings.cache_disable or ttl is CacheExpiry.NO_CACHE)
-        fs = HTTPFileSystem(use_listings_cache=use_cache, client_kwargs=settings.fsspec_client_kwargs)
+        listings_expiry_time = not settings.cache_disable and ttl_value
+        # the bucket is named after the directory of the listings cache
+        listings_bucket = f"{LISTINGS_BUCKET_PREFIX}{listings_expiry_time and float(listings_expiry_time)}"
+        fs = HTTPFileSystem(
+            use_listings_cache=use_cache,
+            listings_expiry_time=listings_expiry_time,
+            listings_cache_location=settings.cache_dir,
+            stale_while_revalidate=settings.cache_stale_while_revalidate,
+            listings_size_limit=get_cache_bucket_limit(settings, listings_bucket),
+            client_kwargs=settings.fsspec_client_kwargs,
+            get_client=partial(_get_client, host, limit),
+            skip_instance_cache=True,
+        )
 
         if settings.cache_disable or ttl is CacheExpiry.NO_CACHE:
             filesystem_effective = fs
         else:
-            filesystem_effective = WholeFileCacheFileSystem(fs=fs, cache_storage=real_cache_dir, expiry_time=ttl_value)
+            filesystem_effective = RevalidatingFileCacheFileSystem(
+                fs=fs,
+                cache_storage=real_cache_dir,
+                expiry_time=ttl_value,
+                settings=settings,
+                stale_while_revalidate=settings.cache_stale_while_revalidate,
+            )
+        cls.http_filesystems[key] = fs
         cls.filesystems[key] = filesystem_effective
 
     @classmethod
-    def get(cls, settings, ttl: int | CacheExpiry = CacheExpiry.NO_CACHE) -> AbstractFileSystem:
-        ttl_name, _ = cls.resolve_ttl(ttl)
-        key = f"ttl-{ttl_name}"
-        if key not in cls.filesystems:
-            cls.register(settings=settings, ttl=ttl)
+    def get(cls, settings, ttl: int | CacheExpiry = CacheExpiry.NO_CACHE, url: str | None = None) -> AbstractFileSystem:
+        """
+        Get the (caching) filesystem for the given cache expiration time and the host of the url.
+
+        :param settings:    The settings object.
+        :param ttl:         How long resources are cached.
+        :param url:         The url of the resource, its host selects the pooled client
+        :return:            The filesystem
+        """
+        key = cls.get_key(settings, ttl, url)
+        with _filesystems_lock:
+            if key not in cls.filesystems:
+                cls.register(settings=settings, ttl=ttl, url=url)
         return cls.filesystems[key]
 
+    @classmethod
+    def get_http(
+        cls,
+        settings,
+        ttl: int | CacheExpiry = CacheExpiry.NO_CACHE,
+        url: str | None = None,
+    ) -> HTTPFileSystem:
+        """
+        Get the plain HTTP filesystem for the given cache expiration time and the host of the url,
+        its listings are cached for the cache expiration time.
+
+        :param settings:    The settings object.
+        :param ttl:         How long listings are cached.
+        :param url:         The url of the resource, its host selects the pooled client
+        :return:            The filesystem
+        """
+        cls.get(settings=settings, ttl=ttl, url=url)
+        return cls.http_filesystems[cls.get_key(settings, ttl, url)]
+
 
 @stamina.retry(on=Exception, attempts=3)
 def list_remote_files_fsspec(url: str, settings: Settings, ttl: CacheExpiry = CacheExpiry.FILEINDEX) -> list[str]:
@@ -182,13 +738,7 @@ def list_remote_files_fsspec(url: str, settings: Settings, ttl: CacheExpiry = Ca
     :param ttl:         The cache expiration time.
     :returns:  A list of strings representing the files from the path.
     """
-    use_cache = not (settings.cache_disable or ttl is CacheExpiry.NO_CACHE)
-    fs = HTTPFileSystem(
-        use_listings_cache=use_cache,
-        listings_expiry_time=not settings.cache_disable and ttl.value,
-        listings_cache_location=settings.cache_dir,
-        client_kwargs=settings.fsspec_client_kwargs,
-    )
+    fs = NetworkFilesystemManager.get_http(settings=settings, ttl=ttl, url=url)
     return fs.find(url)
 
 
@@ -207,6 +757,6 @@ def download_file(
 
     :returns:        Bytes of the file.
     """
-    filesystem = NetworkFilesystemManager.get(settings=settings, ttl=ttl)
+    filesystem = NetworkFilesystemManager.get(settings=settings, ttl=ttl, url=url)
     payload = filesystem.cat(url)
     return BytesIO(payload)